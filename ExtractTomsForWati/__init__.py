@@ -1,3 +1,58 @@
-from ._abstract_handler import AbstractHandler
-from .appointment_handler import AppointmentHandler
-from .birthday_handler import BirthdayHandler
\ No newline at end of file
+import importlib
+from typing import TYPE_CHECKING
+
+# Public names and the submodule defining each. Submodules are imported on first
+# attribute access (PEP 562), so `import ExtractTomsForWati` does not import pandas.
+_LAZY_ATTRIBUTE_DICT = {
+    "AbstractHandler": "._abstract_handler",
+    "DiskCache": "._cache",
+    "Job": "._job_engine",
+    "JobEngine": "._job_engine",
+    "CancelToken": "._progress",
+    "JobCancelled": "._progress",
+    "TEMPLATE_NAME_LIST": "._registry",
+    "get_handler_class": "._registry",
+    "import_all_handlers": "._registry",
+    "SendLedger": "._send_ledger",
+    "sniff_template": "._sniffer",
+    "HandlerSpec": "._spec_handler",
+    "SpecHandler": "._spec_handler",
+    "compile_spec": "._spec_handler",
+    "FolderWatcher": "._watch_folder",
+    "WatiConnector": "._wati_connector",
+    "AppointmentHandler": ".appointment_handler",
+    "BirthdayHandler": ".birthday_handler",
+    "RecallHandler": ".recall_handler",
+}
+
+__all__ = list(_LAZY_ATTRIBUTE_DICT)
+
+if TYPE_CHECKING:
+    # For type checkers and PyInstaller's import analysis only
+    from ._abstract_handler import AbstractHandler
+    from ._cache import DiskCache
+    from ._job_engine import Job, JobEngine
+    from ._progress import CancelToken, JobCancelled
+    from ._registry import TEMPLATE_NAME_LIST, get_handler_class, import_all_handlers
+    from ._send_ledger import SendLedger
+    from ._sniffer import sniff_template
+    from ._spec_handler import HandlerSpec, SpecHandler, compile_spec
+    from ._watch_folder import FolderWatcher
+    from ._wati_connector import WatiConnector
+    from .appointment_handler import AppointmentHandler
+    from .birthday_handler import BirthdayHandler
+    from .recall_handler import RecallHandler
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTE_DICT.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,166 @@
+"""Headless batch processing of TOMs reports.
+
+```bash
+python -m ExtractTomsForWati reports/ --template Appointment --practice Pavilion
+python -m ExtractTomsForWati "exports/**/*.xlsx" -t Birthday -p "La Lucia" -o out/
+python -m ExtractTomsForWati reports/ -t Recall -p Pavilion --format .parquet
+python -m ExtractTomsForWati reports/ -p Pavilion  # Template sniffed per report
+python -m ExtractTomsForWati "//reception/exports" --watch -p Pavilion
+```
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+from ._batch import (
+    DEFAULT_OUTPUT_FILE_TYPE,
+    find_report_files,
+    run_batch,
+    write_summary,
+)
+from ._cache import DiskCache
+from ._registry import TEMPLATE_NAME_LIST
+from ._watch_folder import FolderWatcher
+from ._writers import WRITER_CLASS_DICT
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m ExtractTomsForWati",
+        description="Extract Wati contacts from every TOMs report in a folder or glob.",
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="Report files, directories or glob patterns."
+    )
+    parser.add_argument(
+        "-t",
+        "--template",
+        choices=TEMPLATE_NAME_LIST,
+        help="Report template (default: sniffed from each report's header rows).",
+    )
+    parser.add_argument("-p", "--practice", required=True)
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        help="Where to write outputs (default: next to each report).",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        default=DEFAULT_OUTPUT_FILE_TYPE,
+        choices=list(WRITER_CLASS_DICT),
+        help="Output file type (default: .csv).",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, help="Worker processes (default: available cores)."
+    )
+    parser.add_argument(
+        "--summary", help="Summary JSON path (default: in the output directory)."
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse parsed reports from the parse cache.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only output appointments new or changed since the last run (Appointment only).",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and process reports saved into the given folder.",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="Poll the watched folder instead of using inotify (e.g. network shares).",
+    )
+    args = parser.parse_args(argv)
+
+    if args.watch and (len(args.paths) != 1 or not os.path.isdir(args.paths[0])):
+        parser.error("--watch expects a single folder.")
+    if args.incremental and args.template is None:
+        parser.error("--incremental requires -t/--template.")
+    return args
+
+
+def watch(args: argparse.Namespace) -> int:
+    """Process reports saved into the folder until interrupted (Ctrl+C)."""
+    watcher = FolderWatcher(
+        folder=args.paths[0],
+        practice=args.practice,
+        template=args.template,
+        output_file_type=args.format,
+        max_workers=args.workers,
+        parse_cache=DiskCache(namespace="parsed") if args.cache else None,
+        use_inotify=not args.poll,
+    )
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    if args.watch:
+        return watch(args)
+
+    file_paths = find_report_files(args.paths)
+    if not file_paths:
+        print("No .xls/.xlsx reports found.", file=sys.stderr)
+        return 1
+
+    template_name = args.template or "auto-detected"
+    print(f"Processing {len(file_paths)} {template_name} report(s) for {args.practice}")
+    start = time.perf_counter()
+    try:
+        results = run_batch(
+            file_paths,
+            template=args.template,
+            practice=args.practice,
+            output_dir=args.output_dir,
+            max_workers=args.workers,
+            parse_cache=DiskCache(namespace="parsed") if args.cache else None,
+            incremental=args.incremental,
+            output_file_type=args.format,
+        )
+    except ValueError as err:
+        print(err, file=sys.stderr)
+        return 1
+    total_seconds = time.perf_counter() - start
+
+    for result in results:
+        if result.succeeded:
+            seconds = (
+                result.load_seconds + result.transform_seconds + result.save_seconds
+            )
+            print(
+                f"  OK    {os.path.basename(result.file_path)} as {result.template}: "
+                f"{result.rows_in} -> {result.rows_out} rows in {seconds:.2f}s"
+            )
+        else:
+            print(f"  FAIL  {os.path.basename(result.file_path)}: {result.error}")
+
+    current_datetime = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    summary_path = args.summary or os.path.join(
+        args.output_dir or os.path.dirname(file_paths[0]),
+        f"BatchSummary_{current_datetime}.json",
+    )
+    summary = write_summary(results, summary_path, total_seconds)
+
+    print(
+        f"{summary['succeeded']} succeeded, {summary['failed']} failed "
+        f"in {total_seconds:.2f}s. Summary: {summary_path}"
+    )
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
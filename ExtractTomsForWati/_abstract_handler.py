@@ -1,10 +1,54 @@
 import os
+import tracemalloc
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from datetime import datetime
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, field, fields
+from datetime import date, datetime
+from typing import ClassVar
 
 import pandas as pd
 
+from ._cache import DiskCache, file_content_hash
+from ._dtypes import to_compact_dtypes
+from ._fan_out import (
+    PROVENANCE_COLUMN_LIST,
+    ReportSource,
+    expand_sources,
+    iter_cleaned_sources,
+)
+from ._instrumentation import RunReport, StageRecord
+from ._progress import STAGE_PROGRESS_DICT, CancelToken, ProgressCallback
+from ._readers import READER_VERSION, AbstractReader, get_reader_class
+from ._send_ledger import SENT_STATUS, UNKNOWN_STATUS, SendLedger
+from ._sniffer import (
+    can_read_header_cells_only,
+    get_frame_header_cells,
+    get_missing_headings,
+    read_header_cells,
+    sniff_template,
+)
+from ._writers import AbstractWriter, get_writer_class
+
+### Constants and Defaults ###
+# Fields that do not change a handler's output, left out of result cache keys
+RESULT_KEY_EXCLUDED_FIELD_LIST = [
+    "file_path",
+    "save_path",
+    "df_raw",
+    "df_clean",
+    "df_output",
+    "parse_cache",
+    "result_cache",
+    "send_ledger",
+    "writer",
+    "output_file_type",
+    "retain_intermediate",
+    "track_memory",
+    "run_log_path",
+    "cancel_token",
+    "progress_callback",
+]
+
 
 @dataclass(kw_only=True)
 class AbstractHandler(ABC):
@@ -15,6 +59,18 @@ class AbstractHandler(ABC):
         default_factory=list, init=False
     )  #! Expected to be defined in child
 
+    # Column headings found in the first rows of every report the handler accepts.
+    # Reports without them are rejected before they are parsed, see `_sniffer.py`.
+    header_signature: ClassVar[frozenset[str]] = frozenset()
+
+    # Bump whenever the handler's output changes for the same report and configuration,
+    # so results cached by earlier versions are no longer used
+    handler_version: ClassVar[str] = "1"
+    # Attributes stored in and restored from `result_cache`
+    result_attribute_list: ClassVar[list[str]] = ["df_output"]
+    # Set when outputs depend on the current date (e.g. ages), results then last a day
+    result_depends_on_today: ClassVar[bool] = False
+
     # Initialize pd.DataFrame attributes
     df_raw: pd.DataFrame | None = field(default=None)
     df_clean: pd.DataFrame | None = field(default=None)
@@ -22,6 +78,29 @@ class AbstractHandler(ABC):
 
     # Initialize other attributes
     selected_practice: str | None = field(default=None)
+    sheet: int | str = field(default=0)  # Worksheet read, by position or name
+    reader_class: type[AbstractReader] | None = field(default=None)
+    parse_cache: DiskCache | None = field(default=None)
+    result_cache: DiskCache | None = field(default=None)  # See `load_and_process`
+    send_ledger: SendLedger | None = field(default=None)
+
+    # Initialize output attributes, the writer defaults to the save path's extension
+    writer: AbstractWriter | None = field(default=None)
+    output_file_type: str = field(default=".csv")  # Of save paths named by date
+
+    # Initialize memory management attributes
+    # Keep df_raw/df_clean after transforming for debugging
+    retain_intermediate: bool = field(default=False)
+    track_memory: bool = field(default=False)
+    peak_memory_bytes: int | None = field(default=None, init=False)
+
+    # Initialize instrumentation attributes
+    run_log_path: str | None = field(default=None)  # JSON lines log of run reports
+    run_report: RunReport | None = field(default=None, init=False)
+
+    # Initialize job control attributes, checked and published by every stage
+    cancel_token: CancelToken | None = field(default=None, repr=False)
+    progress_callback: ProgressCallback | None = field(default=None, repr=False)
 
     def __str__(self):
         return f"{self.__class__.__name__}".removesuffix("Handler")
@@ -33,7 +112,28 @@ class AbstractHandler(ABC):
         """Loads a DataFrame from the provided file path or the class attribute file_path."""
         filepath = self._get_filepath(filepath)
         self._validate_filepath(filepath)
-        self.df_raw = self._load_file(filepath)
+
+        # Reports of another layout are rejected from their header rows before the full
+        # parse, unless reading those rows parses the sheet anyway (e.g. `.xls`)
+        validate_before_loading = can_read_header_cells_only(filepath)
+        if validate_before_loading:
+            self._validate_header_signature(filepath)
+
+        # Loading starts a new run
+        self.run_report = RunReport(
+            handler=str(self), file_path=filepath, track_memory=self.track_memory
+        )
+        with self._stage("load_dataframe") as stage:
+            if self.parse_cache is None:
+                self.df_raw = self._load_file(filepath)
+            else:
+                self.df_raw = self._load_file_cached(filepath)
+            stage.set_output(self.df_raw)
+
+        if not validate_before_loading:
+            self._validate_header_signature(
+                filepath, get_frame_header_cells(self.df_raw)
+            )
         return
 
     def _get_filepath(self, filepath: str | None):
@@ -65,9 +165,65 @@ class AbstractHandler(ABC):
                 f"Invalid file type '{file_ext}'. Expected one of {self.valid_file_types}."
             )
 
+    def _validate_header_signature(
+        self, filepath: str, header_cells: set[str] | None = None
+    ):
+        """Reject a report of another layout from the cells of its first rows."""
+        if not self.header_signature:
+            return
+
+        if header_cells is None:
+            header_cells = read_header_cells(filepath, sheet=self.sheet)
+        missing_headings = get_missing_headings(type(self), header_cells)
+        if not missing_headings:
+            return
+
+        msg = f"{os.path.basename(filepath)} does not match the {self} layout (missing headings: {', '.join(missing_headings)})."
+        try:
+            msg += f" It matches the {sniff_template(filepath, header_cells)} template."
+        except ValueError:
+            pass
+        raise ValueError(msg)
+
     def _load_file(self, filepath: str) -> pd.DataFrame:
         """Load the file into a DataFrame. This can be overridden by subclasses."""
-        return pd.read_excel(filepath, header=None)
+        reader = self._get_reader(filepath)
+        return reader.read(filepath)
+
+    def _load_file_cached(self, filepath: str) -> pd.DataFrame:
+        """Load the file through `parse_cache`, keyed by file contents and reader configuration."""
+        cache_key = self.parse_cache.make_key(
+            file_content_hash(filepath),
+            READER_VERSION,
+            self.__class__.__name__,
+            repr(self._get_reader(filepath)),
+        )
+        return self.parse_cache.get_or_create(
+            cache_key, lambda: self._load_file(filepath)
+        )
+
+    def _get_reader(self, filepath: str) -> AbstractReader:
+        """Create the reader for the file, dropping blank and known junk rows while streaming."""
+        reader_class = self.reader_class or get_reader_class(filepath)
+        junk_keywords = getattr(self, "remove_rows_containing_list", None) or []
+
+        row_callback = None
+        if self.cancel_token is not None or self.progress_callback is not None:
+            row_callback = self._on_rows_read
+
+        return reader_class(
+            sheet=self.sheet,
+            drop_rows_containing_list=list(junk_keywords),
+            row_callback=row_callback,
+        )
+
+    def _on_rows_read(self, rows_read: int, total_rows: int | None):
+        """Check for cancellation and publish loading progress while a reader streams rows."""
+        self._check_cancelled()
+        if total_rows:
+            start, end = STAGE_PROGRESS_DICT["load_dataframe"]
+            fraction = start + (end - start) * min(rows_read / total_rows, 1.0)
+            self._publish_progress(fraction, "load_dataframe")
 
     def _validate_dataframe(
         self, df_attr: str = "df_raw", df: pd.DataFrame | None = None
@@ -86,12 +242,84 @@ class AbstractHandler(ABC):
     # * ---------------------
     def transform_data(self):
         """Data in class variables is transformed"""
-        self._clean_data()
-        self._add_features()
-        self._extract_features()
+        with self._stage("clean_data", self.df_raw) as stage:
+            self._clean_data()
+            stage.set_output(self.df_clean)
+        self._release_intermediate("df_raw")
+
+        return self._transform_features()
+
+    def _transform_features(self):
+        """Add and extract features from `df_clean`, the stages after cleaning."""
+        with self._stage("add_features", self.df_clean) as stage:
+            self._add_features()
+            stage.set_output(self.df_clean)
+
+        with self._stage("extract_features", self.df_clean) as stage:
+            self._extract_features()
+            stage.set_output(self.df_output)
+        self._release_intermediate("df_clean")
 
         return self.df_output
 
+    @contextmanager
+    def _stage(self, name: str, df_in: pd.DataFrame | None = None):
+        """Context manager recording a (sub-)stage's time, memory and rows in `run_report`.
+
+        Entering a stage raises `JobCancelled` if `cancel_token` was cancelled, and
+        top-level stages publish their progress to `progress_callback`.
+
+        Stages pass DataFrames to each other without defensive copies, which is only
+        safe with Copy-on-Write (always on from pandas 3.0). It is enabled per stage
+        rather than globally, leaving the pandas options of importers unchanged.
+
+        ```python
+        with self._stage("filter_dates", df_clean) as stage:
+            df_clean = df_clean[date_mask]
+            stage.set_output(df_clean)
+        ```
+        """
+        self._check_cancelled()
+        if self.run_report is None:
+            self.run_report = RunReport(
+                handler=str(self),
+                file_path=self.file_path,
+                track_memory=self.track_memory,
+            )
+
+        start, end = STAGE_PROGRESS_DICT.get(name, (None, None))
+        if start is not None:
+            self._publish_progress(start, name)
+
+        with (
+            pd.option_context("mode.copy_on_write", True),
+            self.run_report.stage(name, df_in) as stage,
+        ):
+            yield stage
+
+        if end is not None:
+            self._publish_progress(end, name)
+
+    def _check_cancelled(self):
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+
+    def _publish_progress(self, fraction: float, stage_name: str):
+        if self.progress_callback is not None:
+            self.progress_callback(fraction, stage_name)
+
+    def _release_intermediate(self, df_attr: str):
+        """Drop the reference to an intermediate DataFrame once the next stage owns its data."""
+        if not self.retain_intermediate:
+            setattr(self, df_attr, None)
+
+    def _get_output_headings(self, df: pd.DataFrame) -> list[str]:
+        """`default_headings_list`, followed by the provenance columns of multi-source runs."""
+        provenance_columns = [
+            column for column in PROVENANCE_COLUMN_LIST if column in df.columns
+        ]
+        return [*self.default_headings_list, *provenance_columns]
+
     @abstractmethod
     def _clean_data(self, df: pd.DataFrame | None = None):
         """Abstract method for cleaning data. Must be implemented by subclasses. It is recommended to use the following as the start of the method when implemented so that you can use the `transform_data` method correctly.
@@ -102,9 +330,11 @@ class AbstractHandler(ABC):
 
         ```python
         self.df_raw = self._validate_dataframe("df_raw", df)
-        df_raw = self.df_raw.copy()
+        df_raw = self.df_raw
         ```
 
+        No defensive `.copy()` is needed, Copy-on-Write copies data only when it is modified.
+
         """
         pass
 
@@ -118,7 +348,7 @@ class AbstractHandler(ABC):
 
         ```python
         self.df_raw = self._validate_dataframe("df_raw", df)
-        df_raw = self.df_raw.copy()
+        df_raw = self.df_raw
         ```
 
         """
@@ -131,18 +361,61 @@ class AbstractHandler(ABC):
         # Retrieve df_clean dataframe and validate
         # df_clean is ALWAYS the final data before output
         self.df_clean = self._validate_dataframe("df_clean", df)
-        df_clean = self.df_clean.copy()
+        df_clean = self.df_clean
 
         # Extract desired features
         if not headings:
-            df_output = df_clean.copy()
+            df_output = df_clean
         else:
-            df_output = df_clean[headings].copy()
+            df_output = df_clean[headings]
+
+        # Categoricals, Arrow strings and datetime64 dates instead of object columns
+        df_output = to_compact_dtypes(df_output)
+
+        # Drop messages that have already been sent in a previous run
+        if self.send_ledger is not None:
+            df_output = self.send_ledger.filter_unsent(
+                df_output, str(self), self._get_message_keys(df_output)
+            )
 
         self.df_output = df_output
 
         return df_output
 
+    def _get_message_keys(self, df: pd.DataFrame) -> pd.Series:
+        """Identify each row's message for the send ledger. Defaults to one message per day."""
+        return pd.Series(datetime.now().strftime("%Y-%m-%d"), index=df.index)
+
+    def record_sent(self, send_results: pd.DataFrame | None = None) -> int:
+        """Record `df_output` rows as sent in the send ledger.
+
+        Pass the results of `WatiConnector.send_dataframe` to record only successful sends,
+        and sends with an unknown outcome so they are not resent. Otherwise every output
+        row is recorded (e.g. after a manual CSV upload).
+        """
+        if self.send_ledger is None:
+            raise AttributeError("Missing 'send_ledger' attribute.")
+        df_output = self._validate_dataframe("df_output")
+
+        if send_results is None:
+            return self.send_ledger.record_sent(
+                str(self), df_output["CellCountry"], self._get_message_keys(df_output)
+            )
+
+        recorded = 0
+        for status, column in [
+            (SENT_STATUS, "sent"),
+            (UNKNOWN_STATUS, "outcome_unknown"),
+        ]:
+            df_status = df_output[send_results[column].to_numpy(dtype=bool)]
+            recorded += self.send_ledger.record_sent(
+                str(self),
+                df_status["CellCountry"],
+                self._get_message_keys(df_status),
+                status=status,
+            )
+        return recorded
+
     # * ---------------------
     # * Save data methods
     # * ---------------------
@@ -154,7 +427,7 @@ class AbstractHandler(ABC):
         # Create datetime based filename for save file
         current_datetime = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         handler_name = str(self)
-        new_filename = f"{handler_name}_{current_datetime}.csv"
+        new_filename = f"{handler_name}_{current_datetime}{self.output_file_type}"
 
         # Create save path by adding new filename to filepath
         dir_path = os.path.dirname(filepath)
@@ -163,6 +436,11 @@ class AbstractHandler(ABC):
 
         return savepath
 
+    def _write_output(self) -> str:
+        """Write `df_output` to `save_path` atomically, in the format of its extension."""
+        writer = self.writer or get_writer_class(self.save_path)()
+        return writer.write(self.df_output, self.save_path)
+
     @abstractmethod
     def save_data(self, savepath: str):
         """Save the cleaned data to a new file in save_folder."""
@@ -172,20 +450,200 @@ class AbstractHandler(ABC):
     # * Apply Flows to data methods
     # * ---------------------
     def load_and_process(self, filepath: str) -> pd.DataFrame:
-        """The main method to run the partial handler workflow i.e. Load and Process Data."""
+        """The main method to run the partial handler workflow i.e. Load and Process Data.
+
+        With a `result_cache`, the output of a previous run over the same file contents,
+        handler version and configuration is returned without loading the report.
+        """
+        if self._uses_result_cache():
+            filepath = self._get_filepath(filepath)
+            self._validate_filepath(filepath)
+            result_key = self._get_result_key(filepath)
+            if self._load_cached_result(filepath, result_key):
+                return self.df_output
+
+        with self._trace_memory():
+            self.load_dataframe(filepath)
+            self.transform_data()
+
+        self.peak_memory_bytes = self.run_report.peak_memory_bytes
+        if self.run_log_path:
+            self.run_report.append_to_jsonl(self.run_log_path)
+
+        if self._uses_result_cache():
+            self._store_result(result_key)
+
+        return self.df_output
+
+    # * ---------------------
+    # * Result cache methods
+    # * ---------------------
+    def _uses_result_cache(self) -> bool:
+        """Outputs filtered by the send ledger or a watermark depend on more than the report."""
+        return (
+            self.result_cache is not None
+            and self.send_ledger is None
+            and not getattr(self, "incremental", False)
+        )
+
+    def _get_result_key(self, filepath: str) -> str:
+        """Key of the file contents, handler version and every field that shapes the output."""
+        configuration = [
+            (handler_field.name, getattr(self, handler_field.name))
+            for handler_field in fields(self)
+            if handler_field.init
+            and handler_field.name not in RESULT_KEY_EXCLUDED_FIELD_LIST
+        ]
+        return self.result_cache.make_key(
+            file_content_hash(filepath),
+            f"{type(self).__module__}.{type(self).__qualname__}",
+            self.handler_version,
+            READER_VERSION,
+            repr(configuration),
+            date.today().isoformat() if self.result_depends_on_today else "",
+        )
+
+    def _load_cached_result(self, filepath: str, result_key: str) -> bool:
+        """Restore a cached result, returning False on a cache miss."""
+        self.run_report = RunReport(
+            handler=str(self), file_path=filepath, track_memory=self.track_memory
+        )
+        # Recorded without publishing progress, which a miss would complete early
+        with self.run_report.stage("load_cached_result") as stage:
+            result = self.result_cache.get(result_key)
+            if result is not None:
+                for attribute in self.result_attribute_list:
+                    setattr(self, attribute, result[attribute])
+                self.run_report.warnings.extend(result["warnings"])
+                stage.set_output(self.df_output)
+
+        if result is None:
+            self.run_report = None
+            return False
+
+        self._publish_progress(1.0, "load_cached_result")
+        if self.run_log_path:
+            self.run_report.append_to_jsonl(self.run_log_path)
+        return True
+
+    def _store_result(self, result_key: str):
+        result = {
+            attribute: getattr(self, attribute)
+            for attribute in self.result_attribute_list
+        }
+        result["warnings"] = self.run_report.warnings
+        self.result_cache.put(result_key, result)
+
+    def load_and_process_sources(
+        self, sources: list[ReportSource], max_workers: int | None = None
+    ) -> pd.DataFrame:
+        """Run the partial workflow over several workbooks and worksheets as one run.
+
+        Each worksheet is loaded and cleaned on its own in a worker process, then the
+        cleaned rows are combined once, so `_add_features` sees every source (e.g. a
+        patient's latest exam across several exports of their practice). Output rows name their workbook and
+        worksheet in the 'SourceFile' and 'SourceSheet' columns.
+
+        ```python
+        handler.load_and_process_sources(["pavilion.xlsx", ("la_lucia.xlsx", "March")])
+        ```
+        """
+        if getattr(self, "incremental", False):
+            raise ValueError("Incremental mode processes one report at a time.")
+
+        sheet_sources = expand_sources(sources, self.header_signature)
+        if not sheet_sources:
+            raise ValueError("No report sources provided.")
+        for file_path, _ in sheet_sources:
+            self._validate_filepath(file_path)
+        self.file_path = sheet_sources[0][0]  # Outputs are saved next to the first
+
+        with self._trace_memory():
+            self.run_report = RunReport(
+                handler=str(self),
+                file_path=self.file_path,
+                track_memory=self.track_memory,
+            )
+            with self._stage("load_sources") as stage:
+                self.df_clean = self._clean_sources(sheet_sources, max_workers)
+                stage.set_output(self.df_clean)
+            self._transform_features()
 
-        self.load_dataframe(filepath)
-        self.transform_data()
+        self.peak_memory_bytes = self.run_report.peak_memory_bytes
+        if self.run_log_path:
+            self.run_report.append_to_jsonl(self.run_log_path)
 
         return self.df_output
 
+    def _clean_sources(
+        self, sheet_sources: list[tuple[str, str]], max_workers: int | None
+    ) -> pd.DataFrame:
+        """Cleaned rows of every worksheet in source order, recording a sub-stage for each."""
+        # Sources are loaded and cleaned together, so they share both stages' progress
+        start = STAGE_PROGRESS_DICT["load_dataframe"][0]
+        end = STAGE_PROGRESS_DICT["clean_data"][1]
+        df_clean_dict, source_record_dict = {}, {}
+
+        cleaned_sources = iter_cleaned_sources(self, sheet_sources, max_workers)
+        with closing(cleaned_sources):
+            for position, df_clean, source_report in cleaned_sources:
+                self._check_cancelled()
+                df_clean_dict[position] = df_clean
+
+                file_path, sheet = sheet_sources[position]
+                source_name = f"{os.path.basename(file_path)} [{sheet}]"
+                load_stage = source_report.get_stage("load_dataframe")
+                source_record_dict[position] = StageRecord(
+                    name=source_name,
+                    parent="load_sources",
+                    wall_seconds=source_report.total_wall_seconds,
+                    cpu_seconds=sum(
+                        stage.cpu_seconds
+                        for stage in source_report.stages
+                        if stage.parent is None
+                    ),
+                    rows_in=load_stage.rows_out,
+                    rows_out=len(df_clean),
+                )
+                self.run_report.warnings.extend(
+                    f"{source_name}: {warning}" for warning in source_report.warnings
+                )
+
+                sources_done = len(df_clean_dict) / len(sheet_sources)
+                self._publish_progress(
+                    start + (end - start) * sources_done, "load_sources"
+                )
+
+        self.run_report.stages.extend(
+            source_record_dict[position] for position in sorted(source_record_dict)
+        )
+        return pd.concat(
+            [df_clean_dict[position] for position in sorted(df_clean_dict)],
+            ignore_index=True,
+        )
+
     def load_process_save(self, filepath: str, savepath: str | None = None):
         """The main method to run the complete handler workflow."""
 
-        self.load_dataframe(filepath)
-        self.transform_data()
+        self.load_and_process(filepath)
         self.save_data(savepath)
 
+    @contextmanager
+    def _trace_memory(self):
+        """Trace allocations during the block when `track_memory` is set.
+
+        tracemalloc also sees NumPy buffers, so stage peaks cover the DataFrames themselves.
+        """
+        was_tracing = tracemalloc.is_tracing()
+        if self.track_memory and not was_tracing:
+            tracemalloc.start()
+
+        try:
+            yield
+        finally:
+            if self.track_memory and not was_tracing:
+                tracemalloc.stop()
+
 
 if __name__ == "__main__":
     print(AbstractHandler)
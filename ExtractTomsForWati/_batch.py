@@ -0,0 +1,223 @@
+import glob
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+from ._cache import DiskCache
+from ._registry import get_handler_class
+from ._sniffer import sniff_template
+from ._writers import WRITER_CLASS_DICT
+
+### Constants and Defaults ###
+DEFAULT_REPORT_FILE_TYPES = [".xls", ".xlsx"]
+DEFAULT_OUTPUT_FILE_TYPE = ".csv"
+
+
+@dataclass
+class BatchResult:
+    """Outcome of processing a single report in a batch run."""
+
+    file_path: str
+    template: str | None
+    practice: str
+    save_path: str | None = field(default=None)
+    rows_in: int | None = field(default=None)
+    rows_out: int | None = field(default=None)
+    load_seconds: float | None = field(default=None)
+    transform_seconds: float | None = field(default=None)
+    save_seconds: float | None = field(default=None)
+    run_report: dict | None = field(default=None)
+    error: str | None = field(default=None)
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+def find_report_files(
+    paths: list[str], file_types: list[str] | None = None
+) -> list[str]:
+    """Expand directories and glob patterns into a sorted list of report files."""
+    file_types = file_types or DEFAULT_REPORT_FILE_TYPES
+
+    found = set()
+    for path in paths:
+        if os.path.isdir(path):
+            candidates = [entry.path for entry in os.scandir(path) if entry.is_file()]
+        else:
+            candidates = glob.glob(path, recursive=True)
+
+        for candidate in candidates:
+            file_name = os.path.basename(candidate)
+            is_report = os.path.splitext(file_name)[-1].lower() in file_types
+            # Skip Excel's '~$' lock files for workbooks that are currently open
+            if is_report and not file_name.startswith("~$"):
+                found.add(os.path.abspath(candidate))
+
+    return sorted(found)
+
+
+def _get_batch_savepath(
+    file_path: str,
+    template: str,
+    output_dir: str | None,
+    output_file_type: str = DEFAULT_OUTPUT_FILE_TYPE,
+    root_dir: str | None = None,
+) -> str:
+    """Name outputs after their source report so parallel jobs never collide.
+
+    In `output_dir`, outputs keep the report's folder relative to `root_dir`, so
+    same-named reports in different folders (e.g. one per practice) stay apart.
+    """
+    report_dir, file_name = os.path.split(file_path)
+    if output_dir:
+        relative_dir = os.path.relpath(report_dir, root_dir or report_dir)
+        report_dir = os.path.normpath(os.path.join(output_dir, relative_dir))
+
+    file_stem = os.path.splitext(file_name)[0]
+    return os.path.join(report_dir, f"{file_stem}_{template}{output_file_type}")
+
+
+def process_report(
+    file_path: str,
+    template: str | None,
+    practice: str,
+    output_dir: str | None = None,
+    parse_cache: DiskCache | None = None,
+    incremental: bool = False,
+    output_file_type: str = DEFAULT_OUTPUT_FILE_TYPE,
+    root_dir: str | None = None,
+) -> BatchResult:
+    """Load, transform and save a single report, capturing failures in the result.
+
+    Without a `template`, it is sniffed from the report's header rows.
+    """
+    result = BatchResult(file_path=file_path, template=template, practice=practice)
+
+    try:
+        if template is None:
+            template = result.template = sniff_template(file_path)
+
+        handler_kwargs = {"incremental": True} if incremental else {}
+        handler = get_handler_class(template)(
+            selected_practice=practice, parse_cache=parse_cache, **handler_kwargs
+        )
+
+        start = time.perf_counter()
+        handler.load_dataframe(file_path)
+        result.rows_in = len(handler.df_raw)
+        result.load_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        handler.transform_data()
+        result.rows_out = len(handler.df_output)
+        result.transform_seconds = time.perf_counter() - start
+        result.run_report = handler.run_report.to_dict()
+
+        start = time.perf_counter()
+        result.save_path = _get_batch_savepath(
+            file_path, template, output_dir, output_file_type, root_dir
+        )
+        os.makedirs(os.path.dirname(result.save_path), exist_ok=True)
+        handler.save_data(savepath=result.save_path)
+        result.save_seconds = time.perf_counter() - start
+
+    except Exception as err:
+        result.error = f"{type(err).__name__}: {err}"
+
+    return result
+
+
+def run_batch(
+    file_paths: list[str],
+    template: str | None,
+    practice: str,
+    output_dir: str | None = None,
+    max_workers: int | None = None,
+    parse_cache: DiskCache | None = None,
+    incremental: bool = False,
+    output_file_type: str = DEFAULT_OUTPUT_FILE_TYPE,
+) -> list[BatchResult]:
+    """Process every report on a process pool sized to the cores available to this process.
+
+    Without a `template`, each report's template is sniffed from its header rows.
+    With `incremental`, reports share the practice's watermark, so they are processed
+    one at a time in file name order.
+    """
+    if not file_paths:
+        return []
+
+    # Fail fast on a bad template rather than once per worker
+    if template is None:
+        if incremental:
+            raise ValueError("Incremental mode requires a template.")
+    else:
+        handler_class = get_handler_class(template)
+        if incremental and "incremental" not in handler_class.__dataclass_fields__:
+            raise ValueError(
+                f"Template '{template}' does not support incremental mode."
+            )
+    if output_file_type not in WRITER_CLASS_DICT:
+        raise ValueError(
+            f"Invalid output file type '{output_file_type}'. Expected one of {list(WRITER_CLASS_DICT)}."
+        )
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    # Outputs mirror the report folders below the folder they all share
+    root_dir = os.path.commonpath(
+        [os.path.dirname(os.path.abspath(path)) for path in file_paths]
+    )
+
+    # os.process_cpu_count is new in Python 3.13, the build workflows run 3.12
+    cpu_count = getattr(os, "process_cpu_count", os.cpu_count)()
+    max_workers = min(max_workers or cpu_count or 1, len(file_paths))
+    if incremental:
+        max_workers = 1
+
+    results = []
+    # Forked workers would inherit the caller's threads and locks (e.g. the GUI's)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        futures = [
+            executor.submit(
+                process_report,
+                file_path,
+                template,
+                practice,
+                output_dir,
+                parse_cache,
+                incremental,
+                output_file_type,
+                root_dir,
+            )
+            for file_path in file_paths
+        ]
+        for future in as_completed(futures):
+            results.append(future.result())
+
+    return sorted(results, key=lambda result: result.file_path)
+
+
+def write_summary(
+    results: list[BatchResult], summary_path: str, total_seconds: float | None = None
+) -> dict:
+    """Write the batch totals and per-report results to `summary_path` as JSON."""
+    summary = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "reports": len(results),
+        "succeeded": sum(result.succeeded for result in results),
+        "failed": sum(not result.succeeded for result in results),
+        "rows_in": sum(result.rows_in or 0 for result in results),
+        "rows_out": sum(result.rows_out or 0 for result in results),
+        "total_seconds": total_seconds,
+        "results": [asdict(result) for result in results],
+    }
+
+    with open(summary_path, "w", encoding="utf-8") as file:
+        json.dump(summary, file, indent=2)
+
+    return summary
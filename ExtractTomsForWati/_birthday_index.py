@@ -0,0 +1,108 @@
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+### Constants and Defaults ###
+# Days before each month in a leap year, so every month-day has one key from 1 to 366
+_LEAP_MONTH_OFFSETS = np.array(
+    [0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335], dtype=np.uint16
+)
+FEB_28_KEY = 59
+FEB_29_KEY = 60
+DAYS_IN_LEAP_YEAR = 366
+
+
+def month_day_key(month, day):
+    """Day of a leap year for each month and day, e.g. 29 Feb is 60 and 31 Dec is 366."""
+    return _LEAP_MONTH_OFFSETS[np.asarray(month) - 1] + np.asarray(day, dtype=np.uint16)
+
+
+def _is_leap_year(year: int) -> bool:
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+@dataclass
+class BirthdayIndex:
+    """Month-day index over a column of birthdays for calendar window queries.
+
+    Keys are sorted once, after which each query is two binary searches per calendar
+    year it spans, returning row positions in the order the birthdays occur.
+    Birthdays on 29 February are celebrated on 28 February in non-leap years.
+    """
+
+    sorted_keys: np.ndarray = field(repr=False)
+    sorted_positions: np.ndarray = field(repr=False)
+
+    @classmethod
+    def from_birthdays(cls, birthdays: pd.Series) -> "BirthdayIndex":
+        """Index the positions of `birthdays`, missing or invalid dates are left out."""
+        birthdays = pd.to_datetime(birthdays, errors="coerce")
+        valid_positions = np.flatnonzero(birthdays.notna().to_numpy())
+        valid_birthdays = birthdays.iloc[valid_positions]
+
+        keys = month_day_key(
+            valid_birthdays.dt.month.to_numpy(), valid_birthdays.dt.day.to_numpy()
+        )
+        order = np.argsort(keys, kind="stable")
+        return cls(sorted_keys=keys[order], sorted_positions=valid_positions[order])
+
+    def __len__(self) -> int:
+        return len(self.sorted_keys)
+
+    # * ---------------------
+    # * Query methods
+    # * ---------------------
+    def _positions_in_year(self, start: date, end: date) -> np.ndarray:
+        """Positions of birthdays from `start` to `end` (inclusive) within one calendar year."""
+        start_key = int(month_day_key(start.month, start.day))
+        end_key = int(month_day_key(end.month, end.day))
+
+        # Without a 29 February, those birthdays fall on the 28th
+        if not _is_leap_year(start.year) and end_key == FEB_28_KEY:
+            end_key = FEB_29_KEY
+
+        left = np.searchsorted(self.sorted_keys, start_key, side="left")
+        right = np.searchsorted(self.sorted_keys, end_key, side="right")
+        return self.sorted_positions[left:right]
+
+    def between(self, start: date, end: date) -> np.ndarray:
+        """Positions of birthdays falling from `start` to `end` inclusive, in date order."""
+        if end < start:
+            raise ValueError(f"Window end {end} is before its start {start}.")
+        if (end - start).days >= DAYS_IN_LEAP_YEAR - 1:
+            # A year or more covers every birthday, starting from `start`
+            left = np.searchsorted(
+                self.sorted_keys, month_day_key(start.month, start.day), side="left"
+            )
+            return np.roll(self.sorted_positions, -left)
+
+        if start.year == end.year:
+            return self._positions_in_year(start, end)
+
+        # The window wraps around the new year
+        return np.concatenate(
+            [
+                self._positions_in_year(start, date(start.year, 12, 31)),
+                self._positions_in_year(date(end.year, 1, 1), end),
+            ]
+        )
+
+    def upcoming(self, days: int, from_date: date | None = None) -> np.ndarray:
+        """Positions of birthdays from `from_date` (default today) up to `days` days later."""
+        from_date = from_date or date.today()
+        return self.between(from_date, from_date + timedelta(days=days))
+
+    def in_week(self, year: int, week: int) -> np.ndarray:
+        """Positions of birthdays in ISO week `week` of `year` (Monday to Sunday)."""
+        monday = date.fromisocalendar(year, week, 1)
+        return self.between(monday, monday + timedelta(days=6))
+
+    def in_month(self, month: int) -> np.ndarray:
+        """Positions of birthdays in `month` (1 to 12), including any 29 February."""
+        start_key = _LEAP_MONTH_OFFSETS[month - 1] + 1
+        end_key = _LEAP_MONTH_OFFSETS[month] if month < 12 else DAYS_IN_LEAP_YEAR
+        left = np.searchsorted(self.sorted_keys, start_key, side="left")
+        right = np.searchsorted(self.sorted_keys, end_key, side="right")
+        return self.sorted_positions[left:right]
@@ -0,0 +1,190 @@
+import re
+from dataclasses import dataclass, field
+from datetime import date
+
+import pandas as pd
+
+### Constants and Defaults ###
+REPORT_HEADER_ROWS = 4  # Report title rows above the two column heading rows
+VALID_COLUMN_NAMES = [
+    "Birthday",
+    "Home Address",
+    "Postal Address",
+    "Work Address",
+    "Contact No.",
+]
+RECORD_COLUMN_LIST = ["Name", "Title", "Birthday", "Contact_Type", "Contact"]
+PAGE_FOOTER_PATTERN = re.compile(r"Page \d+ of")
+
+
+def _parse_birthday(value) -> date | None:
+    """Birthday cells are read as datetimes, anything else is only accepted if it parses."""
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        parsed = pd.to_datetime(value, errors="coerce")
+        return None if pd.isna(parsed) else parsed
+    return None
+
+
+@dataclass
+class MalformedRecord:
+    """A Birthday report row that could not be attached to a complete patient record."""
+
+    row_number: int  # Worksheet row, as numbered in Excel
+    reason: str
+    value: str | None = field(default=None)
+
+    def __str__(self):
+        value = f": {self.value}" if self.value is not None else ""
+        return f"row {self.row_number}, {self.reason}{value}"
+
+
+@dataclass(kw_only=True)
+class BirthdayRecordParser:
+    """Walks the rows of a Birthday report once, emitting one record per patient contact.
+
+    Each patient block starts with a name row, followed by a birthday row, and every row
+    of the block may hold one contact. Rows that cannot be attached to a patient with a
+    valid birthday are collected in `malformed_records` instead of being forward-filled.
+    """
+
+    find_contact_list: list[str]
+    # Only emit contacts of these types, e.g. ["Cell"], all contacts when None
+    contact_type_list: list[str] | None = field(default=None)
+    malformed_records: list[MalformedRecord] = field(default_factory=list, init=False)
+
+    def parse(self, df_raw: pd.DataFrame) -> pd.DataFrame:
+        """Return the report's contacts with the columns in `RECORD_COLUMN_LIST`."""
+        self.malformed_records = []
+        data_rows = self._get_data_rows(df_raw)
+        return pd.DataFrame(self._walk_rows(data_rows), columns=RECORD_COLUMN_LIST)
+
+    def _add_malformed(self, row_number: int, reason: str, value=None):
+        self.malformed_records.append(
+            MalformedRecord(
+                row_number=row_number,
+                reason=reason,
+                value=None if pd.isna(value) else str(value),
+            )
+        )
+
+    def _get_data_rows(self, df_raw: pd.DataFrame) -> pd.DataFrame:
+        """Validate the two column heading rows and return the data rows below them.
+
+        Columns are renamed to the record columns, the index keeps the worksheet row numbers.
+        """
+        # Remove empty rows, the last row (Page 1 of 1) and the report header rows
+        df_rows = df_raw.iloc[:-1]
+        present_cells = df_rows.notna().to_numpy()
+        non_empty_rows = present_cells.any(axis=1)
+        df_rows = df_rows[non_empty_rows].iloc[REPORT_HEADER_ROWS:]
+
+        # Remove all empty columns
+        present_cells = present_cells[non_empty_rows][REPORT_HEADER_ROWS:]
+        df_rows = df_rows.loc[:, present_cells.any(axis=0)]
+
+        # Column headings are split over two rows, e.g. "Home" above " Address"
+        headings = [
+            "".join(cell for cell in column if isinstance(cell, str))
+            for column in df_rows.iloc[0:2].to_numpy().T
+        ]
+        faulty_columns = [
+            col for col in headings if col and col not in VALID_COLUMN_NAMES
+        ]
+        if faulty_columns:
+            raise ValueError(f"Unexpected column names: {', '.join(faulty_columns)}.")
+
+        df_rows = df_rows.iloc[2:]
+        df_rows.columns = range(len(headings))
+
+        # Find the one unnamed column that contains the contact type
+        #! df.ContactType.unique() # [nan, 'Home', 'Cell', 'Work', 'Fax', 'EMail']
+        unnamed_columns = [i for i, heading in enumerate(headings) if not heading]
+        contact_type_mask = df_rows[unnamed_columns].isin(self.find_contact_list).any()
+        contact_type_columns = contact_type_mask[contact_type_mask].index.tolist()
+        if len(contact_type_columns) != 1:
+            raise ValueError(
+                f"Too many columns with unknown headings contain the contact type keywords: {self.find_contact_list}"
+            )
+
+        return pd.DataFrame(
+            {
+                "Name": df_rows[headings.index("Birthday")],
+                "Title": df_rows[headings.index("Home Address")],
+                "Contact_Type": df_rows[contact_type_columns[0]],
+                "Contact": df_rows[headings.index("Contact No.")],
+            },
+            index=df_rows.index,
+        )
+
+    def _walk_rows(self, data_rows: pd.DataFrame) -> list[tuple]:
+        """One pass over the data rows, returns a record tuple per emitted contact."""
+        records = []
+        contact_types = set(self.contact_type_list or self.find_contact_list)
+
+        # Current patient as (name, title, birthday) and the row their block started on
+        patient, patient_row = None, None
+        patient_name, patient_title = None, None
+        patient_contacts = []  # Contacts read before the patient's birthday row
+        expect_birthday = False
+
+        rows = zip(
+            data_rows.index.tolist(),
+            data_rows["Name"].tolist(),
+            data_rows["Name"].notna().tolist(),
+            data_rows["Title"].tolist(),
+            zip(data_rows["Contact_Type"].tolist(), data_rows["Contact"].tolist()),
+            data_rows[["Contact_Type", "Contact"]].notna().any(axis=1).tolist(),
+        )
+        for row_number, first_cell, has_first_cell, title, contact, has_contact in rows:
+            # Patient names are the only text in the first column not starting with a digit
+            if type(first_cell) is str and not first_cell[:1].isdigit():
+                if PAGE_FOOTER_PATTERN.match(first_cell):
+                    continue
+                if expect_birthday:
+                    self._add_malformed(patient_row, "missing birthday", patient_name)
+
+                patient, patient_row = None, row_number
+                patient_name = first_cell.title()
+                patient_title = title.title() if isinstance(title, str) else None
+                patient_contacts = []
+                expect_birthday = True
+
+            elif expect_birthday:
+                # The row below a patient's name holds their birthday
+                expect_birthday = False
+                if not has_first_cell:
+                    self._add_malformed(row_number, "missing birthday", patient_name)
+                    continue
+                birthday = _parse_birthday(first_cell)
+                if birthday is None:
+                    self._add_malformed(row_number, "invalid birthday", first_cell)
+                    continue
+
+                patient = (patient_name, patient_title, birthday)
+                for patient_contact in patient_contacts:
+                    records.append(patient + patient_contact)
+
+            elif has_first_cell:
+                # e.g. a birthday whose name row is missing, its contacts are skipped
+                self._add_malformed(row_number, "unexpected value", first_cell)
+                patient, patient_row = None, row_number
+
+            if not has_contact:
+                continue
+
+            # Contacts of malformed patient blocks are skipped with the reported row
+            if patient_row is None:
+                self._add_malformed(row_number, "contact without a patient", contact[1])
+            elif contact[0] not in contact_types:
+                continue
+            elif expect_birthday:
+                patient_contacts.append(contact)
+            elif patient is not None:
+                records.append(patient + contact)
+
+        if expect_birthday:
+            self._add_malformed(patient_row, "missing birthday", patient_name)
+
+        return records
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+### Constants and Defaults ###
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".classiceyes", "cache")
+DEFAULT_MAX_CACHE_BYTES = 512 * 2**20  # 512 MiB per namespace
+CACHE_FILE_EXT = ".pkl"
+
+
+def file_content_hash(filepath: str) -> str:
+    """Return the SHA-256 hex digest of the file's contents."""
+    with open(filepath, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+@dataclass(kw_only=True)
+class DiskCache:
+    """Size-bounded, least-recently-used on-disk store of pickled values.
+
+    Namespaces hold raw report DataFrames ("parsed") or handler result dicts
+    ("results"). Entries are pickled (protocol 5) rather than written as
+    Parquet/Feather because raw TOMs sheets hold mixed-type object columns (names,
+    dates and numbers in one column) that Arrow cannot round-trip without coercing
+    the cell types.
+    """
+
+    cache_dir: str = field(default=DEFAULT_CACHE_DIR)
+    namespace: str = field(default="parsed")
+    max_size_bytes: int = field(default=DEFAULT_MAX_CACHE_BYTES)
+
+    @property
+    def directory(self) -> str:
+        return os.path.join(self.cache_dir, self.namespace)
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Combine the parts identifying a cached result into a single key."""
+        joined = "\x1f".join(str(part) for part in parts)
+        return hashlib.sha256(joined.encode("utf-8")).hexdigest()
+
+    def _get_entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{CACHE_FILE_EXT}")
+
+    # * ---------------------
+    # * Read/write methods
+    # * ---------------------
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for `key`, or None on a cache miss."""
+        entry_path = self._get_entry_path(key)
+        try:
+            with open(entry_path, "rb") as file:
+                value = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Corrupt or incompatible entry, treat as a miss
+            self._remove_entry(entry_path)
+            return None
+
+        # Mark entry as recently used for LRU eviction
+        os.utime(entry_path)
+        return value
+
+    def put(self, key: str, value: Any):
+        """Store `value` under `key` atomically, then evict old entries if over budget."""
+        os.makedirs(self.directory, exist_ok=True)
+
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                pickle.dump(value, file, protocol=5)
+            os.replace(temp_path, self._get_entry_path(key))
+        except BaseException:
+            self._remove_entry(temp_path)
+            raise
+
+        self.evict()
+
+    def get_or_create(self, key: str, create_function) -> Any:
+        """Return the cached value for `key`, creating and storing it on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = create_function()
+            self.put(key, value)
+        return value
+
+    # * ---------------------
+    # * Inspect and maintenance methods
+    # * ---------------------
+    def entries(self) -> list[dict]:
+        """List cache entries from least to most recently used."""
+        if not os.path.isdir(self.directory):
+            return []
+
+        entries = []
+        for dir_entry in os.scandir(self.directory):
+            if not dir_entry.name.endswith(CACHE_FILE_EXT):
+                continue
+            stat = dir_entry.stat()
+            entries.append(
+                {
+                    "key": dir_entry.name.removesuffix(CACHE_FILE_EXT),
+                    "path": dir_entry.path,
+                    "size_bytes": stat.st_size,
+                    "last_used": datetime.fromtimestamp(stat.st_mtime),
+                }
+            )
+
+        return sorted(entries, key=lambda entry: entry["last_used"])
+
+    def size_bytes(self) -> int:
+        return sum(entry["size_bytes"] for entry in self.entries())
+
+    def evict(self, max_size_bytes: int | None = None) -> int:
+        """Remove least recently used entries until the cache fits. Returns entries removed."""
+        max_size_bytes = (
+            self.max_size_bytes if max_size_bytes is None else max_size_bytes
+        )
+
+        entries = self.entries()
+        total_size = sum(entry["size_bytes"] for entry in entries)
+        removed = 0
+
+        for entry in entries:
+            if total_size <= max_size_bytes:
+                break
+            self._remove_entry(entry["path"])
+            total_size -= entry["size_bytes"]
+            removed += 1
+
+        return removed
+
+    def clear(self) -> int:
+        """Remove every entry in this cache namespace. Returns entries removed."""
+        return self.evict(max_size_bytes=0)
+
+    @staticmethod
+    def _remove_entry(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+if __name__ == "__main__":
+    # Usage: python -m ExtractTomsForWati._cache [info|clear] [namespace]
+    command = sys.argv[1] if len(sys.argv) > 1 else "info"
+    cache = DiskCache(namespace=sys.argv[2]) if len(sys.argv) > 2 else DiskCache()
+
+    if command == "clear":
+        print(f"Removed {cache.clear()} entries from {cache.directory}")
+    else:
+        for entry in cache.entries():
+            print(
+                f"{entry['last_used']:%Y-%m-%d %H:%M:%S}  {entry['size_bytes']:>12,}  {entry['key']}"
+            )
+        print(f"{cache.directory}: {cache.size_bytes():,} bytes")
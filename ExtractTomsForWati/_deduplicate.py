@@ -0,0 +1,167 @@
+import networkx as nx
+import numpy as np
+import pandas as pd
+import recordlinkage
+
+from ._abstract_handler import AbstractHandler
+from ._dtypes import to_compact_dtypes
+from ._phone import to_country_cell_numbers
+
+### Constants and Defaults ###
+DEFAULT_NAME_THRESHOLD = 0.85  # Jaro-Winkler similarity of normalised names
+DEFAULT_PHONE_COLUMN = "CellCountry"
+DEFAULT_NAME_COLUMN = "Name"
+DEFAULT_BIRTHDAY_COLUMN = "Birthday"
+
+
+def _get_blocking_frame(
+    df: pd.DataFrame,
+    phone_column: str,
+    name_column: str,
+    birthday_column: str,
+    message_keys: pd.Series | None = None,
+) -> pd.DataFrame:
+    """Build the normalised keys used to block and compare candidate record pairs.
+
+    TOMs names are "SURNAME FIRST", so the first token is the surname and the last
+    is the given name, as surnames such as "van der Merwe" span several tokens.
+    """
+    name_keys = (
+        df[name_column]
+        .astype("string")
+        .str.lower()
+        .str.replace(r"[^a-z ]", "", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+        .replace("", pd.NA)
+    )
+
+    # Rows with a missing key are never blocked together
+    blocking_df = pd.DataFrame(index=df.index)
+    blocking_df["cell_key"] = to_country_cell_numbers(df[phone_column])
+    blocking_df["name_key"] = name_keys
+    blocking_df["surname_key"] = name_keys.str.extract(r"^(\S+)", expand=False)
+    blocking_df["given_key"] = name_keys.str.extract(r"\s(\S+)$", expand=False)
+    blocking_df["initial_key"] = blocking_df["given_key"].str.slice(0, 1)
+
+    # Rows are only duplicates of the same message, e.g. the same appointment
+    if message_keys is None:
+        blocking_df["message_key"] = ""
+    else:
+        blocking_df["message_key"] = message_keys.astype("string").to_numpy()
+
+    if birthday_column in df.columns:
+        birthdays = pd.to_datetime(df[birthday_column], errors="coerce")
+        blocking_df["birthday_key"] = birthdays.dt.strftime("%Y-%m-%d")
+
+    return blocking_df
+
+
+def find_candidate_pairs(blocking_df: pd.DataFrame) -> pd.MultiIndex:
+    """Candidate pairs of the same message sharing a cell number, or a surname and initial.
+
+    Blocking keeps the number of pairs close to linear in the number of rows,
+    instead of comparing every record with every other record.
+    """
+    indexer = recordlinkage.Index()
+    indexer.block(["cell_key", "message_key"])
+    indexer.block(["surname_key", "initial_key", "message_key"])
+    return indexer.index(blocking_df)
+
+
+def find_duplicate_clusters(
+    df: pd.DataFrame,
+    phone_column: str = DEFAULT_PHONE_COLUMN,
+    name_column: str = DEFAULT_NAME_COLUMN,
+    birthday_column: str = DEFAULT_BIRTHDAY_COLUMN,
+    name_threshold: float = DEFAULT_NAME_THRESHOLD,
+    message_keys: pd.Series | None = None,
+) -> pd.Series:
+    """Label each row with the position of the first row of its duplicate cluster.
+
+    Two rows are the same recipient when they have the same message key (e.g. the
+    appointment's date and time), their full names and given names are similar, and
+    they share a cell number (or a birthday, when the frame has one). Rows with
+    different known birthdays never match, so family members sharing a cell number
+    are kept. Matches are joined transitively with `networkx` connected components.
+    """
+    df = df.reset_index(drop=True)
+    blocking_df = _get_blocking_frame(
+        df, phone_column, name_column, birthday_column, message_keys
+    )
+    candidate_pairs = find_candidate_pairs(blocking_df)
+
+    clusters = pd.Series(np.arange(len(df)), index=df.index)
+    if candidate_pairs.empty:
+        return clusters
+
+    compare = recordlinkage.Compare()
+    compare.string("name_key", "name_key", method="jarowinkler", label="name")
+    # Single-name records are compared on the full name alone
+    compare.string(
+        "given_key", "given_key", method="jarowinkler", missing_value=1, label="given"
+    )
+    compare.exact("cell_key", "cell_key", label="cell")
+    if "birthday_key" in blocking_df.columns:
+        compare.exact("birthday_key", "birthday_key", label="birthday")
+    features = compare.compute(candidate_pairs, blocking_df)
+
+    similar_names = (features["name"] >= name_threshold) & (
+        features["given"] >= name_threshold
+    )
+    shared_contact = features["cell"] == 1
+    if "birthday" in features.columns:
+        shared_contact |= features["birthday"] == 1
+        similar_names &= ~_has_birthday_conflict(blocking_df, features.index)
+    matches = features.index[similar_names & shared_contact]
+
+    # Only matched rows become graph nodes, every other row is its own cluster
+    graph = nx.Graph()
+    graph.add_edges_from(matches)
+    members, representatives = [], []
+    for component in nx.connected_components(graph):
+        first_member = min(component)
+        members.extend(component)
+        representatives.extend([first_member] * len(component))
+    clusters.iloc[members] = np.asarray(representatives, dtype=clusters.dtype)
+
+    return clusters
+
+
+def _has_birthday_conflict(
+    blocking_df: pd.DataFrame, pairs: pd.MultiIndex
+) -> np.ndarray:
+    """Mask of pairs whose birthdays are both known and differ."""
+    birthdays = blocking_df["birthday_key"].to_numpy()
+    left = birthdays[pairs.get_level_values(0)]
+    right = birthdays[pairs.get_level_values(1)]
+    return pd.notna(left) & pd.notna(right) & (left != right)
+
+
+def deduplicate_recipients(df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+    """Keep only the first row of every duplicate-recipient cluster."""
+    df = df.reset_index(drop=True)
+    clusters = find_duplicate_clusters(df, **kwargs)
+    return df[clusters.to_numpy() == np.arange(len(df))].reset_index(drop=True)
+
+
+def deduplicate_handler_outputs(
+    handlers: list[AbstractHandler], **kwargs
+) -> pd.DataFrame:
+    """Combine several handler runs (e.g. one per practice) and deduplicate recipients.
+
+    Rows are only merged when they are the same message of the same template, by each
+    handler's send ledger message key, so a patient's separate appointments are kept.
+    Earlier handlers take precedence when the same patient appears in several outputs.
+    """
+    outputs = [handler._validate_dataframe("df_output") for handler in handlers]
+    message_keys = pd.concat(
+        [
+            f"{handler} " + handler._get_message_keys(output).astype(str)
+            for handler, output in zip(handlers, outputs)
+        ],
+        ignore_index=True,
+    )
+    # Categoricals with different categories (e.g. 'Practice') concatenate as objects
+    df_combined = to_compact_dtypes(pd.concat(outputs, ignore_index=True))
+    return deduplicate_recipients(df_combined, message_keys=message_keys, **kwargs)
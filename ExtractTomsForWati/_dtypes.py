@@ -0,0 +1,56 @@
+import pandas as pd
+
+from ._phone import STRING_DTYPE
+
+### Constants and Defaults ###
+# Few distinct values per report, e.g. 'Practice' is the same string on every row
+CATEGORY_COLUMN_LIST = [
+    "Practice",
+    "Optometrists",
+    "CountryCode",
+    "ExamType",
+    "Contact_Type",
+    "SourceFile",
+    "SourceSheet",
+]
+
+# Free text and numbers kept as text, e.g. leading zeros of cell numbers.
+# 'Time' stays text so outputs keep the report's "08:30" format.
+STRING_COLUMN_LIST = ["CellCountry", "Name", "Title", "Time", "Cell", "Contact"]
+
+# Dates without a time of day, written as "YYYY-MM-DD" by `to_csv`
+DATE_COLUMN_LIST = ["Date", "Birthday", "LastExam", "DueDate"]
+
+# Integer columns with small values, e.g. ages and years
+SMALL_INT_COLUMN_LIST = ["Age", "BirthYear"]
+SMALL_INT_DTYPE = "int16"
+
+
+def _to_dates(values: pd.Series) -> pd.Series:
+    if not pd.api.types.is_datetime64_dtype(values):
+        values = pd.to_datetime(values, errors="coerce")
+    return values.dt.normalize()
+
+
+def to_compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert the known handler columns present in `df` to memory-efficient dtypes.
+
+    Object columns hold a Python object per cell, the same practice string included.
+    Categoricals store each distinct value once, Arrow strings one contiguous buffer
+    and dates a datetime64 value. Unknown columns are left as they are.
+    """
+    converted_dict = {}
+    for column in df.columns:
+        values = df[column]
+        if column in CATEGORY_COLUMN_LIST:
+            converted_dict[column] = values.astype("category")
+        elif column in STRING_COLUMN_LIST:
+            converted_dict[column] = values.astype(STRING_DTYPE)
+        elif column in DATE_COLUMN_LIST:
+            converted_dict[column] = _to_dates(values)
+        elif column in SMALL_INT_COLUMN_LIST and pd.api.types.is_integer_dtype(values):
+            converted_dict[column] = values.astype(SMALL_INT_DTYPE)
+
+    if not converted_dict:
+        return df
+    return df.assign(**converted_dict)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import copy
+import multiprocessing
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TYPE_CHECKING
+
+from ._sniffer import get_sheet_names, read_header_cells
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from ._abstract_handler import AbstractHandler
+    from ._instrumentation import RunReport
+
+### Constants and Defaults ###
+# Columns added to the rows of multi-source runs, naming their workbook and worksheet
+SOURCE_FILE_COLUMN = "SourceFile"
+SOURCE_SHEET_COLUMN = "SourceSheet"
+PROVENANCE_COLUMN_LIST = [SOURCE_FILE_COLUMN, SOURCE_SHEET_COLUMN]
+
+# A workbook path (each of its worksheets with the handler's layout) or a (path, sheet) pair
+ReportSource = str | tuple[str, int | str]
+
+# Attributes a worker's copy of the handler starts without, e.g. open connections
+_WORKER_RESET_ATTRIBUTE_LIST = [
+    "df_raw",
+    "df_clean",
+    "df_output",
+    "run_report",
+    "send_ledger",
+    "cancel_token",
+    "progress_callback",
+]
+
+
+def expand_sources(
+    sources: list[ReportSource], header_signature: frozenset[str]
+) -> list[tuple[str, str]]:
+    """(workbook path, sheet name) of every worksheet to process, in source order.
+
+    A bare path stands for each of its worksheets with the handler's header signature,
+    e.g. a month of appointments split over several sheets. Workbooks without such a
+    sheet keep their first, which then fails validation naming the missing headings.
+    """
+    expanded = []
+    for source in sources:
+        if isinstance(source, tuple):
+            file_path, sheet = source
+            if isinstance(sheet, int):
+                sheet = get_sheet_names(file_path)[sheet]
+            expanded.append((file_path, sheet))
+            continue
+
+        sheet_names = get_sheet_names(source)
+        matching_sheets = [
+            sheet_name
+            for sheet_name in sheet_names
+            if header_signature <= read_header_cells(source, sheet=sheet_name)
+        ]
+        expanded.extend(
+            (source, sheet_name) for sheet_name in matching_sheets or sheet_names[:1]
+        )
+
+    return expanded
+
+
+def copy_handler_for_worker(handler: AbstractHandler) -> AbstractHandler:
+    """A copy of the handler's configuration that can be pickled to a worker process."""
+    worker_handler = copy.copy(handler)
+    for attribute in _WORKER_RESET_ATTRIBUTE_LIST:
+        setattr(worker_handler, attribute, None)
+    return worker_handler
+
+
+def clean_source(
+    handler: AbstractHandler, file_path: str, sheet: str
+) -> tuple[pd.DataFrame, RunReport]:
+    """Load and clean one worksheet, tagging its rows with their workbook and sheet."""
+    handler.sheet = sheet
+    handler.load_dataframe(file_path)
+    with handler._stage("clean_data", handler.df_raw) as stage:
+        handler._clean_data()
+        stage.set_output(handler.df_clean)
+
+    df_clean = handler.df_clean.assign(
+        **{SOURCE_FILE_COLUMN: os.path.basename(file_path), SOURCE_SHEET_COLUMN: sheet}
+    )
+    return df_clean, handler.run_report
+
+
+def iter_cleaned_sources(
+    handler: AbstractHandler,
+    sheet_sources: list[tuple[str, str]],
+    max_workers: int | None = None,
+) -> Iterator[tuple[int, pd.DataFrame, RunReport]]:
+    """Yield (source position, cleaned rows, run report) as each worksheet finishes.
+
+    Worksheets are cleaned on a process pool sized to the cores available to this
+    process. A single worksheet is cleaned in this process, without starting a pool.
+    Closing the iterator early (e.g. on cancellation) drops the queued worksheets.
+    """
+    worker_handler = copy_handler_for_worker(handler)
+    # os.process_cpu_count is new in Python 3.13, the build workflows run 3.12
+    cpu_count = getattr(os, "process_cpu_count", os.cpu_count)()
+    max_workers = min(max_workers or cpu_count or 1, len(sheet_sources))
+    if max_workers <= 1:
+        for position, (file_path, sheet) in enumerate(sheet_sources):
+            yield position, *clean_source(copy.copy(worker_handler), file_path, sheet)
+        return
+
+    # Forked workers would inherit the caller's threads and locks (e.g. the GUI's)
+    context = multiprocessing.get_context("spawn")
+    executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+    try:
+        future_dict = {
+            executor.submit(clean_source, worker_handler, file_path, sheet): position
+            for position, (file_path, sheet) in enumerate(sheet_sources)
+        }
+        for future in as_completed(future_dict):
+            yield future_dict[future], *future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
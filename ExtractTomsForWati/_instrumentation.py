@@ -0,0 +1,127 @@
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+
+@dataclass
+class StageRecord:
+    """Timing, memory and row counts of a single handler stage or sub-step."""
+
+    name: str
+    parent: str | None = field(default=None)
+    wall_seconds: float = field(default=0.0)
+    cpu_seconds: float = field(default=0.0)
+    peak_memory_bytes: int | None = field(default=None)
+    rows_in: int | None = field(default=None)
+    rows_out: int | None = field(default=None)
+
+    def set_output(self, df) -> None:
+        self.rows_out = None if df is None else len(df)
+
+
+@dataclass
+class RunReport:
+    """Structured record of one handler run, built up stage by stage."""
+
+    handler: str
+    file_path: str | None = field(default=None)
+    started: datetime = field(default_factory=datetime.now)
+    track_memory: bool = field(default=False)
+    stages: list[StageRecord] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)  # e.g. skipped malformed rows
+
+    # Stack of [record, start wall, start cpu, start traced bytes, running peak]
+    _open_stages: list[list] = field(default_factory=list, repr=False)
+
+    @contextmanager
+    def stage(self, name: str, df_in=None):
+        """Record the block as a stage, nested under any stage that is already open."""
+        parent = self._open_stages[-1][0].name if self._open_stages else None
+        record = StageRecord(
+            name=name, parent=parent, rows_in=None if df_in is None else len(df_in)
+        )
+        self.stages.append(record)
+
+        # Each stage resets the tracemalloc peak, so parents keep a running maximum
+        start_bytes = None
+        if self.track_memory and tracemalloc.is_tracing():
+            current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+            if self._open_stages:
+                self._open_stages[-1][4] = max(self._open_stages[-1][4], peak_bytes)
+            tracemalloc.reset_peak()
+            start_bytes = current_bytes
+
+        self._open_stages.append(
+            [record, time.perf_counter(), time.process_time(), start_bytes, 0]
+        )
+        try:
+            yield record
+        finally:
+            _, start_wall, start_cpu, start_bytes, running_peak = (
+                self._open_stages.pop()
+            )
+            record.wall_seconds = time.perf_counter() - start_wall
+            record.cpu_seconds = time.process_time() - start_cpu
+
+            if start_bytes is not None:
+                peak_bytes = max(running_peak, tracemalloc.get_traced_memory()[1])
+                record.peak_memory_bytes = peak_bytes - start_bytes
+                if self._open_stages:
+                    self._open_stages[-1][4] = max(self._open_stages[-1][4], peak_bytes)
+
+    # * ---------------------
+    # * Reporting methods
+    # * ---------------------
+    def get_stage(self, name: str) -> StageRecord | None:
+        return next((stage for stage in self.stages if stage.name == name), None)
+
+    @property
+    def total_wall_seconds(self) -> float:
+        return sum(stage.wall_seconds for stage in self.stages if stage.parent is None)
+
+    @property
+    def peak_memory_bytes(self) -> int | None:
+        peaks = [
+            stage.peak_memory_bytes
+            for stage in self.stages
+            if stage.parent is None and stage.peak_memory_bytes is not None
+        ]
+        return max(peaks) if peaks else None
+
+    def to_dict(self) -> dict:
+        report_dict = asdict(self)
+        report_dict.pop("_open_stages")
+        report_dict["started"] = self.started.isoformat(timespec="seconds")
+        report_dict["total_wall_seconds"] = self.total_wall_seconds
+        report_dict["peak_memory_bytes"] = self.peak_memory_bytes
+        return report_dict
+
+    def append_to_jsonl(self, log_path: str):
+        """Append the report as a single JSON line to `log_path`."""
+        log_dir = os.path.dirname(os.path.abspath(log_path))
+        os.makedirs(log_dir, exist_ok=True)
+        with open(log_path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(self.to_dict()) + "\n")
+
+    def summary_lines(self) -> list[str]:
+        """Human readable one line per stage, sub-steps indented under their stage."""
+        lines = []
+        for stage in self.stages:
+            rows = ""
+            if stage.rows_in is not None or stage.rows_out is not None:
+                rows = f", rows {stage.rows_in if stage.rows_in is not None else '-'}"
+                rows += f" -> {stage.rows_out if stage.rows_out is not None else '-'}"
+            memory = ""
+            if stage.peak_memory_bytes is not None:
+                memory = f", peak {stage.peak_memory_bytes / 2**20:.1f} MB"
+
+            indent = "    " if stage.parent else ""
+            lines.append(
+                f"{indent}{stage.name}: {stage.wall_seconds:.2f}s{rows}{memory}"
+            )
+        lines.extend(f"Warning: {warning}" for warning in self.warnings)
+        return lines
@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import os
+import pickle
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from ._cache import DiskCache
+from ._instrumentation import RunReport
+from ._progress import CancelToken, JobCancelled
+from ._registry import get_handler_class, import_all_handlers
+from ._sniffer import sniff_template
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from ._abstract_handler import AbstractHandler
+
+### Constants and Defaults ###
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_JOB_STATUS_LIST = [JOB_DONE, JOB_FAILED, JOB_CANCELLED]
+
+# Serialized frame formats, Arrow IPC unless a column cannot be converted
+FRAME_FORMAT_ARROW = "arrow"
+FRAME_FORMAT_PICKLE = "pickle"
+
+
+# * ---------------------
+# * Frame serialization
+# * ---------------------
+def serialize_frame(df: pd.DataFrame) -> tuple[str, bytes]:
+    """Serialize a handler output compactly for the trip back from a worker process."""
+    try:
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return FRAME_FORMAT_ARROW, sink.getvalue().to_pybytes()
+
+    except (ImportError, TypeError, ValueError):
+        # Mixed-type object columns (pyarrow.ArrowException subclasses these)
+        return FRAME_FORMAT_PICKLE, pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def deserialize_frame(frame_format: str, payload: bytes) -> pd.DataFrame:
+    if frame_format == FRAME_FORMAT_PICKLE:
+        return pickle.loads(payload)
+
+    import pyarrow as pa
+
+    from ._phone import STRING_DTYPE
+
+    # Arrow strings come back as Python-backed strings unless mapped explicitly
+    string_types_dict = {pa.string(): STRING_DTYPE, pa.large_string(): STRING_DTYPE}
+    return (
+        pa.ipc.open_stream(payload)
+        .read_all()
+        .to_pandas(types_mapper=string_types_dict.get)
+    )
+
+
+# * ---------------------
+# * Worker process functions
+# * ---------------------
+def _warm_up_worker():
+    """Import the heavy modules once per worker, before its first job arrives."""
+    import openpyxl  # noqa: F401
+    import xlrd  # noqa: F401
+
+    import_all_handlers()
+
+
+def _noop():
+    return os.getpid()
+
+
+@dataclass
+class JobResult:
+    """What a worker sends back: the serialized output frame and the run report."""
+
+    frame_format: str
+    frame_payload: bytes
+    run_report: RunReport | None
+    template: str  # Detected by the worker when the job was submitted without one
+
+
+def run_job(
+    job_id: int,
+    template: str | None,
+    practice: str,
+    file_path: str,
+    parse_cache: DiskCache | None,
+    result_cache: DiskCache | None,
+    cancel_event,
+    progress_queue,
+) -> JobResult:
+    """Load and process one report in a worker process, publishing progress by job id.
+
+    Without a `template`, it is detected from the report's header rows, which parses
+    legacy `.xls` workbooks in full and so is kept off the GUI thread.
+    """
+    if template is None:
+        template = sniff_template(file_path)
+
+    handler = get_handler_class(template)(
+        selected_practice=practice,
+        parse_cache=parse_cache,
+        result_cache=result_cache,
+        cancel_token=CancelToken(_event=cancel_event),
+        progress_callback=lambda fraction, stage: progress_queue.put(
+            (job_id, fraction, stage)
+        ),
+    )
+    df_output = handler.load_and_process(file_path)
+
+    return JobResult(
+        *serialize_frame(df_output), run_report=handler.run_report, template=template
+    )
+
+
+# * ---------------------
+# * Job engine
+# * ---------------------
+@dataclass
+class Job:
+    """A report submitted to the `JobEngine`, updated in place by `JobEngine.poll`."""
+
+    job_id: int
+    template: str | None  # None until the worker has detected it
+    practice: str
+    file_path: str
+    status: str = field(default=JOB_QUEUED)
+    fraction: float = field(default=0.0)
+    stage: str | None = field(default=None)
+    error: str | None = field(default=None)
+
+    # Rebuilt in the GUI process once finished, ready for `save_data`
+    handler: AbstractHandler | None = field(default=None, repr=False)
+
+    _future: Future | None = field(default=None, repr=False)
+    _cancel_event: object = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_JOB_STATUS_LIST
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == JOB_DONE
+
+    @property
+    def failed(self) -> bool:
+        return self.status == JOB_FAILED
+
+
+class JobEngine:
+    """Persistent pool of pre-warmed worker processes that run handler jobs in parallel.
+
+    Jobs run outside the GUI process, so pandas never holds the Tk thread's GIL.
+    Call `poll` from the Tk event loop (e.g. with `after`) to collect progress and results.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        parse_cache: DiskCache | None = None,
+        result_cache: DiskCache | None = None,
+    ):
+        # os.process_cpu_count is new in Python 3.13, the build workflows run 3.12
+        cpu_count = getattr(os, "process_cpu_count", os.cpu_count)()
+        self.max_workers = max_workers or min(cpu_count or 1, 4)
+        self.parse_cache = parse_cache
+        self.result_cache = result_cache
+        self.jobs: dict[int, Job] = {}
+
+        self._job_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._manager = None
+        self._progress_queue = None
+
+    def start(self):
+        """Start the worker processes and import pandas in them. Safe to call repeatedly."""
+        with self._lock:
+            if self._executor is not None:
+                return
+
+            # Spawned workers never inherit the Tk interpreter state
+            context = multiprocessing.get_context("spawn")
+            self._manager = context.Manager()
+            self._progress_queue = self._manager.Queue()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+                initializer=_warm_up_worker,
+            )
+
+            # Each submission starts another worker while none are idle
+            for _ in range(self.max_workers):
+                self._executor.submit(_noop)
+
+    def submit(self, template: str | None, practice: str, file_path: str) -> Job:
+        """Queue a report for processing and return its `Job`.
+
+        Pass `template=None` to detect the template in the worker, see `run_job`.
+        """
+        if template is not None:
+            get_handler_class(template)  # Fail fast on a bad template
+        self.start()
+
+        job = Job(
+            job_id=next(self._job_ids),
+            template=template,
+            practice=practice,
+            file_path=file_path,
+            _cancel_event=self._manager.Event(),
+        )
+        job._future = self._executor.submit(
+            run_job,
+            job.job_id,
+            template,
+            practice,
+            file_path,
+            self.parse_cache,
+            self.result_cache,
+            job._cancel_event,
+            self._progress_queue,
+        )
+        self.jobs[job.job_id] = job
+        return job
+
+    def cancel(self, job_id: int | None = None):
+        """Cancel one job, or every unfinished job when `job_id` is None."""
+        jobs = self.jobs.values() if job_id is None else [self.jobs[job_id]]
+        for job in jobs:
+            if job.finished:
+                continue
+            # Queued jobs never start, running jobs stop at their next check
+            if not job._future.cancel():
+                job._cancel_event.set()
+            job.status = JOB_CANCELLED
+
+    def poll(self) -> list[Job]:
+        """Apply published progress and collect finished jobs. Returns the jobs that changed."""
+        changed = {}
+        while self._progress_queue is not None:
+            try:
+                job_id, fraction, stage = self._progress_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            job = self.jobs.get(job_id)
+            if job is not None and not job.finished:
+                job.status, job.fraction, job.stage = JOB_RUNNING, fraction, stage
+                changed[job_id] = job
+
+        for job in self.jobs.values():
+            if job.finished or not job._future.done():
+                continue
+
+            self._collect_result(job)
+            changed[job.job_id] = job
+
+        return list(changed.values())
+
+    def _collect_result(self, job: Job):
+        try:
+            result = job._future.result()
+        except JobCancelled as err:
+            job.status, job.error = JOB_CANCELLED, str(err)
+            return
+        except Exception as err:
+            job.status, job.error = JOB_FAILED, f"{type(err).__name__}: {err}"
+            return
+
+        job.template = result.template
+        handler = get_handler_class(job.template)(
+            selected_practice=job.practice, file_path=job.file_path
+        )
+        handler.df_output = deserialize_frame(result.frame_format, result.frame_payload)
+        handler.run_report = result.run_report
+
+        job.handler = handler
+        job.status, job.fraction = JOB_DONE, 1.0
+
+    @property
+    def active_jobs(self) -> list[Job]:
+        return [job for job in self.jobs.values() if not job.finished]
+
+    def clear_finished(self):
+        self.jobs = {
+            job_id: job for job_id, job in self.jobs.items() if not job.finished
+        }
+
+    def shutdown(self):
+        self.cancel()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._manager.shutdown()
+            self._executor = self._manager = self._progress_queue = None
@@ -0,0 +1,62 @@
+import re
+
+import pandas as pd
+
+### Constants and Defaults ###
+DEFAULT_COUNTRY_CODE = "27"
+# South African numbers without the leading '0' or country code
+NATIONAL_NUMBER_LENGTH = 9
+
+# Known dummy numbers captured at the front desk (national part only)
+PLACEHOLDER_NUMBER_LIST = ["123456789", "012345678"]
+
+# Spaces, dashes and brackets typed into numbers, plus the '.0' of numeric Excel cells
+_SEPARATOR_PATTERN = r"\.0$|[\s\-()]"
+
+
+def _get_string_dtype() -> pd.StringDtype:
+    """Prefer Arrow-backed strings, whose `.str` methods run in C, when pyarrow is installed."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return pd.StringDtype("python")
+    return pd.StringDtype("pyarrow")
+
+
+STRING_DTYPE = _get_string_dtype()
+
+
+def to_country_cell_numbers(
+    contacts: pd.Series, country_code: str = DEFAULT_COUNTRY_CODE
+) -> pd.Series:
+    """Normalise contact numbers to '<country_code><national number>' in one vectorized pass.
+
+    Numbers may be written in local ('082 123 4567'), international ('+27821234567')
+    or Excel-mangled ('821234567.0') form. Anything that is not a valid, non-placeholder
+    number is returned as <NA>.
+    """
+    numbers = contacts.astype(STRING_DTYPE).str.strip()
+    numbers = numbers.str.replace(_SEPARATOR_PATTERN, "", regex=True)
+
+    # Strip an optional local '0' or (+)country code prefix from otherwise valid numbers
+    prefix_pattern = (
+        rf"^(?:\+?{re.escape(country_code)}|0)(\d{{{NATIONAL_NUMBER_LENGTH}}})$"
+    )
+    national = numbers.str.replace(prefix_pattern, r"\1", regex=True)
+    format_mask = national.str.fullmatch(rf"\d{{{NATIONAL_NUMBER_LENGTH}}}")
+
+    # Reject repeated-digit ('000000000') and known dummy numbers
+    repeated_digit = national.str.slice(0, 1).str.repeat(NATIONAL_NUMBER_LENGTH)
+    placeholder_mask = (national == repeated_digit) | national.isin(
+        PLACEHOLDER_NUMBER_LIST
+    )
+
+    valid_mask = format_mask.fillna(False) & ~placeholder_mask.fillna(False)
+    return (country_code + national).where(valid_mask)
+
+
+def get_valid_cell_mask(
+    contacts: pd.Series, country_code: str = DEFAULT_COUNTRY_CODE
+) -> pd.Series:
+    """Return a boolean mask of the contact numbers that normalise to a valid cell number."""
+    return to_country_cell_numbers(contacts, country_code).notna()
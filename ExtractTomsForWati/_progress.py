@@ -0,0 +1,37 @@
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+### Constants and Defaults ###
+# Share of a handler run's progress covered by each top-level stage, as (start, end)
+STAGE_PROGRESS_DICT = {
+    "load_dataframe": (0.0, 0.7),
+    "clean_data": (0.7, 0.85),
+    "add_features": (0.85, 0.95),
+    "extract_features": (0.95, 1.0),
+}
+
+# Called with the fraction of the run completed (0 to 1) and the current stage name
+ProgressCallback = Callable[[float, str], None]
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler run once its `CancelToken` has been cancelled."""
+
+
+@dataclass
+class CancelToken:
+    """Thread-safe flag checked by a handler between and inside its stages."""
+
+    _event: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise JobCancelled("Processing was cancelled.")
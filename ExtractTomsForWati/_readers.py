@@ -0,0 +1,223 @@
+import os
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import time
+
+import pandas as pd
+
+### Constants and Defaults ###
+# Bump whenever the rows produced by a reader change (used to key cached parses)
+READER_VERSION = "2"
+
+# Rows between calls to a reader's `row_callback`
+ROW_CALLBACK_INTERVAL = 1000
+
+# Shared NaN sentinel so that empty cells can be detected with an identity check
+_NAN = float("nan")
+
+
+@dataclass(kw_only=True)
+class AbstractReader(ABC):
+    """Streams the rows of a single worksheet into a compact, header-less DataFrame.
+
+    Rows are filtered while they are read so that handlers never receive the
+    blank rows and known junk rows that their `_clean_data` would throw away. The
+    index keeps each row's number in the worksheet, counting from 1 as Excel does.
+    """
+
+    sheet: int | str = field(default=0)
+    drop_empty_rows: bool = field(default=True)
+    drop_rows_containing_list: list[str] = field(default_factory=list)
+
+    # Called with (rows read, total rows if known) while streaming, may raise to abort.
+    # Excluded from the repr, which keys cached parses.
+    row_callback: Callable[[int, int | None], None] | None = field(
+        default=None, repr=False, compare=False
+    )
+    total_rows: int | None = field(default=None, init=False, repr=False, compare=False)
+
+    def read(self, filepath: str) -> pd.DataFrame:
+        """Read the worksheet at `filepath` into a DataFrame shaped like `pd.read_excel(header=None)`.
+
+        The index holds the worksheet row numbers of the rows kept.
+        """
+        rows = self._iter_rows(filepath)
+        if self.row_callback is not None:
+            rows = self._report_rows(rows)
+
+        row_numbers, kept_rows = [], []
+        for row_number, row in self._filter_rows(enumerate(rows, start=1)):
+            row_numbers.append(row_number)
+            kept_rows.append(row)
+
+        # Pad ragged rows so every cell is NaN rather than None when missing
+        width = max((len(row) for row in kept_rows), default=0)
+        for row in kept_rows:
+            if len(row) < width:
+                row.extend([_NAN] * (width - len(row)))
+
+        return pd.DataFrame(kept_rows, index=row_numbers)
+
+    def _filter_rows(
+        self, numbered_rows: Iterable[tuple[int, list]]
+    ) -> Iterator[tuple[int, list]]:
+        """Drop all-empty rows and rows whose first cell is a known junk keyword."""
+        junk_keywords = set(self.drop_rows_containing_list)
+
+        for row_number, row in numbered_rows:
+            if self.drop_empty_rows and all(cell is _NAN for cell in row):
+                continue
+            if junk_keywords and row and row[0] in junk_keywords:
+                continue
+            yield row_number, row
+
+    def _report_rows(self, rows: Iterable[list]) -> Iterator[list]:
+        """Pass rows through, calling `row_callback` every `ROW_CALLBACK_INTERVAL` rows."""
+        rows_read = 0
+        for rows_read, row in enumerate(rows, start=1):
+            if rows_read % ROW_CALLBACK_INTERVAL == 0:
+                self.row_callback(rows_read, self.total_rows)
+            yield row
+        self.row_callback(rows_read, rows_read)
+
+    @abstractmethod
+    def _iter_rows(self, filepath: str) -> Iterator[list]:
+        """Yield each worksheet row as a list of cell values, using `_NAN` for empty cells.
+
+        Readers that know the sheet's size up front set `total_rows` before the first row.
+        """
+        pass
+
+
+@dataclass(kw_only=True)
+class OpenpyxlReader(AbstractReader):
+    """Streaming reader for `.xlsx` workbooks using openpyxl's read-only mode."""
+
+    def _iter_rows(self, filepath: str) -> Iterator[list]:
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(filepath, read_only=True, data_only=True)
+        try:
+            if isinstance(self.sheet, int):
+                worksheet = workbook.worksheets[self.sheet]
+            else:
+                worksheet = workbook[self.sheet]
+
+            # Exported workbooks often carry incorrect dimensions, so recompute them.
+            # The stored dimension is still a good enough estimate for progress.
+            self.total_rows = worksheet.max_row
+            worksheet.reset_dimensions()
+
+            for values in worksheet.iter_rows(values_only=True):
+                # Match pandas: empty cells become NaN and whole floats become ints
+                yield [
+                    (
+                        _NAN
+                        if value is None or value == ""
+                        else (
+                            int(value)
+                            if type(value) is float and value.is_integer()
+                            else value
+                        )
+                    )
+                    for value in values
+                ]
+        finally:
+            workbook.close()
+
+
+@dataclass(kw_only=True)
+class XlrdReader(AbstractReader):
+    """Streaming reader for legacy `.xls` workbooks using xlrd's on-demand sheet loading."""
+
+    def _iter_rows(self, filepath: str) -> Iterator[list]:
+        import xlrd
+        from xlrd import xldate
+
+        workbook = xlrd.open_workbook(filepath, on_demand=True)
+        try:
+            if isinstance(self.sheet, int):
+                worksheet = workbook.sheet_by_index(self.sheet)
+            else:
+                worksheet = workbook.sheet_by_name(self.sheet)
+            epoch1904 = workbook.datemode
+            self.total_rows = worksheet.nrows
+
+            for row_index in range(worksheet.nrows):
+                row = []
+                cell_types = worksheet.row_types(row_index)
+                cell_values = worksheet.row_values(row_index)
+
+                for cell_type, value in zip(cell_types, cell_values):
+                    if cell_type in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK) or (
+                        cell_type == xlrd.XL_CELL_ERROR
+                    ):
+                        value = _NAN
+                    elif cell_type == xlrd.XL_CELL_TEXT:
+                        value = value if value != "" else _NAN
+                    elif cell_type == xlrd.XL_CELL_NUMBER:
+                        value = int(value) if value.is_integer() else value
+                    elif cell_type == xlrd.XL_CELL_BOOLEAN:
+                        value = bool(value)
+                    elif cell_type == xlrd.XL_CELL_DATE:
+                        value = self._convert_xldate(value, epoch1904, xldate)
+                    row.append(value)
+
+                yield row
+
+            # Only this sheet was loaded (on demand), release it once streamed
+            workbook.unload_sheet(worksheet.name)
+        finally:
+            workbook.release_resources()
+
+    @staticmethod
+    def _convert_xldate(value: float, epoch1904: int, xldate):
+        """Convert an Excel serial date the same way pandas' xlrd engine does."""
+        try:
+            value = xldate.xldate_as_datetime(value, epoch1904)
+        except OverflowError:
+            return value
+
+        # Time-only cells are stored relative to the workbook epoch
+        year_month_day = value.timetuple()[0:3]
+        if (not epoch1904 and year_month_day == (1899, 12, 31)) or (
+            epoch1904 and year_month_day == (1904, 1, 1)
+        ):
+            value = time(value.hour, value.minute, value.second, value.microsecond)
+        return value
+
+
+@dataclass(kw_only=True)
+class PandasReader(AbstractReader):
+    """Fallback reader wrapping `pd.read_excel`, i.e. the original non-streaming load path."""
+
+    def read(self, filepath: str) -> pd.DataFrame:
+        df = pd.read_excel(filepath, header=None, sheet_name=self.sheet)
+        df.index += 1  # Worksheet row numbers
+
+        if self.drop_empty_rows:
+            df = df.dropna(how="all")
+        if self.drop_rows_containing_list and not df.empty:
+            junk_mask = df.loc[:, 0].isin(self.drop_rows_containing_list)
+            df = df[~junk_mask]
+        return df
+
+    def _iter_rows(self, filepath: str) -> Iterator[list]:
+        yield from self.read(filepath).itertuples(index=False, name=None)
+
+
+# * ---------------------
+# * Reader selection
+# * ---------------------
+READER_CLASS_DICT: dict[str, type[AbstractReader]] = {
+    ".xlsx": OpenpyxlReader,
+    ".xlsm": OpenpyxlReader,
+    ".xls": XlrdReader,
+}
+
+
+def get_reader_class(filepath: str) -> type[AbstractReader]:
+    """Return the streaming reader registered for the file's extension, or `PandasReader`."""
+    file_ext = os.path.splitext(filepath)[-1].lower()
+    return READER_CLASS_DICT.get(file_ext, PandasReader)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import importlib
+import os
+import tomllib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Also lets PyInstaller find the handler modules that are imported by name below
+    from ._abstract_handler import AbstractHandler
+    from .appointment_handler import AppointmentHandler
+    from .birthday_handler import BirthdayHandler
+    from .recall_handler import RecallHandler
+
+### Constants and Defaults ###
+# Template name to (module, handler class). Handler modules import pandas, so they
+# are only imported when a handler is first needed, listing templates stays cheap.
+HANDLER_MODULE_DICT: dict[str, tuple[str, str]] = {
+    "Appointment": (".appointment_handler", "AppointmentHandler"),
+    "Birthday": (".birthday_handler", "BirthdayHandler"),
+    "Recall": (".recall_handler", "RecallHandler"),
+}
+
+# Further templates declared as TOML specs (see `_spec_handler.py`), one file each
+SPEC_DIR = os.path.join(os.path.expanduser("~"), ".classiceyes", "specs")
+
+
+def _find_spec_files(spec_dir: str) -> dict[str, str]:
+    """Template name to spec file. Built-in templates keep their names."""
+    if not os.path.isdir(spec_dir):
+        return {}
+
+    spec_file_dict = {}
+    for entry in sorted(os.scandir(spec_dir), key=lambda entry: entry.name):
+        if not entry.name.endswith(".toml"):
+            continue
+        # Unreadable specs are listed by file name and fail once their handler is needed
+        try:
+            with open(entry.path, "rb") as file:
+                name = tomllib.load(file).get("name")
+        except (OSError, tomllib.TOMLDecodeError):
+            name = None
+        name = name or entry.name.removesuffix(".toml")
+        if name not in HANDLER_MODULE_DICT:
+            spec_file_dict.setdefault(name, entry.path)
+    return spec_file_dict
+
+
+SPEC_FILE_DICT = _find_spec_files(SPEC_DIR)
+TEMPLATE_NAME_LIST = [*HANDLER_MODULE_DICT, *SPEC_FILE_DICT]
+
+
+def get_handler_class(template: str) -> type[AbstractHandler]:
+    """Return the handler class registered for a Wati template name, e.g. 'Appointment'."""
+    if template in SPEC_FILE_DICT:
+        from ._spec_handler import HandlerSpec, compile_spec
+
+        return compile_spec(HandlerSpec.from_toml(SPEC_FILE_DICT[template]))
+
+    try:
+        module_name, class_name = HANDLER_MODULE_DICT[template]
+    except KeyError:
+        raise ValueError(
+            f"Unknown template '{template}'. Expected one of {TEMPLATE_NAME_LIST}."
+        ) from None
+
+    return getattr(importlib.import_module(module_name, __package__), class_name)
+
+
+def import_all_handlers() -> list[type[AbstractHandler]]:
+    """Import every handler module now, e.g. on a background thread to warm up the app."""
+    return [get_handler_class(template) for template in TEMPLATE_NAME_LIST]
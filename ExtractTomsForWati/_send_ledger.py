@@ -0,0 +1,175 @@
+import os
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+### Constants and Defaults ###
+DEFAULT_LEDGER_PATH = os.path.join(
+    os.path.expanduser("~"), ".classiceyes", "send_ledger.sqlite3"
+)
+
+# Messages Wati accepted, and messages whose batch may have reached Wati (e.g. a timeout
+# after it was sent). Neither is sent again.
+SENT_STATUS = "sent"
+UNKNOWN_STATUS = "unknown"
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS sends (
+    template TEXT NOT NULL,
+    cell_country TEXT NOT NULL,
+    message_key TEXT NOT NULL,
+    sent_at TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'sent',
+    PRIMARY KEY (template, cell_country, message_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS sends_sent_at ON sends (sent_at);
+"""
+
+
+@dataclass(kw_only=True)
+class SendLedger:
+    """SQLite record of template messages already sent, used to avoid re-messaging patients.
+
+    A message is identified by (template, CellCountry, message key), where the key is
+    chosen by the handler, e.g. the appointment date and time. Messages with an unknown
+    outcome are skipped like sent ones until they are checked in Wati and cleared.
+    """
+
+    db_path: str = field(default=DEFAULT_LEDGER_PATH)
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        connection = sqlite3.connect(self.db_path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_SCHEMA_SQL)
+
+        # Ledgers created before outcomes were recorded only hold sent messages
+        columns = [row[1] for row in connection.execute("PRAGMA table_info(sends)")]
+        if "status" not in columns:
+            connection.execute(
+                "ALTER TABLE sends ADD COLUMN status TEXT NOT NULL DEFAULT 'sent'"
+            )
+        return connection
+
+    @staticmethod
+    def _to_rows(template: str, cell_numbers, message_keys) -> list[tuple]:
+        return [
+            (template, str(cell_number), str(message_key))
+            for cell_number, message_key in zip(cell_numbers, message_keys)
+        ]
+
+    # * ---------------------
+    # * Query methods
+    # * ---------------------
+    def get_sent_mask(
+        self, template: str, cell_numbers: pd.Series, message_keys: pd.Series
+    ) -> pd.Series:
+        """Return a boolean mask, aligned to `cell_numbers`, of messages already sent.
+
+        Candidates are bulk-loaded into a temporary table and matched against the
+        ledger's primary key in a single set-based query.
+        """
+        rows = self._to_rows(template, cell_numbers, message_keys)
+        sent = pd.Series(False, index=cell_numbers.index)
+        if not rows:
+            return sent
+
+        with closing(self._connect()) as connection:
+            connection.execute(
+                "CREATE TEMP TABLE candidates "
+                "(position INTEGER, template TEXT, cell_country TEXT, message_key TEXT)"
+            )
+            connection.executemany(
+                "INSERT INTO candidates VALUES (?, ?, ?, ?)",
+                ((position, *row) for position, row in enumerate(rows)),
+            )
+            sent_positions = [
+                position
+                for (position,) in connection.execute(
+                    "SELECT c.position FROM candidates AS c WHERE EXISTS ("
+                    " SELECT 1 FROM sends AS s WHERE s.template = c.template"
+                    " AND s.cell_country = c.cell_country"
+                    " AND s.message_key = c.message_key)"
+                )
+            ]
+
+        sent.iloc[sent_positions] = True
+        return sent
+
+    def filter_unsent(
+        self,
+        df: pd.DataFrame,
+        template: str,
+        message_keys: pd.Series,
+        phone_column: str = "CellCountry",
+    ) -> pd.DataFrame:
+        """Drop the rows of `df` whose message has already been sent."""
+        sent_mask = self.get_sent_mask(template, df[phone_column], message_keys)
+        return df[~sent_mask.to_numpy()].reset_index(drop=True)
+
+    def count(self, template: str | None = None, status: str | None = None) -> int:
+        query, parameters = self._filter_sql(template, status)
+        with closing(self._connect()) as connection:
+            return connection.execute(
+                f"SELECT COUNT(*) FROM sends{query}", parameters
+            ).fetchone()[0]
+
+    @staticmethod
+    def _filter_sql(template: str | None, status: str | None) -> tuple[str, tuple]:
+        conditions = {"template": template, "status": status}
+        conditions = {name: value for name, value in conditions.items() if value}
+        if not conditions:
+            return "", ()
+        where = " AND ".join(f"{name} = ?" for name in conditions)
+        return f" WHERE {where}", tuple(conditions.values())
+
+    # * ---------------------
+    # * Write and maintenance methods
+    # * ---------------------
+    def record_sent(
+        self,
+        template: str,
+        cell_numbers,
+        message_keys,
+        sent_at: datetime | None = None,
+        status: str = SENT_STATUS,
+    ) -> int:
+        """Record messages as sent, or with an unknown outcome. Returns the rows written."""
+        if status not in (SENT_STATUS, UNKNOWN_STATUS):
+            raise ValueError(f"Invalid send status '{status}'.")
+
+        sent_at_text = (sent_at or datetime.now()).isoformat(timespec="seconds")
+        rows = [
+            (*row, sent_at_text, status)
+            for row in self._to_rows(template, cell_numbers, message_keys)
+        ]
+
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO sends"
+                " (template, cell_country, message_key, sent_at, status)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def prune(self, older_than_days: int) -> int:
+        """Delete sends older than `older_than_days`. Returns the number of rows removed."""
+        cutoff = datetime.now() - timedelta(days=older_than_days)
+
+        with closing(self._connect()) as connection, connection:
+            cursor = connection.execute(
+                "DELETE FROM sends WHERE sent_at < ?",
+                (cutoff.isoformat(timespec="seconds"),),
+            )
+        return cursor.rowcount
+
+    def clear(self, status: str | None = None) -> int:
+        """Delete recorded messages, e.g. `UNKNOWN_STATUS` ones once checked in Wati."""
+        query, parameters = self._filter_sql(None, status)
+        with closing(self._connect()) as connection, connection:
+            cursor = connection.execute(f"DELETE FROM sends{query}", parameters)
+        return cursor.rowcount
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import itertools
+import os
+import posixpath
+import xml.etree.ElementTree as ElementTree
+import zipfile
+from contextlib import closing
+from typing import TYPE_CHECKING
+
+from ._registry import TEMPLATE_NAME_LIST, get_handler_class
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from ._abstract_handler import AbstractHandler
+
+### Constants and Defaults ###
+# The column headings of every report are within its first rows
+SNIFF_ROWS = 50
+
+# Workbooks read from their XML (zip) parts, other types through their reader
+XML_WORKBOOK_FILE_TYPES = [".xlsx", ".xlsm"]
+
+
+def _local_name(tag: str) -> str:
+    """Tag without its namespace, which differs between transitional and strict workbooks."""
+    return tag.rpartition("}")[-1]
+
+
+def _get_attribute(element: ElementTree.Element, name: str) -> str | None:
+    for key, value in element.attrib.items():
+        if _local_name(key) == name:
+            return value
+    return None
+
+
+def _get_text(element: ElementTree.Element) -> str:
+    """Text of every `<t>` below the element, e.g. the runs of a rich text string."""
+    return "".join(
+        node.text or "" for node in element.iter() if _local_name(node.tag) == "t"
+    )
+
+
+# * ---------------------
+# * Reading the first rows
+# * ---------------------
+def _get_sheet_id_dict(archive: zipfile.ZipFile) -> dict[str, str]:
+    """Relationship id of each worksheet by name, in workbook order."""
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    return {
+        element.get("name"): _get_attribute(element, "id")
+        for element in workbook.iter()
+        if _local_name(element.tag) == "sheet"
+    }
+
+
+def _get_workbook_part_paths(
+    archive: zipfile.ZipFile, sheet: int | str = 0
+) -> tuple[str, str | None]:
+    """Paths of a worksheet (by position or name) and the shared strings within the workbook zip."""
+    sheet_id_dict = _get_sheet_id_dict(archive)
+    if isinstance(sheet, int):
+        sheet_ids = list(sheet_id_dict.values())
+        sheet_id = (
+            sheet_ids[sheet] if -len(sheet_ids) <= sheet < len(sheet_ids) else None
+        )
+    else:
+        sheet_id = sheet_id_dict.get(sheet)
+
+    sheet_path, shared_strings_path = None, None
+    relationships = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    for relationship in relationships:
+        target = relationship.get("Target", "")
+        target = (
+            target.lstrip("/")
+            if target.startswith("/")
+            else posixpath.normpath(posixpath.join("xl", target))
+        )
+        if sheet_id is not None and relationship.get("Id") == sheet_id:
+            sheet_path = target
+        elif relationship.get("Type", "").endswith("/sharedStrings"):
+            shared_strings_path = target
+
+    if sheet_path is None:
+        raise ValueError(f"Could not find worksheet {sheet!r} in the workbook.")
+    return sheet_path, shared_strings_path
+
+
+def get_sheet_names(filepath: str) -> list[str]:
+    """Names of the workbook's worksheets in order, without loading any of them."""
+    file_ext = os.path.splitext(filepath)[-1].lower()
+    if file_ext in XML_WORKBOOK_FILE_TYPES:
+        with zipfile.ZipFile(filepath) as archive:
+            return list(_get_sheet_id_dict(archive))
+
+    if file_ext == ".xls":
+        import xlrd
+
+        workbook = xlrd.open_workbook(filepath, on_demand=True)
+        try:
+            return workbook.sheet_names()
+        finally:
+            workbook.release_resources()
+
+    import pandas as pd
+
+    with pd.ExcelFile(filepath) as excel_file:
+        return [str(sheet_name) for sheet_name in excel_file.sheet_names]
+
+
+def _read_shared_strings(
+    archive: zipfile.ZipFile, shared_strings_path: str, last_index: int
+) -> list[str]:
+    """Shared strings up to `last_index`, stopping there rather than reading them all."""
+    strings = []
+    with archive.open(shared_strings_path) as file:
+        for _, element in ElementTree.iterparse(file):
+            if _local_name(element.tag) != "si":
+                continue
+            strings.append(_get_text(element))
+            element.clear()
+            if len(strings) > last_index:
+                break
+    return strings
+
+
+def _read_xml_workbook_cells(
+    filepath: str, n_rows: int, sheet: int | str = 0
+) -> list[str]:
+    """Text cells of the first rows, parsing the worksheet XML only up to those rows.
+
+    Headings are among the first strings Excel stores, so the shared strings are
+    also only read up to the last one the rows use.
+    """
+    with zipfile.ZipFile(filepath) as archive:
+        sheet_path, shared_strings_path = _get_workbook_part_paths(archive, sheet)
+
+        cells, shared_indices = [], []
+        rows_read = 0
+        with archive.open(sheet_path) as file:
+            for _, element in ElementTree.iterparse(file):
+                if _local_name(element.tag) != "row":
+                    continue
+
+                for cell in element:
+                    cell_type = cell.get("t")
+                    if cell_type == "inlineStr":
+                        cells.append(_get_text(cell))
+                    elif cell_type in ("s", "str"):
+                        value = next(
+                            (
+                                node.text
+                                for node in cell
+                                if _local_name(node.tag) == "v"
+                            ),
+                            None,
+                        )
+                        if value is None:
+                            continue
+                        if cell_type == "s":
+                            shared_indices.append(int(value))
+                        else:
+                            cells.append(value)
+                element.clear()
+
+                rows_read += 1
+                if rows_read == n_rows:
+                    break
+
+        if shared_indices and shared_strings_path is not None:
+            strings = _read_shared_strings(
+                archive, shared_strings_path, max(shared_indices)
+            )
+            cells.extend(strings[index] for index in shared_indices)
+
+    return cells
+
+
+def can_read_header_cells_only(filepath: str) -> bool:
+    """Whether a worksheet's first rows can be read without parsing the whole sheet."""
+    return os.path.splitext(filepath)[-1].lower() in XML_WORKBOOK_FILE_TYPES
+
+
+def read_header_cells(
+    filepath: str, n_rows: int = SNIFF_ROWS, sheet: int | str = 0
+) -> set[str]:
+    """The stripped text of every cell in the first `n_rows` rows of a worksheet.
+
+    `.xlsx` workbooks are read without loading the rest of the sheet. Legacy `.xls`
+    workbooks are read through their reader, which parses the whole sheet, so handlers
+    check those with `get_frame_header_cells` once loaded instead.
+    """
+    if can_read_header_cells_only(filepath):
+        cells = _read_xml_workbook_cells(filepath, n_rows, sheet)
+    else:
+        from ._readers import get_reader_class
+
+        reader = get_reader_class(filepath)(sheet=sheet)
+        # Closing the rows releases the workbook now rather than on garbage collection
+        with closing(reader._iter_rows(filepath)) as rows:
+            cells = [
+                cell
+                for row in itertools.islice(rows, n_rows)
+                for cell in row
+                if isinstance(cell, str)
+            ]
+
+    return {cell.strip() for cell in cells} - {""}
+
+
+def get_frame_header_cells(df_raw: pd.DataFrame, n_rows: int = SNIFF_ROWS) -> set[str]:
+    """The stripped text of every cell in the first `n_rows` rows of a loaded report."""
+    cells = df_raw.head(n_rows).to_numpy().ravel().tolist()
+    return {cell.strip() for cell in cells if isinstance(cell, str)} - {""}
+
+
+# * ---------------------
+# * Matching handlers
+# * ---------------------
+def get_missing_headings(
+    handler_class: type[AbstractHandler], header_cells: set[str]
+) -> list[str]:
+    """Headings of the handler's `header_signature` that are not among `header_cells`."""
+    return sorted(handler_class.header_signature - header_cells)
+
+
+def sniff_template(filepath: str, header_cells: set[str] | None = None) -> str:
+    """Return the template whose handler's header signature matches the report.
+
+    Raises a ValueError for reports matching no template (naming the closest one and
+    its missing headings) or several, before the report is parsed in full.
+    """
+    if header_cells is None:
+        header_cells = read_header_cells(filepath)
+
+    handler_class_dict = {
+        template: get_handler_class(template) for template in TEMPLATE_NAME_LIST
+    }
+    missing_dict = {
+        template: get_missing_headings(handler_class, header_cells)
+        for template, handler_class in handler_class_dict.items()
+        if handler_class.header_signature
+    }
+    matches = [template for template, missing in missing_dict.items() if not missing]
+
+    file_name = os.path.basename(filepath)
+    if len(matches) > 1:
+        raise ValueError(
+            f"Ambiguous report layout in {file_name}, it matches: {', '.join(matches)}."
+        )
+    if not missing_dict:
+        raise ValueError(
+            f"Unknown report layout in {file_name}, no template declares its headings."
+        )
+    if not matches:
+        closest = min(missing_dict, key=lambda template: len(missing_dict[template]))
+        raise ValueError(
+            f"Unknown report layout in {file_name}. Closest is {closest}, "
+            f"missing headings: {', '.join(missing_dict[closest])}."
+        )
+    return matches[0]
+
+
+def sniff_handler_class(filepath: str) -> type[AbstractHandler]:
+    """Return the handler class for the report, see `sniff_template`."""
+    return get_handler_class(sniff_template(filepath))
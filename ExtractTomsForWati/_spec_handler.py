@@ -0,0 +1,394 @@
+import hashlib
+import tomllib
+from collections.abc import Callable
+from dataclasses import dataclass, field, fields, make_dataclass
+from typing import ClassVar
+
+import numpy as np
+import pandas as pd
+
+from ._abstract_handler import AbstractHandler
+from ._phone import DEFAULT_COUNTRY_CODE, STRING_DTYPE, to_country_cell_numbers
+from ._sniffer import SNIFF_ROWS
+
+### Constants and Defaults ###
+DEFAULT_VALID_FILE_TYPES = [".xls", ".xlsx"]
+
+# A compiled step takes the handler and the frame, and returns the new frame
+Step = Callable[[AbstractHandler, pd.DataFrame], pd.DataFrame]
+
+
+# * ---------------------
+# * Specifications
+# * ---------------------
+@dataclass(kw_only=True)
+class GroupFill:
+    """Fill `column` with the `source` cells that head a group of rows, e.g. optometrists."""
+
+    column: str
+    source: str
+    value_list: list[str]
+
+
+@dataclass(kw_only=True)
+class HandlerSpec:
+    """Declarative description of a report's layout and of the output built from it.
+
+    Steps run in a fixed order: drop `footer_rows`, find the heading row (by
+    `heading_cell`, or after `skip_rows` rows), drop junk rows, apply `rename_dict`,
+    fill groups and `fill_down_list` columns, parse `date_format_dict` dates, drop rows
+    missing a `required_column_list` value or with a value outside `allowed_value_dict`,
+    title-case names, then add `constant_dict` columns and validate `phone_column`.
+
+    ```toml
+    name = "Appointment"
+    skip_rows = 6
+    required_heading_list = ["Date", "Time", "Name", "Cell"]
+    fill_down_list = ["Date"]
+    date_format_dict = { Date = "%Y-%m-%d" }
+    required_column_list = ["Date"]
+    phone_column = "Cell"
+    constant_dict = { Practice = "Classic Eyes {practice}" }
+    output_heading_list = ["CellCountry", "Name", "Practice", "Date", "Time"]
+    ```
+    """
+
+    name: str  # Template name, the handler class is named '<name>Handler'
+    version: str = field(default="1")  # Bump when the same spec's output changes
+    valid_file_types: list[str] = field(
+        default_factory=lambda: DEFAULT_VALID_FILE_TYPES
+    )
+
+    # Report layout
+    footer_rows: int = field(default=0)  # e.g. a final "Page X of Y" row
+    heading_cell: str | None = field(default=None)  # Found within the first rows
+    skip_rows: int = field(default=0)  # Rows above the headings, without `heading_cell`
+    junk_keyword_list: list[str] = field(default_factory=list)  # In the first column
+    required_heading_list: list[str] = field(default_factory=list)
+    rename_dict: dict[str, str] = field(default_factory=dict)
+
+    # Cleaning, in the renamed columns
+    group_fill_list: list[GroupFill] = field(default_factory=list)
+    fill_down_list: list[str] = field(default_factory=list)
+    date_format_dict: dict[str, str | None] = field(default_factory=dict)
+    required_column_list: list[str] = field(default_factory=list)
+    allowed_value_dict: dict[str, list[str]] = field(default_factory=dict)
+    title_case_list: list[str] = field(default_factory=list)
+
+    # Features and output, '{practice}' in constants is the selected practice
+    constant_dict: dict[str, str] = field(default_factory=dict)
+    phone_column: str | None = field(default=None)  # Becomes 'CellCountry'
+    country_code: str = field(default=DEFAULT_COUNTRY_CODE)
+    output_heading_list: list[str] = field(default_factory=list)
+    message_key_column_list: list[str] = field(default_factory=list)  # Send ledger
+
+    def __post_init__(self):
+        if not self.output_heading_list:
+            raise ValueError(f"Spec '{self.name}' has no 'output_heading_list'.")
+        if self.heading_cell is not None and self.skip_rows:
+            raise ValueError(
+                f"Spec '{self.name}' sets both 'heading_cell' and 'skip_rows'."
+            )
+        self.group_fill_list = [
+            group_fill if isinstance(group_fill, GroupFill) else GroupFill(**group_fill)
+            for group_fill in self.group_fill_list
+        ]
+
+    @classmethod
+    def from_dict(cls, spec_dict: dict) -> "HandlerSpec":
+        field_names = {spec_field.name for spec_field in fields(cls)}
+        unknown_keys = sorted(set(spec_dict) - field_names)
+        if unknown_keys:
+            raise ValueError(
+                f"Unknown spec keys: {', '.join(unknown_keys)}. Expected some of {sorted(field_names)}."
+            )
+        return cls(**spec_dict)
+
+    @classmethod
+    def from_toml(cls, filepath: str) -> "HandlerSpec":
+        with open(filepath, "rb") as file:
+            return cls.from_dict(tomllib.load(file))
+
+    @property
+    def digest(self) -> str:
+        """Short hash of the whole spec, so any edit invalidates cached results."""
+        return hashlib.sha256(repr(self).encode("utf-8")).hexdigest()[:12]
+
+
+# * ---------------------
+# * Step compilation
+# * ---------------------
+def _parse_dates(cells: pd.Series, date_format: str | None) -> pd.Series:
+    """Parse each distinct cell once, reports repeat the same few dates on many rows."""
+    codes, unique_cells = pd.factorize(cells)
+    unique_dates = pd.to_datetime(
+        pd.Series(unique_cells, dtype=object), format=date_format, errors="coerce"
+    )
+    dates = np.append(unique_dates.to_numpy(), np.datetime64("NaT", "ns"))
+    return pd.Series(dates[codes], index=cells.index, name=cells.name)
+
+
+def _compile_heading_steps(spec: HandlerSpec) -> list[tuple[str, Step]]:
+    """Steps turning the raw sheet into one row per record under named columns."""
+
+    def find_headings(handler: AbstractHandler, df: pd.DataFrame) -> pd.DataFrame:
+        if spec.footer_rows:
+            df = df.iloc[: -spec.footer_rows]
+        df = df.dropna(how="all").reset_index(drop=True)
+
+        heading_row = spec.skip_rows
+        if spec.heading_cell is not None:
+            heading_mask = (df.head(SNIFF_ROWS) == spec.heading_cell).any(axis=1)
+            if not heading_mask.any():
+                raise ValueError(
+                    f"Could not find the column headings, expected a '{spec.heading_cell}' column."
+                )
+            heading_row = int(heading_mask.to_numpy().argmax())
+
+        # Junk rows are recognised by their first cell, before columns are selected
+        df_rows = df.iloc[heading_row + 1 :]
+        if handler.remove_rows_containing_list and not df_rows.empty:
+            junk_mask = df_rows.iloc[:, 0].isin(
+                set(handler.remove_rows_containing_list)
+            )
+            df_rows = df_rows[~junk_mask.to_numpy()]
+
+        headings = df.iloc[heading_row]
+        df_rows = df_rows.loc[:, headings.notna().to_numpy()].reset_index(drop=True)
+        df_rows.columns = headings[headings.notna()].to_list()
+        return df_rows
+
+    def validate_headings(handler: AbstractHandler, df: pd.DataFrame) -> pd.DataFrame:
+        missing_columns = [
+            column for column in spec.required_heading_list if column not in df.columns
+        ]
+        if missing_columns:
+            raise ValueError(f"Missing expected columns: {', '.join(missing_columns)}.")
+        return df.rename(columns=spec.rename_dict) if spec.rename_dict else df
+
+    return [("find_headings", find_headings), ("validate_headings", validate_headings)]
+
+
+def _compile_clean_steps(spec: HandlerSpec) -> list[tuple[str, Step]]:
+    """Vectorized cleaning steps, compiled only for the sections the spec uses."""
+    steps = _compile_heading_steps(spec)
+
+    if spec.group_fill_list or spec.fill_down_list:
+
+        def fill_groups(handler: AbstractHandler, df: pd.DataFrame) -> pd.DataFrame:
+            filled_dict = {}
+            for group_fill in spec.group_fill_list:
+                source = df[group_fill.source]
+                group_mask = source.isin(set(group_fill.value_list))
+                filled_dict[group_fill.column] = source.where(group_mask).ffill()
+            # Only a group's first row holds the value, following empty cells inherit it
+            for column in spec.fill_down_list:
+                filled_dict[column] = df[column].ffill()
+            return df.assign(**filled_dict)
+
+        steps.append(("fill_groups", fill_groups))
+
+    if spec.date_format_dict:
+
+        def parse_dates(handler: AbstractHandler, df: pd.DataFrame) -> pd.DataFrame:
+            return df.assign(
+                **{
+                    column: _parse_dates(df[column], date_format)
+                    for column, date_format in spec.date_format_dict.items()
+                }
+            )
+
+        steps.append(("parse_dates", parse_dates))
+
+    if spec.required_column_list or spec.allowed_value_dict:
+
+        def filter_rows(handler: AbstractHandler, df: pd.DataFrame) -> pd.DataFrame:
+            keep_mask = df[spec.required_column_list].notna().all(axis=1)
+            for column, value_list in spec.allowed_value_dict.items():
+                keep_mask &= df[column].isin(set(value_list))
+            return df[keep_mask].reset_index(drop=True)
+
+        steps.append(("filter_rows", filter_rows))
+
+    if spec.title_case_list:
+
+        def title_case(handler: AbstractHandler, df: pd.DataFrame) -> pd.DataFrame:
+            return df.assign(
+                **{
+                    column: df[column].astype(STRING_DTYPE).str.title()
+                    for column in spec.title_case_list
+                }
+            )
+
+        steps.append(("title_case", title_case))
+
+    return steps
+
+
+def _compile_feature_steps(spec: HandlerSpec) -> list[tuple[str, Step]]:
+    """Steps adding the output's constant and contact columns."""
+    steps = []
+
+    if spec.constant_dict:
+
+        def add_constants(handler: AbstractHandler, df: pd.DataFrame) -> pd.DataFrame:
+            return df.assign(
+                **{
+                    column: value.format(practice=handler.selected_practice)
+                    for column, value in spec.constant_dict.items()
+                }
+            )
+
+        steps.append(("add_constants", add_constants))
+
+    if spec.phone_column is not None:
+
+        def validate_phones(handler: AbstractHandler, df: pd.DataFrame) -> pd.DataFrame:
+            df = df.assign(
+                CountryCode=spec.country_code,
+                CellCountry=to_country_cell_numbers(
+                    df[spec.phone_column], spec.country_code
+                ),
+            )
+            return df[df["CellCountry"].notna()].reset_index(drop=True)
+
+        steps.append(("validate_phones", validate_phones))
+
+    return steps
+
+
+# * ---------------------
+# * Spec handlers
+# * ---------------------
+@dataclass(kw_only=True)
+class SpecHandler(AbstractHandler):
+    """Handler whose stages run the steps compiled from a `HandlerSpec`.
+
+    Create handler classes with `compile_spec` rather than using this class directly.
+    """
+
+    # Set on each compiled class
+    spec: ClassVar[HandlerSpec | None] = None
+    clean_step_list: ClassVar[list[tuple[str, Step]]] = []
+    feature_step_list: ClassVar[list[tuple[str, Step]]] = []
+
+    def __reduce__(self):
+        # Compiled classes cannot be imported by name, so workers compile them again
+        return _restore_spec_handler, (self.spec, self.__dict__)
+
+    def _run_steps(self, steps: list[tuple[str, Step]], df: pd.DataFrame):
+        for step_name, step in steps:
+            with self._stage(step_name, df) as stage:
+                df = step(self, df)
+                stage.set_output(df)
+        return df
+
+    def _clean_data(self, df: pd.DataFrame | None = None):
+        # Retrieve relevant dataframe and validate
+        self.df_raw = self._validate_dataframe("df_raw", df)
+
+        self.df_clean = self._run_steps(self.clean_step_list, self.df_raw)
+        return self.df_clean
+
+    def _add_features(self, df: pd.DataFrame | None = None):
+        # Retrieve relevant dataframe and validate
+        self.df_clean = self._validate_dataframe("df_clean", df)
+
+        df = self._run_steps(self.feature_step_list, self.df_clean)
+        self.df_clean = df.reindex(self._get_output_headings(df), axis=1)
+        return self.df_clean
+
+    def _get_message_keys(self, df: pd.DataFrame) -> pd.Series:
+        """One message per row per value of the spec's message key columns, else per day."""
+        key_columns = self.spec.message_key_column_list
+        if not key_columns:
+            return super()._get_message_keys(df)
+
+        message_keys = df[key_columns[0]].astype(str)
+        for column in key_columns[1:]:
+            message_keys = message_keys + " " + df[column].astype(str)
+        return message_keys
+
+    def save_data(self, savepath: str | None = None):
+        """Save the cleaned data to a new file in save_folder."""
+
+        # Check for file_path availability
+        if not hasattr(self, "file_path"):
+            raise AttributeError(
+                "Missing 'file_path' attribute. Cannot save data unless import data filepath is available."
+            )
+
+        # Set for save_path based on availability
+        self.save_path = (
+            savepath
+            or getattr(self, "save_path", None)
+            or self._get_savepath_from_filepath()
+        )
+
+        # Check output DataFrame availability
+        if not hasattr(self, "df_output"):
+            raise AttributeError(
+                "Missing 'df_output' attribute. Cannot save data unless data is provided."
+            )
+
+        # Get output pd.DataFrame and save, see `_writers.py` for the formats
+        self._write_output()
+
+
+# Spec digest to compiled handler class, so each spec is compiled once per process
+_COMPILED_CLASS_DICT: dict[str, type[SpecHandler]] = {}
+
+
+def compile_spec(spec: HandlerSpec | dict) -> type[SpecHandler]:
+    """Compile a spec (or its dict) into a handler class, e.g. for `load_and_process`.
+
+    ```python
+    ShipmentHandler = compile_spec(HandlerSpec.from_toml("shipment.toml"))
+    ShipmentHandler(selected_practice="Pavilion").load_and_process("shipments.xlsx")
+    ```
+    """
+    if not isinstance(spec, HandlerSpec):
+        spec = HandlerSpec.from_dict(spec)
+    cache_key = f"{spec.name}-{spec.digest}"
+    if cache_key in _COMPILED_CLASS_DICT:
+        return _COMPILED_CLASS_DICT[cache_key]
+
+    handler_class = make_dataclass(
+        f"{spec.name}Handler",
+        [
+            (
+                "valid_file_types",
+                list[str],
+                field(default_factory=lambda: list(spec.valid_file_types)),
+            ),
+            (
+                "remove_rows_containing_list",
+                list[str],
+                field(default_factory=lambda: list(spec.junk_keyword_list)),
+            ),
+            (
+                "default_headings_list",
+                list[str],
+                field(default_factory=lambda: list(spec.output_heading_list)),
+            ),
+        ],
+        bases=(SpecHandler,),
+        namespace={
+            "header_signature": frozenset(spec.required_heading_list),
+            "handler_version": f"{spec.version}-{spec.digest}",
+            "spec": spec,
+            "clean_step_list": _compile_clean_steps(spec),
+            "feature_step_list": _compile_feature_steps(spec),
+        },
+        kw_only=True,
+    )
+    handler_class.__module__ = __name__
+    _COMPILED_CLASS_DICT[cache_key] = handler_class
+    return handler_class
+
+
+def _restore_spec_handler(spec: HandlerSpec, state: dict) -> SpecHandler:
+    handler_class = compile_spec(spec)
+    handler = handler_class.__new__(handler_class)
+    handler.__dict__.update(state)
+    return handler
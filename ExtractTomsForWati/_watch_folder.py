@@ -0,0 +1,316 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from ._batch import DEFAULT_REPORT_FILE_TYPES, _get_batch_savepath
+from ._cache import DiskCache
+from ._job_engine import JobEngine
+from ._registry import get_handler_class
+
+### Constants and Defaults ###
+# A file is processed once its size and modification time are unchanged for this long
+DEFAULT_SETTLE_SECONDS = 2.0
+# Longest wait for file events, also the interval between polls without inotify
+DEFAULT_POLL_SECONDS = 1.0
+
+# inotify flags, see inotify(7)
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004  # e.g. a modification time set by a sync client
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_INOTIFY_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+def _is_report_file(file_name: str) -> bool:
+    """Report workbooks, skipping Excel's '~$' lock files and hidden temporary files."""
+    is_report = os.path.splitext(file_name)[-1].lower() in DEFAULT_REPORT_FILE_TYPES
+    return is_report and not file_name.startswith(("~$", "."))
+
+
+# * ---------------------
+# * File event sources
+# * ---------------------
+def _scan_signatures(folder: str) -> dict[str, tuple[int, int]]:
+    """(modification time, size) of every report file in `folder`."""
+    signatures = {}
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if _is_report_file(entry.name) and entry.is_file():
+                stat = entry.stat()
+                signatures[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return signatures
+
+
+class _PollingEventSource:
+    """Reports files that are new or changed since the previous scan of the folder."""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.signatures = _scan_signatures(folder)
+
+    def wait(self, timeout: float) -> set[str]:
+        time.sleep(timeout)
+        signatures = _scan_signatures(self.folder)
+        changed = {
+            path
+            for path, signature in signatures.items()
+            if self.signatures.get(path) != signature
+        }
+        self.signatures = signatures
+        return changed
+
+    def close(self):
+        pass
+
+
+class _InotifyEventSource:
+    """Reports files written in the folder using Linux inotify, called through libc."""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+
+        self.fd = self.libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        mask = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        if self.libc.inotify_add_watch(self.fd, os.fsencode(folder), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {folder}")
+
+    def wait(self, timeout: float) -> set[str]:
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed = set()
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(buffer):
+            _, mask, _, name_length = _INOTIFY_EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _INOTIFY_EVENT_HEADER.size
+            name = os.fsdecode(buffer[offset : offset + name_length].rstrip(b"\0"))
+            offset += name_length
+
+            # Events were dropped, so every file may have changed
+            if mask & _IN_Q_OVERFLOW:
+                changed.update(_scan_signatures(self.folder))
+            elif name and _is_report_file(name):
+                changed.add(os.path.join(self.folder, name))
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _get_event_source(folder: str, use_inotify: bool):
+    """inotify where available, polling otherwise (e.g. macOS, Windows or failed setup)."""
+    if use_inotify and sys.platform.startswith("linux"):
+        try:
+            return _InotifyEventSource(folder)
+        except (OSError, AttributeError, TypeError):
+            pass
+    return _PollingEventSource(folder)
+
+
+# * ---------------------
+# * Folder watcher
+# * ---------------------
+@dataclass(kw_only=True)
+class FolderWatcher:
+    """Processes report workbooks saved into `folder`, saving each output next to its report.
+
+    Outputs are named after their report, e.g. `birthdays_Birthday.csv`.
+
+    New or modified files wait until they stop changing for `settle_seconds` (exports
+    and copies are written in several steps), then processed by a `JobEngine` of
+    `max_workers` processes. Unless `template` is set, each worker detects its report's
+    template from the header rows, failing reports of no template. A file is
+    processed again only once it is modified.
+    Network shares often do not deliver inotify events, use `use_inotify=False` there.
+
+    ```python
+    FolderWatcher(folder="//reception/exports", practice="Pavilion").run()
+    ```
+    """
+
+    folder: str
+    practice: str
+    template: str | None = field(default=None)  # Inferred per file when None
+    output_file_type: str = field(default=".csv")
+    max_workers: int | None = field(default=None)
+    parse_cache: DiskCache | None = field(default=None)
+
+    settle_seconds: float = field(default=DEFAULT_SETTLE_SECONDS)
+    poll_seconds: float = field(default=DEFAULT_POLL_SECONDS)
+    use_inotify: bool = field(default=True)
+    process_existing: bool = field(default=False)  # Reports already in the folder
+
+    log_callback: Callable[[str], None] | None = field(default=None, repr=False)
+
+    # File path to (modification time, size) when last submitted
+    processed_dict: dict[str, tuple[int, int]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    # File path to (modification time, size) and when it last changed
+    _pending_dict: dict[str, tuple[tuple[int, int], float]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _output_paths: set[str] = field(default_factory=set, init=False, repr=False)
+    _engine: JobEngine | None = field(default=None, init=False, repr=False)
+    _event_source: object = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        if not os.path.isdir(self.folder):
+            raise FileNotFoundError(f"Folder not found at: {self.folder}")
+        self.folder = os.path.abspath(self.folder)
+        if self.template is not None:
+            get_handler_class(self.template)  # Fail fast on a bad template
+
+    def _log(self, message: str):
+        if self.log_callback is not None:
+            self.log_callback(message)
+        else:
+            print(f"{datetime.now():%Y-%m-%d %H:%M:%S} {message}", flush=True)
+
+    def start(self):
+        self._engine = JobEngine(
+            max_workers=self.max_workers, parse_cache=self.parse_cache
+        )
+        self._engine.start()
+        self._event_source = _get_event_source(self.folder, self.use_inotify)
+
+        existing = _scan_signatures(self.folder)
+        if self.process_existing:
+            for path in existing:
+                self._on_changed(path)
+        else:
+            self.processed_dict.update(existing)
+
+        source = type(self._event_source).__name__.strip("_")
+        self._log(f"Watching {self.folder} with {source}")
+
+    def stop(self):
+        if self._event_source is not None:
+            self._event_source.close()
+        if self._engine is not None:
+            self._engine.shutdown()
+        self._event_source = self._engine = None
+
+    def run(self, stop_event: threading.Event | None = None):
+        """Watch until `stop_event` is set (or KeyboardInterrupt)."""
+        stop_event = stop_event or threading.Event()
+        self.start()
+        try:
+            while not stop_event.is_set():
+                self.step()
+        finally:
+            self.stop()
+
+    def step(self):
+        """Wait up to `poll_seconds` for file events, then submit and save what is ready."""
+        for path in self._event_source.wait(self.poll_seconds):
+            self._on_changed(path)
+        self._submit_settled()
+        self._save_finished()
+
+    # * ---------------------
+    # * Debouncing and dispatch
+    # * ---------------------
+    def _on_changed(self, path: str):
+        if path in self._output_paths:
+            return
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self._pending_dict.pop(path, None)
+            return
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if self.processed_dict.get(path) == signature:
+            return
+        pending = self._pending_dict.get(path)
+        if pending is None or pending[0] != signature:
+            self._pending_dict[path] = (signature, time.monotonic())
+
+    def _submit_settled(self):
+        now = time.monotonic()
+        for path, (signature, changed_at) in list(self._pending_dict.items()):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                del self._pending_dict[path]
+                continue
+
+            current_signature = (stat.st_mtime_ns, stat.st_size)
+            if current_signature != signature:
+                self._pending_dict[path] = (current_signature, now)
+                continue
+            if now - changed_at < self.settle_seconds or not self._is_readable(path):
+                continue
+
+            del self._pending_dict[path]
+            self.processed_dict[path] = signature
+            self._submit(path)
+
+    @staticmethod
+    def _is_readable(path: str) -> bool:
+        """Windows keeps files locked while they are being written."""
+        try:
+            with open(path, "rb") as file:
+                file.read(1)
+        except OSError:
+            return False
+        return True
+
+    def _submit(self, path: str):
+        # Without a template the worker detects it, failing the job for unknown layouts
+        self._engine.submit(self.template, self.practice, path)
+        as_template = f" as {self.template}" if self.template else ""
+        self._log(f"START {os.path.basename(path)}{as_template}")
+
+    def _save_finished(self):
+        for job in self._engine.poll():
+            if not job.finished:
+                continue
+
+            file_name = os.path.basename(job.file_path)
+            if not job.succeeded:
+                self._log(f"FAIL  {file_name}: {job.error}")
+                continue
+
+            # Named after the report, so reports finishing together never collide
+            handler = job.handler
+            save_path = _get_batch_savepath(
+                job.file_path, job.template, None, self.output_file_type
+            )
+            try:
+                handler.save_data(savepath=save_path)
+            except Exception as err:
+                self._log(f"FAIL  {file_name}: {type(err).__name__}: {err}")
+                continue
+
+            # Outputs saved as workbooks land in the watched folder too
+            self._output_paths.add(os.path.abspath(handler.save_path))
+            self._log(
+                f"OK    {file_name}: {len(handler.df_output)} rows -> {os.path.basename(handler.save_path)}"
+            )
+        self._engine.clear_finished()
@@ -0,0 +1,84 @@
+import json
+import os
+import re
+import tempfile
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+### Constants and Defaults ###
+DEFAULT_WATERMARK_DIR = os.path.join(
+    os.path.expanduser("~"), ".classiceyes", "watermarks"
+)
+
+
+def hash_rows(df: pd.DataFrame) -> np.ndarray:
+    """Return a 64-bit hash of every row's values, stable across runs and dtypes."""
+    if df.empty:
+        return np.array([], dtype=np.uint64)
+    return pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy()
+
+
+@dataclass
+class Watermark:
+    """Where the previous incremental run of a handler stopped for one practice."""
+
+    # Latest appointment processed, as "YYYY-MM-DD HH:MM"
+    last_datetime: str | None = field(default=None)
+    # Hashes of the rows of the previous export, see `hash_rows`
+    row_hashes: list[int] = field(default_factory=list)
+    updated: str | None = field(default=None)
+
+    def get_processed_mask(
+        self, row_hashes: np.ndarray, row_datetimes: pd.Series
+    ) -> np.ndarray:
+        """Mark rows that were already processed, i.e. unchanged and not after the watermark."""
+        if self.last_datetime is None:
+            return np.zeros(len(row_hashes), dtype=bool)
+
+        not_after = (row_datetimes <= self.last_datetime).to_numpy(dtype=bool)
+        seen = np.isin(row_hashes, np.array(self.row_hashes, dtype=np.uint64))
+        return not_after & seen
+
+
+@dataclass(kw_only=True)
+class WatermarkStore:
+    """One small JSON file per handler and practice holding its `Watermark`."""
+
+    watermark_dir: str = field(default=DEFAULT_WATERMARK_DIR)
+
+    def _get_path(self, name: str) -> str:
+        file_name = re.sub(r"[^\w\-]+", "_", name).strip("_")
+        return os.path.join(self.watermark_dir, f"{file_name}.json")
+
+    def load(self, name: str) -> Watermark:
+        """Return the stored watermark, or an empty one before the first run."""
+        try:
+            with open(self._get_path(name), encoding="utf-8") as file:
+                return Watermark(**json.load(file))
+        except FileNotFoundError:
+            return Watermark()
+
+    def save(self, name: str, watermark: Watermark):
+        """Write the watermark atomically, so an interrupted run keeps the previous one."""
+        os.makedirs(self.watermark_dir, exist_ok=True)
+        watermark.updated = datetime.now().isoformat(timespec="seconds")
+
+        file_descriptor, temp_path = tempfile.mkstemp(
+            dir=self.watermark_dir, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+                json.dump(asdict(watermark), file)
+            os.replace(temp_path, self._get_path(name))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def clear(self, name: str):
+        try:
+            os.remove(self._get_path(name))
+        except FileNotFoundError:
+            pass
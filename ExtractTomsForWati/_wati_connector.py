@@ -0,0 +1,350 @@
+import http.client
+import json
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+### Constants and Defaults ###
+SEND_TEMPLATE_MESSAGES_PATH = "/api/v1/sendTemplateMessages"
+# sendTemplateMessages is not idempotent, only requests Wati did not process are retried
+RETRY_STATUS_CODES = {429}
+DEFAULT_PHONE_COLUMN = "CellCountry"
+# Raised when a reused keep-alive connection was closed by the server while idle
+# (http.client.RemoteDisconnected is a ConnectionResetError)
+STALE_CONNECTION_ERRORS = (BrokenPipeError, ConnectionResetError)
+
+
+@dataclass
+class SendResult:
+    """Outcome of sending a template message to a single recipient."""
+
+    whatsapp_number: str
+    sent: bool
+    status_code: int | None = field(default=None)
+    attempts: int = field(default=0)
+    error: str | None = field(default=None)
+    # The batch may have reached Wati (e.g. a timeout or HTTP 5xx), so it is not resent
+    outcome_unknown: bool = field(default=False)
+
+
+class RequestNotSentError(OSError):
+    """Connecting failed, so the request was never written and can safely be retried."""
+
+
+def _format_value(value) -> str:
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m-%d")
+    return str(value)
+
+
+def build_receivers(
+    df: pd.DataFrame,
+    phone_column: str = DEFAULT_PHONE_COLUMN,
+    parameter_column_dict: dict[str, str] | None = None,
+) -> list[dict]:
+    """One Wati receiver per row, with every parameter formatted as text.
+
+    `parameter_column_dict` maps template parameter names to columns, defaulting to
+    every column except `phone_column`.
+    """
+    if phone_column not in df.columns:
+        raise ValueError(f"Missing '{phone_column}' column in DataFrame.")
+    if parameter_column_dict is None:
+        parameter_column_dict = {
+            column: column for column in df.columns if column != phone_column
+        }
+
+    phone_numbers = df[phone_column].astype(str).tolist()
+    parameter_values = {
+        name: [_format_value(value) for value in df[column].tolist()]
+        for name, column in parameter_column_dict.items()
+    }
+
+    return [
+        {
+            "whatsappNumber": phone_number,
+            "customParams": [
+                {"name": name, "value": values[row]}
+                for name, values in parameter_values.items()
+            ],
+        }
+        for row, phone_number in enumerate(phone_numbers)
+    ]
+
+
+class _RateLimiter:
+    """Token bucket shared by all sending threads."""
+
+    def __init__(self, requests_per_second: float, burst: int = 1):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) / self.interval
+                )
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_seconds = (1 - self.tokens) * self.interval
+            time.sleep(wait_seconds)
+
+
+class _ConnectionPool:
+    """Fixed-size pool of keep-alive HTTP(S) connections to a single host."""
+
+    def __init__(self, base_url: str, size: int, timeout_seconds: float):
+        url = urlsplit(base_url)
+        if url.scheme not in ("http", "https"):
+            raise ValueError(f"Invalid Wati API endpoint '{base_url}'.")
+
+        self.connection_class = (
+            http.client.HTTPSConnection
+            if url.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self.host = url.netloc
+        self.base_path = url.path.rstrip("/")
+        self.timeout_seconds = timeout_seconds
+
+        self.connections = queue.LifoQueue(maxsize=size)
+        for _ in range(size):
+            self.connections.put(None)  # Connections are opened lazily
+
+    def request(self, method: str, path: str, body: bytes, headers: dict):
+        """Send a request on a pooled connection and return (status, headers, body).
+
+        Raises `RequestNotSentError` when the connection could not be opened. Any other
+        error may have happened after the server received the request.
+        """
+        connection = self.connections.get()
+        try:
+            if connection is not None and connection.sock is not None:
+                try:
+                    return self._send(connection, method, path, body, headers)
+                except STALE_CONNECTION_ERRORS:
+                    # The server closed the idle keep-alive connection, so the request
+                    # never reached it and is resent once on a fresh connection
+                    connection.close()
+
+            if connection is None:
+                connection = self.connection_class(
+                    self.host, timeout=self.timeout_seconds
+                )
+            try:
+                connection.connect()
+            except OSError as err:
+                raise RequestNotSentError(*err.args) from err
+            return self._send(connection, method, path, body, headers)
+
+        except (OSError, http.client.HTTPException):
+            # Broken connections are dropped and reopened on next use
+            if connection is not None:
+                connection.close()
+            connection = None
+            raise
+
+        finally:
+            self.connections.put(connection)
+
+    def _send(
+        self,
+        connection: http.client.HTTPConnection,
+        method: str,
+        path: str,
+        body: bytes,
+        headers: dict,
+    ):
+        connection.request(method, self.base_path + path, body, headers)
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+
+    def close(self):
+        while not self.connections.empty():
+            connection = self.connections.get_nowait()
+            if connection is not None:
+                connection.close()
+
+
+@dataclass(kw_only=True)
+class WatiConnector:
+    """Send a handler's `df_output` as Wati `sendTemplateMessages` requests.
+
+    Recipients are sent in batches over pooled keep-alive connections by up to
+    `max_concurrency` threads, limited to `requests_per_second`. Rate-limited requests
+    and failed connections are retried with exponential backoff. A batch is resent once
+    on a fresh connection when a reused one turns out to have been closed while idle.
+    Batches that may have reached Wati (timeouts, dropped connections, HTTP 5xx) are
+    never resent, their results are marked `outcome_unknown` instead.
+    """
+
+    api_endpoint: str  # e.g. "https://live-mt-server.wati.io/123456"
+    access_token: str
+    template_name: str
+    broadcast_name: str | None = field(default=None)
+
+    # Map of Wati template parameter name to DataFrame column, defaults to all columns
+    parameter_column_dict: dict[str, str] | None = field(default=None)
+    phone_column: str = field(default=DEFAULT_PHONE_COLUMN)
+
+    batch_size: int = field(default=100)
+    max_concurrency: int = field(default=4)
+    requests_per_second: float = field(default=5.0)
+    max_retries: int = field(default=3)
+    backoff_seconds: float = field(default=1.0)
+    timeout_seconds: float = field(default=30.0)
+
+    # * ---------------------
+    # * Payload methods
+    # * ---------------------
+    def build_payloads(self, df: pd.DataFrame) -> list[dict]:
+        """Split `df` into `sendTemplateMessages` request bodies of `batch_size` receivers."""
+        broadcast_name = (
+            self.broadcast_name
+            or f"{self.template_name}_{datetime.now():%Y-%m-%d_%H-%M-%S}"
+        )
+
+        receivers = build_receivers(df, self.phone_column, self.parameter_column_dict)
+
+        return [
+            {
+                "template_name": self.template_name,
+                "broadcast_name": broadcast_name,
+                "receivers": receivers[start : start + self.batch_size],
+            }
+            for start in range(0, len(receivers), self.batch_size)
+        ]
+
+    # * ---------------------
+    # * Sending methods
+    # * ---------------------
+    def _send_payload(
+        self, pool: _ConnectionPool, rate_limiter: _RateLimiter, payload: dict
+    ) -> list[SendResult]:
+        """Send one batch, retrying with backoff while it cannot have been processed.
+
+        Returns a result per receiver.
+        """
+        body = json.dumps(payload).encode("utf-8")
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json",
+            "Connection": "keep-alive",
+        }
+        numbers = [receiver["whatsappNumber"] for receiver in payload["receivers"]]
+
+        status_code, error, outcome_unknown = None, None, False
+        for attempt in range(1, self.max_retries + 2):
+            rate_limiter.acquire()
+            retry_after = None
+
+            try:
+                status_code, response_headers, response_body = pool.request(
+                    "POST", SEND_TEMPLATE_MESSAGES_PATH, body, headers
+                )
+            except RequestNotSentError as err:
+                error = f"{type(err).__name__}: {err}"
+            except (OSError, http.client.HTTPException) as err:
+                # Resending a batch Wati may have accepted could message patients twice
+                error = f"{type(err).__name__}: {err}"
+                outcome_unknown = True
+                break
+            else:
+                if 200 <= status_code < 300:
+                    return self._parse_response(
+                        numbers, status_code, response_body, attempt
+                    )
+
+                error = f"HTTP {status_code}: {response_body[:200].decode('utf-8', 'replace')}"
+                if status_code not in RETRY_STATUS_CODES:
+                    outcome_unknown = status_code >= 500
+                    break
+                retry_after = response_headers.get("Retry-After")
+
+            if attempt <= self.max_retries:
+                backoff = self.backoff_seconds * 2 ** (attempt - 1)
+                if retry_after and retry_after.isdigit():
+                    backoff = max(backoff, float(retry_after))
+                time.sleep(backoff)
+
+        return [
+            SendResult(number, False, status_code, attempt, error, outcome_unknown)
+            for number in numbers
+        ]
+
+    @staticmethod
+    def _parse_response(
+        numbers: list[str], status_code: int, response_body: bytes, attempts: int
+    ) -> list[SendResult]:
+        """Map Wati's per-receiver response onto the batch's recipients."""
+        try:
+            response = json.loads(response_body or b"{}")
+        except json.JSONDecodeError:
+            response = {}
+
+        receiver_dict = {
+            str(receiver.get("waId", "")): receiver
+            for receiver in response.get("receivers") or []
+        }
+        batch_ok = response.get("result", True) is not False
+
+        results = []
+        for number in numbers:
+            receiver = receiver_dict.get(number)
+            if receiver is None:
+                sent = batch_ok
+                error = None if batch_ok else str(response.get("errors") or "Rejected")
+            else:
+                errors = receiver.get("errors") or []
+                sent = receiver.get("isValidWhatsAppNumber", True) and not errors
+                error = (
+                    None
+                    if sent
+                    else ("; ".join(map(str, errors)) or "Invalid WhatsApp number")
+                )
+            results.append(SendResult(number, sent, status_code, attempts, error))
+        return results
+
+    def send_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Send a template message to every row of `df`. Returns one result row per recipient."""
+        payloads = self.build_payloads(df)
+        if not payloads:
+            return pd.DataFrame(columns=list(SendResult.__dataclass_fields__))
+
+        pool = _ConnectionPool(
+            self.api_endpoint, self.max_concurrency, self.timeout_seconds
+        )
+        rate_limiter = _RateLimiter(
+            self.requests_per_second, burst=self.max_concurrency
+        )
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                batch_results = executor.map(
+                    lambda payload: self._send_payload(pool, rate_limiter, payload),
+                    payloads,
+                )
+                results = [result for batch in batch_results for result in batch]
+        finally:
+            pool.close()
+
+        return pd.DataFrame([asdict(result) for result in results])
@@ -0,0 +1,197 @@
+import gzip
+import json
+import os
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from ._wati_connector import DEFAULT_PHONE_COLUMN, build_receivers
+
+### Constants and Defaults ###
+# Rows formatted per chunk, so only a chunk's text is ever held in memory
+DEFAULT_CHUNK_ROWS = 50_000
+
+# Receivers are built as dicts before they are encoded, so NDJSON chunks are smaller
+NDJSON_CHUNK_ROWS = 5_000
+
+# Rows in an Excel worksheet, including the heading row
+EXCEL_MAX_ROWS = 1_048_576
+
+
+@dataclass(kw_only=True)
+class AbstractWriter(ABC):
+    """Writes a handler output to a file in chunks of `chunk_rows` rows.
+
+    Chunks are written to a temporary file next to the destination, which replaces
+    the destination once complete, so a failed or interrupted save never leaves a
+    partial file behind (or a previous output half overwritten).
+    """
+
+    chunk_rows: int = field(default=DEFAULT_CHUNK_ROWS)
+
+    def write(self, df: pd.DataFrame, filepath: str) -> str:
+        """Write `df` to `filepath` atomically and return `filepath`."""
+        directory, file_name = os.path.split(os.path.abspath(filepath))
+        temp_path = os.path.join(directory, f".{file_name}.{uuid.uuid4().hex}.tmp")
+        try:
+            self._write(df, temp_path)
+            os.replace(temp_path, filepath)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return filepath
+
+    def _iter_chunks(self, df: pd.DataFrame) -> Iterator[pd.DataFrame]:
+        for start in range(0, len(df), self.chunk_rows):
+            yield df.iloc[start : start + self.chunk_rows]
+
+    @abstractmethod
+    def _write(self, df: pd.DataFrame, temp_path: str):
+        """Write every chunk of `df` to `temp_path`."""
+        pass
+
+
+@dataclass(kw_only=True)
+class CsvWriter(AbstractWriter):
+    """CSV with a heading row, the format staff upload to Wati by hand."""
+
+    compression: str | None = field(default=None)  # None or "gzip"
+
+    def _open(self, temp_path: str):
+        if self.compression is None:
+            return open(temp_path, "w", encoding="utf-8", newline="")
+        if self.compression == "gzip":
+            return gzip.open(temp_path, "wt", encoding="utf-8", newline="")
+        raise ValueError(
+            f"Invalid compression '{self.compression}'. Expected None or 'gzip'."
+        )
+
+    def _write(self, df: pd.DataFrame, temp_path: str):
+        with self._open(temp_path) as file:
+            if df.empty:
+                df.to_csv(file, index=False)
+            for chunk_number, chunk in enumerate(self._iter_chunks(df)):
+                chunk.to_csv(file, index=False, header=chunk_number == 0)
+
+
+@dataclass(kw_only=True)
+class GzipCsvWriter(CsvWriter):
+    compression: str | None = field(default="gzip")
+
+
+@dataclass(kw_only=True)
+class XlsxWriter(AbstractWriter):
+    """Excel workbook for staff to review, streamed with openpyxl's write-only mode."""
+
+    sheet_name: str = field(default="Output")
+
+    def _write(self, df: pd.DataFrame, temp_path: str):
+        from openpyxl import Workbook
+
+        if len(df) >= EXCEL_MAX_ROWS:
+            raise ValueError(
+                f"Too many rows for an Excel worksheet: {len(df)}. Save as CSV or Parquet instead."
+            )
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(self.sheet_name)
+        sheet.append([str(column) for column in df.columns])
+        for chunk in self._iter_chunks(df):
+            for row in self._to_cells(chunk).itertuples(index=False, name=None):
+                sheet.append(row)
+        workbook.save(temp_path)
+
+    @staticmethod
+    def _to_cells(chunk: pd.DataFrame) -> pd.DataFrame:
+        """Python values openpyxl can write, e.g. `date` cells and None for missing values."""
+        cells = {}
+        for column, values in chunk.items():
+            if (
+                pd.api.types.is_datetime64_dtype(values)
+                and (values.dropna() == values.dropna().dt.normalize()).all()
+            ):
+                values = values.dt.date  # Shown without a time of day
+            cells[column] = values.astype(object).where(values.notna(), None)
+        return pd.DataFrame(cells, index=chunk.index)
+
+
+@dataclass(kw_only=True)
+class ParquetWriter(AbstractWriter):
+    """Parquet for the archive, keeping categoricals, Arrow strings and dates."""
+
+    compression: str = field(default="zstd")
+
+    def _write(self, df: pd.DataFrame, temp_path: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as err:
+            raise ImportError("Saving as Parquet requires pyarrow.") from err
+
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+        with pq.ParquetWriter(
+            temp_path, schema, compression=self.compression
+        ) as parquet_writer:
+            for chunk in self._iter_chunks(df):
+                parquet_writer.write_table(
+                    pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                )
+
+
+@dataclass(kw_only=True)
+class NdjsonWriter(AbstractWriter):
+    """One Wati receiver per line, as sent in `sendTemplateMessages` requests.
+
+    ```json
+    {"whatsappNumber": "27821234567", "customParams": [{"name": "Name", "value": "Botha Johan"}]}
+    ```
+    """
+
+    chunk_rows: int = field(default=NDJSON_CHUNK_ROWS)
+    phone_column: str = field(default=DEFAULT_PHONE_COLUMN)
+    # Map of Wati template parameter name to column, defaults to all other columns
+    parameter_column_dict: dict[str, str] | None = field(default=None)
+
+    def _write(self, df: pd.DataFrame, temp_path: str):
+        with open(temp_path, "w", encoding="utf-8", newline="\n") as file:
+            for chunk in self._iter_chunks(df):
+                receivers = build_receivers(
+                    chunk, self.phone_column, self.parameter_column_dict
+                )
+                file.writelines(f"{json.dumps(receiver)}\n" for receiver in receivers)
+
+
+# * ---------------------
+# * Writer selection
+# * ---------------------
+WRITER_CLASS_DICT: dict[str, type[AbstractWriter]] = {
+    ".csv": CsvWriter,
+    ".csv.gz": GzipCsvWriter,
+    ".xlsx": XlsxWriter,
+    ".parquet": ParquetWriter,
+    ".ndjson": NdjsonWriter,
+    ".jsonl": NdjsonWriter,
+}
+
+
+def get_output_file_type(filepath: str) -> str:
+    """The extension of `filepath`, including the '.csv' of '.csv.gz' files."""
+    file_name = os.path.basename(filepath).lower()
+    for file_type in sorted(WRITER_CLASS_DICT, key=len, reverse=True):
+        if file_name.endswith(file_type):
+            return file_type
+    return os.path.splitext(file_name)[-1]
+
+
+def get_writer_class(filepath: str) -> type[AbstractWriter]:
+    """Return the writer registered for the file's extension, or `CsvWriter`.
+
+    Outputs were always CSV before other formats were added, so save paths with
+    another or no extension (e.g. '.txt' typed in a save dialog) are still CSV.
+    """
+    file_type = get_output_file_type(filepath)
+    return WRITER_CLASS_DICT.get(file_type, CsvWriter)
@@ -1,8 +1,12 @@
 from dataclasses import dataclass, field
+from typing import ClassVar
 
+import numpy as np
 import pandas as pd
 
 from ._abstract_handler import AbstractHandler
+from ._phone import DEFAULT_COUNTRY_CODE, STRING_DTYPE, to_country_cell_numbers
+from ._watermark import Watermark, WatermarkStore, hash_rows
 
 ### Constants and Defaults ###
 #! TODO: ensure all known junk words are provided
@@ -25,6 +29,12 @@ VALID_OPTOMETRIST_LIST = [
     "Yasmin Vawda",
 ]
 
+# Report columns that are not used
+DROPPED_COLUMN_LIST = ["PatientNo", "Home", "Work", "Medical Aid", "Plan", "Number"]
+
+# Column headings every Appointment report has, used to recognise its layout
+HEADER_SIGNATURE = frozenset(["Date", "Time", "Name", "Cell", *DROPPED_COLUMN_LIST])
+
 # ? CAN_CHANGE: These are the headings of the final dataframe, free to changeAdd in the full list of Optometrists
 # "Date", "Time", "Name", "Cell", "Optometrists", "Practice", "CountryCode", "CellCountry"
 
@@ -48,6 +58,8 @@ class AppointmentHandler(AbstractHandler):
     valid_file_types: list[str] = field(
         default_factory=lambda: DEFAULT_VALID_FILE_TYPES
     )
+    header_signature: ClassVar[frozenset[str]] = HEADER_SIGNATURE
+    handler_version: ClassVar[str] = "1"
 
     # * Initialize child class's additional default attributes defined
     valid_optometrist_list: list[str] = field(
@@ -60,21 +72,45 @@ class AppointmentHandler(AbstractHandler):
         default_factory=lambda: DEFAULT_CHOSEN_HEADINGS
     )
 
+    # * Incremental mode: only output appointments that are new or changed since the
+    # * last saved run for the selected practice
+    incremental: bool = field(default=False)
+    watermark_store: WatermarkStore | None = field(default=None)
+    pending_watermark: Watermark | None = field(default=None, init=False)
+
     # * ---------------------
     # * Transform data methods
     # * ---------------------
-    def _assign_optometrist(self, x):
-        """Assign optometrist to patient row in considered DataFrame"""
-        if x in self.valid_optometrist_list:
-            return x
-        else:
-            return float("nan")  #! Check if can remove np.nan and replace with None
+    def _assign_optometrists(self, group_cells: pd.Series) -> pd.Series:
+        """Each optometrist's name heads their group of rows in the 'Date' column."""
+        # A set keeps the lookup hashed however many optometrists are listed
+        optometrist_mask = group_cells.isin(set(self.valid_optometrist_list))
+        return group_cells.where(optometrist_mask).ffill()
+
+    @staticmethod
+    def _parse_dates(date_cells: pd.Series) -> pd.Series:
+        """Forward-fill and parse the 'Date' column, parsing each distinct cell once.
+
+        Only a group's first row holds its date, later rows inherit it. Rows following
+        other cells (e.g. optometrist names) inherit NaT and are filtered out.
+        """
+        codes, unique_cells = pd.factorize(date_cells)
+        unique_dates = pd.to_datetime(
+            pd.Series(unique_cells, dtype=object), format="%Y-%m-%d", errors="coerce"
+        )
+
+        # Empty cells (code -1) inherit the previous cell's code, leading ones stay -1
+        codes = pd.Series(codes).where(codes >= 0).ffill().fillna(-1).astype("int64")
+        dates = np.append(unique_dates.to_numpy(), np.datetime64("NaT", "ns"))
+        return pd.Series(
+            dates[codes.to_numpy()], index=date_cells.index, name=date_cells.name
+        )
 
     # @abstractmethod
     def _clean_data(self, df: pd.DataFrame | None = None):
         # Retrieve relevant dataframe and validate
         self.df_raw = self._validate_dataframe("df_raw", df)
-        df_raw = self.df_raw.copy()
+        df_raw = self.df_raw
 
         # * Clean up Excel:
         # Drop all empty rows and last row (page X of Y)
@@ -95,35 +131,72 @@ class AppointmentHandler(AbstractHandler):
         # Remove unnecessary columns
         dropped_columns = df_clean.columns.notna()
         df_clean = df_clean.loc[:, dropped_columns]
-        df_clean = df_clean.drop(
-            columns=["PatientNo", "Home", "Work", "Medical Aid", "Plan", "Number"]
-        )
+        df_clean = df_clean.drop(columns=DROPPED_COLUMN_LIST)
 
         # Assign an optometrist to patient from the 'Date' column
-        df_clean["Optometrists"] = (
-            df_clean["Date"].apply(lambda x: self._assign_optometrist(x)).ffill()
-        )
-
-        # Keep only valid dates in 'Date' Column
-        df_clean["Date"] = df_clean["Date"].ffill()
-        date_mask = pd.to_datetime(
-            df_clean["Date"], format="%Y-%m-%d", errors="coerce"
-        ).notnull()
-        df_clean = df_clean[date_mask].reset_index(drop=True)
+        with self._stage("assign_optometrists", df_clean) as stage:
+            df_clean["Optometrists"] = self._assign_optometrists(df_clean["Date"])
+            stage.set_output(df_clean)
+
+        # Keep only valid dates in 'Date' Column, parsed once for all later stages
+        with self._stage("filter_dates", df_clean) as stage:
+            df_clean["Date"] = self._parse_dates(df_clean["Date"])
+            df_clean = df_clean[df_clean["Date"].notna()].reset_index(drop=True)
+            stage.set_output(df_clean)
+
+        # Skip appointments already output by the previous incremental run
+        if self.incremental:
+            with self._stage("skip_processed_rows", df_clean) as stage:
+                df_clean = self._drop_processed_rows(df_clean)
+                stage.set_output(df_clean)
 
         # Ensure users names in 'Name' column are titled
-        df_clean["Name"] = df_clean["Name"].str.title()
+        df_clean["Name"] = df_clean["Name"].astype(STRING_DTYPE).str.title()
 
         # Assign class attribute with resulting DataFrame
         self.df_clean = df_clean
 
         return df_clean
 
+    def _get_watermark_name(self) -> str:
+        return f"{self}_{self.selected_practice}"
+
+    def _drop_processed_rows(self, df_clean: pd.DataFrame) -> pd.DataFrame:
+        """Drop rows unchanged since the last run and keep the new watermark pending.
+
+        The watermark is only stored by `commit_watermark` (called by `save_data`),
+        so a run whose output is never saved is repeated in full next time.
+        """
+        self.watermark_store = self.watermark_store or WatermarkStore()
+        watermark = self.watermark_store.load(self._get_watermark_name())
+
+        row_hashes = hash_rows(df_clean)
+        row_datetimes = (
+            df_clean["Date"].dt.strftime("%Y-%m-%d")
+            + " "
+            + df_clean["Time"].astype(str)
+        )
+        processed_mask = watermark.get_processed_mask(row_hashes, row_datetimes)
+
+        # The next export overlaps with this one, so only this export's rows are kept
+        self.pending_watermark = Watermark(
+            last_datetime=row_datetimes.max() if len(row_datetimes) else None,
+            row_hashes=row_hashes.tolist(),
+        )
+        return df_clean[~processed_mask].reset_index(drop=True)
+
+    def commit_watermark(self):
+        """Store the pending watermark, e.g. once the output has been saved or sent."""
+        if self.pending_watermark is None:
+            return
+        self.watermark_store.save(self._get_watermark_name(), self.pending_watermark)
+        self.pending_watermark = None
+
     # @abstractmethod
     def _add_features(self, df: pd.DataFrame | None = None):
         # Retrieve relevant dataframe and validate
         self.df_clean = self._validate_dataframe("df_clean", df)
-        df = self.df_clean.copy()
+        df = self.df_clean
 
         # Add practice information:
         #! TODO: Remove store location later - Pavilion needs to include location of new store
@@ -135,25 +208,26 @@ class AppointmentHandler(AbstractHandler):
         df["Practice"] = practice_string
 
         ## Add country code and modify contact information for user
-        df["CountryCode"] = "27"
-        df["CellCountry"] = df["CountryCode"] + df["Cell"].apply(lambda x: str(x)[1:])
-
-        valid_country_cell_mask = df["CellCountry"].apply(
-            lambda x: len(x) == 11 and x.isdigit()
-        )
-        df[valid_country_cell_mask].reset_index(drop=True)
-
-        # Make the columns have dtypes
-        df["Date"] = pd.to_datetime(df["Date"]).dt.date
+        with self._stage("validate_phones", df) as stage:
+            df["CountryCode"] = DEFAULT_COUNTRY_CODE
+            df["CellCountry"] = to_country_cell_numbers(
+                df["Cell"], DEFAULT_COUNTRY_CODE
+            )
+            df = df[df["CellCountry"].notna()].reset_index(drop=True)
+            stage.set_output(df)
 
         # CountryCell, Patient, Optometrist, Practice, Date, Time
 
         # Reorder Dataframe
-        df = df.reindex(self.default_headings_list, axis=1)
+        df = df.reindex(self._get_output_headings(df), axis=1)
 
         self.df_clean = df
         return df
 
+    def _get_message_keys(self, df: pd.DataFrame) -> pd.Series:
+        """One appointment message per patient per appointment date and time."""
+        return df["Date"].astype(str) + " " + df["Time"].astype(str)
+
     # @abstractmethod
     def save_data(self, savepath: str | None = None):
         """Save the cleaned data to a new file in save_folder."""
@@ -177,8 +251,9 @@ class AppointmentHandler(AbstractHandler):
                 "Missing 'df_output' attribute. Cannot save data unless data is provided."
             )
 
-        # Get output pd.DataFrame and save
-        self.df_output.to_csv(self.save_path, index=False)
+        # Get output pd.DataFrame and save, see `_writers.py` for the formats
+        self._write_output()
+        self.commit_watermark()
 
 
 if __name__ == "__main__":
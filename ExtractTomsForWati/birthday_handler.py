@@ -1,13 +1,21 @@
 from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import ClassVar
 
 import pandas as pd
 
 from ._abstract_handler import AbstractHandler
+from ._birthday_index import BirthdayIndex
+from ._birthday_parser import BirthdayRecordParser, MalformedRecord
+from ._phone import DEFAULT_COUNTRY_CODE, get_valid_cell_mask, to_country_cell_numbers
 
 ### Constants and Defaults ###
 #! TODO: ensure all known junk words are provided
 CONTACT_TYPE_LIST = ["Home", "Cell", "Work", "Fax", "EMail"]
 
+# Column headings every Birthday report has, used to recognise its layout.
+# 'Home Address' is split over two rows.
+HEADER_SIGNATURE = frozenset(["Birthday", "Home", "Address", "Contact No."])
 
 # ? CAN_CHANGE: These are the headings of the final dataframe, free to changeAdd in the full list of Optometrists
 DEFAULT_CHOSEN_HEADINGS = ["CellCountry", "Name", "Practice", "Birthday", "Age"]
@@ -16,6 +24,9 @@ DEFAULT_CHOSEN_HEADINGS = ["CellCountry", "Name", "Practice", "Birthday", "Age"]
 
 DEFAULT_VALID_FILE_TYPES = [".xls", ".xlsx"]
 
+# Malformed records listed in the run report, all of them are kept in `malformed_records`
+MAX_REPORTED_MALFORMED = 10
+
 
 @dataclass
 class BirthdayHandler(AbstractHandler):
@@ -24,6 +35,10 @@ class BirthdayHandler(AbstractHandler):
     valid_file_types: list[str] = field(
         default_factory=lambda: DEFAULT_VALID_FILE_TYPES
     )
+    header_signature: ClassVar[frozenset[str]] = HEADER_SIGNATURE
+    handler_version: ClassVar[str] = "2"
+    result_attribute_list: ClassVar[list[str]] = ["df_output", "malformed_records"]
+    result_depends_on_today: ClassVar[bool] = True  # Ages and the upcoming window
 
     # * Initialize child class's additional default attributes defined
     find_contact_list: list[str] = field(default_factory=lambda: CONTACT_TYPE_LIST)
@@ -31,6 +46,16 @@ class BirthdayHandler(AbstractHandler):
         default_factory=lambda: DEFAULT_CHOSEN_HEADINGS
     )
 
+    # Only output birthdays from `window_start` (default today) up to this many days later
+    upcoming_days: int | None = field(default=None)
+    window_start: date | None = field(default=None)
+    birthday_index: BirthdayIndex | None = field(default=None, init=False, repr=False)
+
+    # Report rows skipped by the record parser, see `BirthdayRecordParser`
+    malformed_records: list[MalformedRecord] = field(
+        default_factory=list, init=False, repr=False
+    )
+
     # * ---------------------
     # * Transform data methods
     # * ---------------------
@@ -47,21 +72,8 @@ class BirthdayHandler(AbstractHandler):
             )
 
         category_mask = df["Contact_Type"] == contact_type
-        has_content_mask = df["Contact"].notna() & (df["Contact"] != "")
-        valid_len_mask = df["Contact"].apply(lambda x: len(str(x)) >= 10)
-        valid_start_mask = df[
-            "Contact"
-        ].apply(
-            lambda x: str(x).startswith("0")
-        )  # ("082", "083", "084", "079", "076", "072", "071", "078", "060", "011", "021")
-        not_zeros_mask = df["Contact"] != "0000000000"
-        union_mask = (
-            category_mask
-            & has_content_mask
-            & valid_len_mask
-            & valid_start_mask
-            & not_zeros_mask
-        )
+        valid_number_mask = get_valid_cell_mask(df["Contact"])
+        union_mask = category_mask & valid_number_mask
 
         # Filter rows that match the contact category and have a valid phone number
         valid_rows = df[union_mask]
@@ -71,113 +83,37 @@ class BirthdayHandler(AbstractHandler):
     def _clean_data(self, df: pd.DataFrame | None = None):
         # Retrieve relevant dataframe and validate
         self.df_raw = self._validate_dataframe("df_raw", df)
-        df_raw = self.df_raw.copy()
+        df_raw = self.df_raw
 
         # * Clean up Excel:
-        # Remove all empty rows and drop last row (Page 1 of 1)
-        data_rows_clean = df_raw.iloc[:-1].dropna(how="all").reset_index(drop=True)
-
-        # Remove all non-useful header rows (first 4)
-        data_rows_clean = data_rows_clean.iloc[4:].reset_index(drop=True)
-
-        # Remove all empty columns
-        data_rows_clean = data_rows_clean.dropna(axis=1, how="all")
-
-        # Extract the potential column headings
-        new_col_list = (
-            data_rows_clean.iloc[0:2, :]
-            .fillna("")
-            .apply(lambda x: "".join(x), axis=0)
-            .tolist()
-        )
-
-        # Validate with expected column names
-        VALID_COLUMN_NAMES = [
-            "Birthday",
-            "Home Address",
-            "Postal Address",
-            "Work Address",
-            "Contact No.",
-        ]
-        to_validate_list = [col for col in new_col_list if col]
-        faulty_columns = [
-            col for col in to_validate_list if col not in VALID_COLUMN_NAMES
-        ]
-
-        # If empty then False
-        if any(faulty_columns):
-            raise ValueError(f"Unexpected column names: {', '.join(faulty_columns)}.")
-
-        # Replace empty columns with new unique names and assign to dataframe.columns
-        default_column_list = [f"col_{i + 1}" for i in range(new_col_list.count(""))]
-        filler_iter = iter(default_column_list)
-        data_rows_clean.columns = [
-            item if item != "" else next(filler_iter) for item in new_col_list
-        ]
-
-        data_rows_clean = data_rows_clean.iloc[2:, :].reset_index(drop=True)
-
-        # Remove unnecessary columns
-        data_rows_clean = data_rows_clean.drop(
-            columns=["Postal Address", "Work Address"]
-        )
-
-        # Rename columns
-        data_rows_clean = data_rows_clean.rename(
-            columns={
-                "Birthday": "Name",
-                "Contact No.": "Contact",
-                "Home Address": "Title",
-            }
-        )
-
-        # Get 'Birthday' data by shifting 'Name' column
-        data_rows_clean["Birthday"] = data_rows_clean.loc[:, "Name"].shift(-1)
-
-        # Find column that contains 'ContactType'
-        #! Subject to change:
-        #! df.ContactType.unique() # [nan, 'Home', 'Cell', 'Work', 'Fax', 'EMail']
-        unknown_col_df = data_rows_clean.loc[:, default_column_list]
-        contact_col = unknown_col_df.columns[
-            unknown_col_df.isin(self.find_contact_list).any()
-        ].tolist()
-
-        if len(contact_col) == 1:
-            data_rows_clean = data_rows_clean.rename(
-                columns={contact_col[0]: "Contact_Type"}
+        # One record per patient contact, from a single pass over the report's rows
+        with self._stage("parse_records", df_raw) as stage:
+            parser = BirthdayRecordParser(
+                find_contact_list=self.find_contact_list, contact_type_list=["Cell"]
             )
-        else:
-            raise ValueError(
-                f"Too many columns with unknown headings contain the contact type keywords: {self.find_contact_list}"
+            data_rows_clean = parser.parse(df_raw)
+            stage.set_output(data_rows_clean)
+
+        self.malformed_records = parser.malformed_records
+        for malformed_record in self.malformed_records[:MAX_REPORTED_MALFORMED]:
+            self.run_report.warnings.append(f"Skipped {malformed_record}")
+        if len(self.malformed_records) > MAX_REPORTED_MALFORMED:
+            self.run_report.warnings.append(
+                f"Skipped {len(self.malformed_records) - MAX_REPORTED_MALFORMED} more malformed records"
             )
 
-        # Find users titled names in 'Name' column (prev. 'Birthday' column) #! Possibly move to feature creation
-        all_string_rows = data_rows_clean.loc[:, "Name"].apply(
-            lambda x: isinstance(x, str) and not x.replace(" ", "").isnumeric()
-        )
-        data_rows_clean.loc[~all_string_rows, "Name"] = float("nan")
-        data_rows_clean["Name"] = data_rows_clean.loc[:, "Name"].str.title()
-        data_rows_clean["Name"] = data_rows_clean.loc[:, "Name"].ffill()
-
-        # Clean 'Birthday' column
-        data_rows_clean.loc[~all_string_rows, "Birthday"] = float("nan")
-        data_rows_clean["Birthday"] = data_rows_clean.loc[:, "Birthday"].ffill()
-
-        # Clean 'Title' column
-        data_rows_clean.loc[~all_string_rows, "Title"] = float("nan")
-        data_rows_clean["Title"] = data_rows_clean.loc[:, "Title"].str.title()
-        data_rows_clean["Title"] = data_rows_clean.loc[:, "Title"].ffill()
-
-        valid_indices = self._get_valid_phone_indices(
-            data_rows_clean, contact_type="Cell"
-        )
+        with self._stage("validate_phones", data_rows_clean) as stage:
+            valid_indices = self._get_valid_phone_indices(
+                data_rows_clean, contact_type="Cell"
+            )
+            stage.rows_out = len(valid_indices)
 
         df_clean = (
             data_rows_clean.loc[valid_indices, :]
             .drop_duplicates()
             .reset_index(drop=True)
         )
-        self.df_clean = df_clean.copy()
+        self.df_clean = df_clean
 
         return df_clean
 
@@ -185,7 +121,7 @@ class BirthdayHandler(AbstractHandler):
     def _add_features(self, df: pd.DataFrame | None = None):
         # Retrieve relevant dataframe and validate
         self.df_clean = self._validate_dataframe("df_clean", df)
-        df = self.df_clean.copy()
+        df = self.df_clean
 
         # Add practice information:
         practice_string = f"Classic Eyes {self.selected_practice}"
@@ -199,22 +135,64 @@ class BirthdayHandler(AbstractHandler):
         df["Age"] = now_year - df["BirthYear"]
 
         # Add country code and modify contact information for user
-        df["CountryCode"] = "27"
-        df["CellCountry"] = df["CountryCode"] + df["Contact"].apply(
-            lambda x: str(x)[1:]
-        )
-
-        valid_country_cell_mask = df["CellCountry"].apply(
-            lambda x: len(x) == 11 and x.isdigit()
-        )
-        df[valid_country_cell_mask].reset_index(drop=True)
+        with self._stage("country_code_cells", df) as stage:
+            df["CountryCode"] = DEFAULT_COUNTRY_CODE
+            df["CellCountry"] = to_country_cell_numbers(
+                df["Contact"], DEFAULT_COUNTRY_CODE
+            )
+            df = df[df["CellCountry"].notna()].reset_index(drop=True)
+            stage.set_output(df)
 
         # Reorder Dataframe
-        df = df.reindex(self.default_headings_list, axis=1)
+        df = df.reindex(self._get_output_headings(df), axis=1)
 
         self.df_clean = df
         return df
 
+    def _extract_features(
+        self, df: pd.DataFrame | None = None, headings: list | None = None
+    ):
+        df_output = super()._extract_features(df, headings)
+        self.birthday_index = None
+
+        if self.upcoming_days is not None:
+            with self._stage("upcoming_birthdays", df_output) as stage:
+                df_output = self.get_upcoming_birthdays(
+                    self.upcoming_days, self.window_start
+                ).reset_index(drop=True)
+                stage.set_output(df_output)
+
+            self.df_output = df_output
+            self.birthday_index = None
+
+        return df_output
+
+    # * ---------------------
+    # * Birthday window queries
+    # * ---------------------
+    def get_birthday_index(self) -> BirthdayIndex:
+        """Month-day index over `df_output`, built on first use."""
+        if self.birthday_index is None:
+            df_output = self._validate_dataframe("df_output")
+            self.birthday_index = BirthdayIndex.from_birthdays(df_output["Birthday"])
+        return self.birthday_index
+
+    def get_upcoming_birthdays(
+        self, days: int, from_date: date | None = None
+    ) -> pd.DataFrame:
+        """Output rows with a birthday from `from_date` (default today) up to `days` days later."""
+        positions = self.get_birthday_index().upcoming(days, from_date)
+        return self.df_output.iloc[positions]
+
+    def get_birthdays_in_week(self, year: int, week: int) -> pd.DataFrame:
+        """Output rows with a birthday in ISO week `week` of `year`."""
+        positions = self.get_birthday_index().in_week(year, week)
+        return self.df_output.iloc[positions]
+
+    def _get_message_keys(self, df: pd.DataFrame) -> pd.Series:
+        """One birthday message per patient per year."""
+        return pd.Series(str(datetime.now().year), index=df.index)
+
     # @abstractmethod
     def save_data(self, savepath: str | None = None):
         """Save the cleaned data to a new file in save_folder."""
@@ -238,8 +216,8 @@ class BirthdayHandler(AbstractHandler):
                 "Missing 'df_output' attribute. Cannot save data unless data is provided."
             )
 
-        # Get output pd.DataFrame and save
-        self.df_output.to_csv(self.save_path, index=False)
+        # Get output pd.DataFrame and save, see `_writers.py` for the formats
+        self._write_output()
 
 
 if __name__ == "__main__":
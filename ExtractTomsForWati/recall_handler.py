@@ -0,0 +1,245 @@
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import ClassVar
+
+import numpy as np
+import pandas as pd
+
+from ._abstract_handler import AbstractHandler
+from ._fan_out import SOURCE_FILE_COLUMN
+from ._phone import DEFAULT_COUNTRY_CODE, STRING_DTYPE, to_country_cell_numbers
+
+### Constants and Defaults ###
+#! TODO: Confirm the recall interval of every exam type used in TOMs
+# Months until a patient is due again, keyed by the exam type of their last exam.
+# Visits of other types (e.g. purchases) do not affect recalls.
+RECALL_INTERVAL_MONTHS_DICT = {
+    "Eye Exam": 24,
+    "Spec Exam": 24,
+    "C/Lens Check": 12,
+    "Diabetic Exam": 12,
+}
+
+# Columns of the TOMs exam history report that are used
+EXPECTED_COLUMN_LIST = ["Date", "PatientNo", "Name", "Exam Type", "Optometrist", "Cell"]
+HEADER_SEARCH_ROWS = 50  # The column headings are within the report's first rows
+
+DEFAULT_RECALL_WINDOW_DAYS = 30
+
+# ? CAN_CHANGE: These are the headings of the final dataframe, free to change
+DEFAULT_CHOSEN_HEADINGS = [
+    "CellCountry",
+    "Name",
+    "Optometrists",
+    "Practice",
+    "LastExam",
+    "DueDate",
+]
+
+
+DEFAULT_VALID_FILE_TYPES = [".xls", ".xlsx"]
+
+
+def add_months(dates: pd.Series, months: pd.Series) -> pd.Series:
+    """Add a per-row number of months to `dates`, clipping to the end of shorter months."""
+    month_index = dates.dt.year * 12 + dates.dt.month - 1 + months
+    first_of_month = pd.to_datetime(
+        pd.DataFrame({"year": month_index // 12, "month": month_index % 12 + 1})
+        .assign(day=1)
+        .astype("int64")
+    )
+    day = np.minimum(dates.dt.day, first_of_month.dt.days_in_month)
+    return first_of_month + pd.to_timedelta(day - 1, unit="D")
+
+
+@dataclass
+class RecallHandler(AbstractHandler):
+    # Initialize file attributes
+    #! Overwrite expected attributes to be defined within child class
+    valid_file_types: list[str] = field(
+        default_factory=lambda: DEFAULT_VALID_FILE_TYPES
+    )
+    header_signature: ClassVar[frozenset[str]] = frozenset(EXPECTED_COLUMN_LIST)
+    handler_version: ClassVar[str] = "1"
+    result_attribute_list: ClassVar[list[str]] = ["df_output", "last_exam_index"]
+    result_depends_on_today: ClassVar[bool] = True  # Default window starts today
+
+    # * Initialize child class's additional default attributes defined
+    recall_interval_dict: dict[str, int] = field(
+        default_factory=lambda: RECALL_INTERVAL_MONTHS_DICT
+    )
+    default_headings_list: list[str] = field(
+        default_factory=lambda: DEFAULT_CHOSEN_HEADINGS
+    )
+
+    # Output patients due from `recall_window_start` (default today) up to this many days later
+    recall_window_days: int = field(default=DEFAULT_RECALL_WINDOW_DAYS)
+    recall_window_start: date | None = field(default=None)
+
+    # Practice of each workbook in multi-source runs by file name, e.g.
+    # {"la_lucia.xlsx": "La Lucia"}. Workbooks not listed are named `selected_practice`,
+    # but are treated as a practice of their own when matching patients.
+    source_practice_dict: dict[str, str] = field(default_factory=dict)
+
+    # One row per patient with their last exam, sorted by 'DueDate'
+    last_exam_index: pd.DataFrame | None = field(default=None, init=False, repr=False)
+
+    # * ---------------------
+    # * Transform data methods
+    # * ---------------------
+    @staticmethod
+    def _find_heading_row(df_raw: pd.DataFrame) -> int:
+        """Position of the row holding the column headings, found by its 'PatientNo' cell."""
+        heading_mask = (df_raw.head(HEADER_SEARCH_ROWS) == "PatientNo").any(axis=1)
+        if not heading_mask.any():
+            raise ValueError(
+                "Could not find the column headings, expected a 'PatientNo' column."
+            )
+        return int(heading_mask.to_numpy().argmax())
+
+    # @abstractmethod
+    def _clean_data(self, df: pd.DataFrame | None = None):
+        # Retrieve relevant dataframe and validate
+        self.df_raw = self._validate_dataframe("df_raw", df)
+        df_raw = self.df_raw.dropna(how="all").reset_index(drop=True)
+
+        # * Clean up Excel:
+        # Rename headings based on the heading row and drop the report header above it
+        heading_row = self._find_heading_row(df_raw)
+        df_clean = df_raw.iloc[heading_row + 1 :].reset_index(drop=True)
+        df_clean.columns = df_raw.iloc[heading_row]
+
+        missing_columns = [
+            col for col in EXPECTED_COLUMN_LIST if col not in df_clean.columns
+        ]
+        if missing_columns:
+            raise ValueError(f"Missing expected columns: {', '.join(missing_columns)}.")
+        df_clean = df_clean.loc[:, EXPECTED_COLUMN_LIST]
+
+        # Keep exam rows only, page footers and blank rows have no valid date
+        with self._stage("filter_exams", df_clean) as stage:
+            df_clean["Date"] = pd.to_datetime(df_clean["Date"], errors="coerce")
+            exam_mask = df_clean["Date"].notna() & df_clean["Exam Type"].isin(
+                list(self.recall_interval_dict)
+            )
+            df_clean = df_clean[exam_mask].reset_index(drop=True)
+            stage.set_output(df_clean)
+
+        # Ensure users names in 'Name' column are titled
+        df_clean["Name"] = df_clean["Name"].astype(STRING_DTYPE).str.title()
+
+        self.df_clean = df_clean
+        return df_clean
+
+    # @abstractmethod
+    def _add_features(self, df: pd.DataFrame | None = None):
+        # Retrieve relevant dataframe and validate
+        self.df_clean = self._validate_dataframe("df_clean", df)
+        df = self.df_clean
+
+        with self._stage("last_exam_index", df) as stage:
+            self.last_exam_index = self._build_last_exam_index(df)
+            stage.set_output(self.last_exam_index)
+
+        with self._stage("select_due_recalls", self.last_exam_index) as stage:
+            start = self.recall_window_start or date.today()
+            df = self.get_due_recalls(
+                start, start + timedelta(days=self.recall_window_days)
+            ).reset_index(drop=True)
+            stage.set_output(df)
+
+        # Reorder Dataframe
+        df = df.reindex(self._get_output_headings(df), axis=1)
+
+        self.df_clean = df
+        return df
+
+    def _add_practices(self, df: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
+        """Add each exam's 'Practice' and return the columns that identify a patient.
+
+        PatientNo is only unique within one practice's TOMs database, so patients of
+        multi-source runs are identified by their practice (or workbook) and PatientNo.
+        """
+        practice_string = f"Classic Eyes {self.selected_practice}"
+        if SOURCE_FILE_COLUMN not in df.columns:
+            return df.assign(Practice=practice_string), ["PatientNo"]
+
+        source_files = df[SOURCE_FILE_COLUMN].astype(str)
+        source_practices = source_files.map(self.source_practice_dict)
+        df = df.assign(
+            Practice=("Classic Eyes " + source_practices).fillna(practice_string),
+            PracticeKey=source_practices.fillna(source_files),
+        )
+        return df, ["PracticeKey", "PatientNo"]
+
+    def _build_last_exam_index(self, df: pd.DataFrame) -> pd.DataFrame:
+        """One row per patient from their latest exam, with the date their recall is due."""
+        df, patient_columns = self._add_practices(df.sort_values("Date", kind="stable"))
+
+        # Patients may have no cell number on their latest visit, use their latest known one
+        latest_cells = df.dropna(subset=["Cell"]).drop_duplicates(
+            patient_columns, keep="last"
+        )
+        df = df.drop_duplicates(patient_columns, keep="last").drop(columns="Cell")
+        df = df.merge(
+            latest_cells[[*patient_columns, "Cell"]], on=patient_columns, how="left"
+        ).rename(
+            columns={
+                "Date": "LastExam",
+                "Exam Type": "ExamType",
+                "Optometrist": "Optometrists",
+            }
+        )
+
+        # Contact information for user
+        df["CountryCode"] = DEFAULT_COUNTRY_CODE
+        df["CellCountry"] = to_country_cell_numbers(df["Cell"], DEFAULT_COUNTRY_CODE)
+        df = df[df["CellCountry"].notna()]
+
+        interval_months = df["ExamType"].map(self.recall_interval_dict).astype("int64")
+        df["DueDate"] = add_months(df["LastExam"], interval_months)
+
+        return df.sort_values("DueDate", kind="stable").reset_index(drop=True)
+
+    def get_due_recalls(self, start: date, end: date) -> pd.DataFrame:
+        """Patients in `last_exam_index` whose recall is due from `start` to `end` inclusive."""
+        last_exam_index = self._validate_dataframe("last_exam_index")
+        due_dates = last_exam_index["DueDate"].to_numpy()
+
+        left = due_dates.searchsorted(np.datetime64(start, "ns"), side="left")
+        right = due_dates.searchsorted(np.datetime64(end, "ns"), side="right")
+        return last_exam_index.iloc[left:right]
+
+    def _get_message_keys(self, df: pd.DataFrame) -> pd.Series:
+        """One recall message per patient per due date."""
+        return df["DueDate"].astype(str)
+
+    # @abstractmethod
+    def save_data(self, savepath: str | None = None):
+        """Save the cleaned data to a new file in save_folder."""
+
+        # Check for file_path availability
+        if not hasattr(self, "file_path"):
+            raise AttributeError(
+                "Missing 'file_path' attribute. Cannot save data unless import data filepath is available."
+            )
+
+        # Set for save_path based on availability
+        self.save_path = (
+            savepath
+            or getattr(self, "save_path", None)
+            or self._get_savepath_from_filepath()
+        )
+
+        # Check output DataFrame availability
+        if not hasattr(self, "df_output"):
+            raise AttributeError(
+                "Missing 'df_output' attribute. Cannot save data unless data is provided."
+            )
+
+        # Get output pd.DataFrame and save, see `_writers.py` for the formats
+        self._write_output()
+
+
+if __name__ == "__main__":
+    recall_handler = RecallHandler()
@@ -1,29 +1,51 @@
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
+import multiprocessing
+import os
 import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import pandas as pd
+from typing import TYPE_CHECKING
 
-from ExtractTomsForWati import AbstractHandler, AppointmentHandler, BirthdayHandler
+# Only light modules are imported before the window is shown. pandas and the
+# handlers are imported by `Application._warm_up` on a background thread.
+from ExtractTomsForWati import (
+    TEMPLATE_NAME_LIST,
+    DiskCache,
+    JobEngine,
+    import_all_handlers,
+)
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-#!  TODO ADD WATI API connector
-#! https://docs.wati.io/reference/post_api-v1-sendtemplatemessages
+    from ExtractTomsForWati import AbstractHandler, Job
 
 
 # Constants:    #
 # ------------- #
-ALL_WATI_HANDLERS_LIST = [
-    AppointmentHandler,  #! NEED TO ADD MORE HANDLER CLASSES
-    BirthdayHandler,
-    # To add recalls
-]
-WATI_TEMPLATE_DICT = {
-    cls.__name__.removesuffix("Handler"): cls for cls in ALL_WATI_HANDLERS_LIST
-}
+#! Handlers are registered in ExtractTomsForWati/_registry.py
+WATI_TEMPLATE_LIST = TEMPLATE_NAME_LIST
+# Template choice that sniffs the template from the report's header rows
+AUTO_DETECT_TEMPLATE = "Auto-detect"
 
 CE_PRACTICE_LIST = ["Pavilion", "La Lucia"]
 
+# Re-uploads of an unchanged report are loaded from here instead of re-parsed
+PARSE_CACHE = DiskCache(namespace="parsed")
+# Re-processing an unchanged report with the same settings returns the stored output
+RESULT_CACHE = DiskCache(namespace="results")
+
+# Save dialog choices, the chosen extension selects the writer (see _writers.py)
+OUTPUT_FILE_TYPE_LIST = [
+    ("CSV Files", "*.csv"),
+    ("Excel Workbooks", "*.xlsx"),
+    ("Compressed CSV Files", "*.csv.gz"),
+    ("Parquet Files", "*.parquet"),
+    ("Wati NDJSON Files", "*.ndjson"),
+]
+
 
 # Page definitions:    #
 # -------------------- #
@@ -70,6 +92,14 @@ class Application(tk.Tk):
         # Define Shared properties
         self.is_processing = False
         self.SelectedHandler: AbstractHandler | None = None
+        self.completed_jobs: list[Job] = []
+        self.current_page = None
+
+        # Reports are processed by worker processes, started (and pandas imported in
+        # them) in the background once the window is up
+        self.job_engine = JobEngine(parse_cache=PARSE_CACHE, result_cache=RESULT_CACHE)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.after(100, self._start_warm_up)
 
         # Create main page and add in other pages
         self.main_page = tk.Frame(self)
@@ -97,14 +127,27 @@ class Application(tk.Tk):
         if reset_defaults:
             page.reset_defaults()
 
+        self.current_page = page_class
         page.tkraise()
 
+    def _start_warm_up(self):
+        threading.Thread(target=self._warm_up, daemon=True).start()
+
+    def _warm_up(self):
+        """Start the workers and import the handlers while the user picks a template and file."""
+        self.job_engine.start()
+        import_all_handlers()  # Results are rebuilt into handlers in this process
+
+    def _on_close(self):
+        self.job_engine.shutdown()
+        self.destroy()
+
 
 class HomePage(AbstractPage):
 
     def __init__(self, parent, controller):
         # List defaults
-        self.template_list = list(WATI_TEMPLATE_DICT.keys())
+        self.template_list = [AUTO_DETECT_TEMPLATE, *WATI_TEMPLATE_LIST]
         self.practice_list = CE_PRACTICE_LIST
 
         # Dropdown menu template defaults
@@ -154,11 +197,20 @@ class HomePage(AbstractPage):
         self.file_path_label = tk.Label(self, text=self.file_path_label_default.get())
         self.file_path_label.pack(pady=5)
 
-        # Process button
+        # Process button, or queue the report and pick another one
         self.process_button = tk.Button(
             self, text="Process File", command=self._validate_and_process
         )
-        self.process_button.pack(pady=20)
+        self.process_button.pack(pady=(20, 5))
+        self.queue_button = tk.Button(
+            self,
+            text="Add to Queue",
+            command=lambda: self._validate_and_process(show_progress=False),
+        )
+        self.queue_button.pack(pady=5)
+        self.view_queue_button = tk.Button(
+            self, text="View Queue", command=self._view_queue
+        )
 
     def _update_uploaded_filename(self):
         file_path = filedialog.askopenfilename(
@@ -168,7 +220,7 @@ class HomePage(AbstractPage):
             self.selected_filepath = file_path
             self.file_path_label.config(text=f"Selected: {file_path.split('/')[-1]}")
 
-    def _validate_and_process(self):
+    def _validate_and_process(self, show_progress: bool = True):
 
         # Get user selected variables/uploaded files and check if valid input
         selected_template = self.template_default.get()
@@ -194,75 +246,100 @@ class HomePage(AbstractPage):
             )
             return
 
-        # Move to the loading screen
-        self.controller.show_page(LoadingPage)
-        self.controller.app_pages[LoadingPage]._start_loading()
-
-        # Get Handler and supply selected practice
-        process_handler = WATI_TEMPLATE_DICT[selected_template](
-            selected_practice=selected_practice
-        )
-        self.controller.SelectedHandler = process_handler
+        # Reports are recognised by the worker processes, off the Tk thread
+        if selected_template == AUTO_DETECT_TEMPLATE:
+            selected_template = None
 
-        # Start processing in a new thread to avoid freezing the UI
-        self.processing_thread = threading.Thread(
-            target=self._process_file_with_handler,
-            args=(process_handler, selected_filepath),
+        # Submit the report to the worker processes
+        self.controller.job_engine.submit(
+            selected_template, selected_practice, selected_filepath
         )
-        self.processing_thread.start()
+        self._start_checking_jobs()
 
-        # Somehow make sure that when cancel is pressed that the process is killed
-        self.controller.is_processing = True
-
-        # Start checking for the thread's completion
-        self._check_thread()
-
-    def _check_thread(self):
-        alive_thread = self.processing_thread.is_alive()
-        is_processing = self.controller.is_processing
-
-        if alive_thread and is_processing:
-            self.after(100, self._check_thread)
-
-        elif alive_thread and not is_processing:
-            self.controller.app_pages[LoadingPage]._stop_loading()
-            self.controller.app_pages[HomePage].reset_defaults()
-            self.controller.show_page(HomePage)
+        if show_progress:
+            self._view_queue()
         else:
+            # Clear the file selection so that another report can be queued
+            self.selected_filepath = None
+            self.file_path_label.config(text=self.file_path_label_default.get())
+            self._update_queue_button()
+
+    def _view_queue(self):
+        self.controller.show_page(LoadingPage)
+        if not self.controller.is_processing:
+            # Every queued report already finished while the user was on this page
             self._completed_process_callback()
 
-    def _process_file_to_template(self, selected_template: str, selected_practice: str):
+    def _update_queue_button(self):
+        job_count = len(self.controller.job_engine.jobs)
+        if job_count:
+            self.view_queue_button.config(text=f"View Queue ({job_count})")
+            self.view_queue_button.pack(pady=5)
+        else:
+            self.view_queue_button.pack_forget()
+
+    def _start_checking_jobs(self):
+        if not self.controller.is_processing:
+            # A check left over from a cancelled run would otherwise poll in parallel
+            if getattr(self, "check_jobs_id", None):
+                self.after_cancel(self.check_jobs_id)
+            self.controller.is_processing = True
+            self._check_jobs()
+
+    def _check_jobs(self):
+        # Collect progress and results from the worker processes
+        job_engine = self.controller.job_engine
+        job_engine.poll()
+        self.controller.app_pages[LoadingPage]._show_jobs(
+            list(job_engine.jobs.values())
+        )
 
-        try:
-            # Call the appropriate template function
-            template_function = WATI_TEMPLATE_DICT[selected_template]
-            handle_output = template_function(selected_template, selected_practice)
+        if not self.controller.is_processing:
+            # Cancelled: the page has already returned home
+            return
 
-            # Store function output
-            self.controller.handle_output = handle_output
+        elif job_engine.active_jobs:
+            self.check_jobs_id = self.after(100, self._check_jobs)
 
-        except Exception as err:
-            print(f"Unexpected {err=}, {type(err)=}")
-            raise
+        else:
+            self.check_jobs_id = None
+            self.controller.is_processing = False
+            if self.controller.current_page is LoadingPage:
+                self._completed_process_callback()
 
-    def _process_file_with_handler(
-        self, process_handler: AbstractHandler, file_path: str
-    ):
-        # Apply appropriate Handler class with
-        handle_output = process_handler.load_and_process(filepath=file_path)
+    def _completed_process_callback(self):
+        # Hand the finished reports over to the download page
+        job_engine = self.controller.job_engine
+        finished_jobs = list(job_engine.jobs.values())
+        job_engine.clear_finished()
+        self._update_queue_button()
+
+        failed_jobs = [job for job in finished_jobs if job.failed]
+        if failed_jobs:
+            messagebox.showerror(
+                "Processing Failed",
+                "\n".join(
+                    f"{os.path.basename(job.file_path)}: {job.error}"
+                    for job in failed_jobs
+                ),
+            )
 
-        # Store function output
-        self.controller.handle_output = handle_output
+        completed_jobs = [job for job in finished_jobs if job.succeeded]
+        if not completed_jobs:
+            self.controller.app_pages[HomePage].reset_defaults()
+            self.controller.show_page(HomePage)
+            return
 
-    def _completed_process_callback(self):
-        # Only when callback is
-        self.controller.app_pages[LoadingPage]._stop_loading()
+        self.controller.completed_jobs = completed_jobs
+        self.controller.SelectedHandler = completed_jobs[0].handler
+        self.controller.handle_output = completed_jobs[0].handler.df_output
         self.controller.show_page(DownloadPage)
 
     def reset_defaults(self):
         # Reset Handler information in application
         self.controller.SelectedHandler = None
         self.controller.handle_output = None
+        self.controller.completed_jobs = []
 
         # Update template dropdown menu type
         self.template_default.set(self.template_list[0])
@@ -274,6 +351,7 @@ class HomePage(AbstractPage):
         self.selected_filepath = None
         if hasattr(self, "file_path_label"):
             self.file_path_label.config(text=self.file_path_label_default.get())
+            self._update_queue_button()
 
 
 class LoadingPage(AbstractPage):
@@ -282,31 +360,83 @@ class LoadingPage(AbstractPage):
         """Define page's widgets to be displayed. Defaults are defined in 'reset_defaults' function."""
         # Add a label to indicate loading
         self.loading_label = tk.Label(self, text="Processing... Please wait")
-        self.loading_label.pack(pady=20)
+        self.loading_label.pack(pady=10)
 
-        # Add the ttk Progressbar in 'indeterminate' mode
-        self.progress = ttk.Progressbar(self, orient="horizontal", mode="indeterminate")
-        self.progress.pack(fill="x", padx=20, pady=20)
-        # self._start_loading()
+        # Add the ttk Progressbar, filled in from the jobs' published progress
+        self.progress = ttk.Progressbar(
+            self, orient="horizontal", mode="determinate", maximum=100
+        )
+        self.progress.pack(fill="x", padx=20, pady=10)
+
+        # One row per queued report
+        self.job_tree = ttk.Treeview(
+            self, columns=("report", "status"), show="headings", height=6
+        )
+        self.job_tree.heading("report", text="Report")
+        self.job_tree.heading("status", text="Status")
+        self.job_tree.column("status", width=110, stretch=False)
+        self.job_tree.pack(fill="both", expand=True, padx=20, pady=5)
+
+        # Queue another report while these are processed
+        self.add_button = tk.Button(
+            self, text="Add Another Report", command=self._add_another
+        )
+        self.add_button.pack(pady=5)
 
         # Add a cancel button if needed
         self.cancel_button = tk.Button(
             self, text="Cancel", command=self._cancel_process
         )
-        self.cancel_button.pack(pady=10)
+        self.cancel_button.pack(pady=5)
 
     def reset_defaults(self):
         """Define all default variables to be used on page."""
         pass
 
-    def _start_loading(self):
-        self.progress.start(50)
+    def _show_jobs(self, jobs: list[Job]):
+        for job in jobs:
+            template = job.template or AUTO_DETECT_TEMPLATE
+            report = f"{template} ({job.practice}): {os.path.basename(job.file_path)}"
+            status = job.status
+            if not job.finished and job.stage:
+                status = f"{job.fraction:.0%} {job.stage.replace('_', ' ')}"
+
+            item_id = str(job.job_id)
+            if self.job_tree.exists(item_id):
+                self.job_tree.item(item_id, values=(report, status))
+            else:
+                self.job_tree.insert("", "end", iid=item_id, values=(report, status))
+
+        # Drop rows of jobs that have been handed over or cleared
+        job_ids = {str(job.job_id) for job in jobs}
+        for item_id in self.job_tree.get_children():
+            if item_id not in job_ids:
+                self.job_tree.delete(item_id)
+
+        # Overall progress, finished jobs count as complete
+        if jobs:
+            fractions = [1.0 if job.finished else job.fraction for job in jobs]
+            fraction = sum(fractions) / len(fractions)
+            finished_count = sum(job.finished for job in jobs)
+            self.progress["value"] = round(100 * fraction)
+            self.loading_label.config(
+                text=f"Processed {finished_count} of {len(jobs)} reports... {fraction:.0%}"
+            )
 
     def _stop_loading(self):
-        self.progress.stop()
+        self.progress["value"] = 0
+        self.loading_label.config(text="Processing... Please wait")
+
+    def _add_another(self):
+        self.controller.app_pages[HomePage].reset_defaults()
+        self.controller.show_page(HomePage, reset_defaults=False)
 
     def _cancel_process(self):
-        self.progress.stop()
+        # Stop the workers at their next check, instead of letting them finish in the background
+        self.controller.job_engine.cancel()
+        self.controller.job_engine.clear_finished()
+
+        self._stop_loading()
         self.controller.is_processing = False
         self.controller.app_pages[HomePage].reset_defaults()
         self.controller.show_page(HomePage)
@@ -318,6 +448,10 @@ class DownloadPage(AbstractPage):
         self.complete_label = tk.Label(self, text="Processing Complete!")
         self.complete_label.pack(side="top", fill="x", pady=10)
 
+        # Per-stage timings and row counts of the finished run
+        self.run_report_label = tk.Label(self, justify="left", font=("Courier", 9))
+        self.run_report_label.pack(side="top", fill="x", padx=10)
+
         self.download_button_1 = tk.Button(
             self, text="Save As", command=lambda: self._download_results(ask_user=True)
         )
@@ -337,29 +471,40 @@ class DownloadPage(AbstractPage):
 
     def _download_results(self, ask_user: bool = False):
 
-        # Get data/handler
-        process_handler: AbstractHandler = self.controller.SelectedHandler
-        handle_output: pd.DataFrame | str | None = self.controller.handle_output
-
-        if handle_output is None or handle_output.empty:
-            messagebox.showwarning("No Results", "There are no results to download.")
-
-        if ask_user:
-            # Slow Save - Ask user for name and location
-            save_path = filedialog.asksaveasfilename(
-                defaultextension=".csv", filetypes=[("CSV Files", "*.csv")]
+        # Save every report processed in this run
+        saved_paths = []
+        for job in self.controller.completed_jobs:
+            process_handler: AbstractHandler = job.handler
+            handle_output: pd.DataFrame | None = process_handler.df_output
+
+            report_name = f"{job.template} ({job.practice})"
+            if handle_output is None or handle_output.empty:
+                messagebox.showwarning(
+                    "No Results", f"There are no {report_name} results to download."
+                )
+                continue
+
+            if ask_user:
+                # Slow Save - Ask user for name and location
+                save_path = filedialog.asksaveasfilename(
+                    title=f"Save {report_name}",
+                    defaultextension=".csv",
+                    filetypes=OUTPUT_FILE_TYPE_LIST,
+                )
+                if not save_path:
+                    continue
+            else:
+                # Quick Save - Datetime convention
+                save_path = None
+
+            process_handler.save_data(savepath=save_path)
+            saved_paths.append(save_path or process_handler.save_path)
+
+        if saved_paths:
+            show_saves = "\n".join(
+                f"{os.path.basename(path)} at {path}" for path in saved_paths
             )
-        else:
-            # Quick Save - Datetime convention
-            save_path = None
-
-        process_handler.save_data(savepath=save_path)
-
-        show_save = save_path or process_handler.save_path
-        show_save_name = show_save.split("/")[-1]
-        messagebox.showinfo(
-            "Download", f"File {show_save_name} successfully saved at {show_save}."
-        )
+            messagebox.showinfo("Download", f"Successfully saved:\n{show_saves}")
 
         # Clear screen and return home
         self._generate_another()
@@ -370,7 +515,22 @@ class DownloadPage(AbstractPage):
         self.controller.show_page(HomePage)
 
     def reset_defaults(self):
-        pass
+        # Show the run report of the handler that just finished, if any
+        if not hasattr(self, "run_report_label"):
+            return
+
+        completed_jobs = getattr(self.controller, "completed_jobs", [])
+        if len(completed_jobs) > 1:
+            report_text = "\n".join(
+                f"{job.template} ({job.practice}): {len(job.handler.df_output)} rows, "
+                f"{job.handler.run_report.total_wall_seconds:.1f}s"
+                for job in completed_jobs
+            )
+        else:
+            process_handler = getattr(self.controller, "SelectedHandler", None)
+            run_report = getattr(process_handler, "run_report", None)
+            report_text = "\n".join(run_report.summary_lines()) if run_report else ""
+        self.run_report_label.config(text=report_text)
 
 
 def main():
@@ -382,6 +542,8 @@ def main():
 
 
 if __name__ == "__main__":
+    # Worker processes of frozen (PyInstaller) builds start through this entry point
+    multiprocessing.freeze_support()
     main()
 
 
@@ -0,0 +1,110 @@
+"""Compare the per-row optometrist and date handling of Appointment reports against the vectorized stages.
+
+The legacy path looked up every 'Date' cell in the optometrist list with `apply`, and
+parsed the forward-filled dates twice (filtering, then `_add_features`). Extra synthetic
+optometrists show how each lookup scales with a longer `valid_optometrist_list`.
+
+```bash
+python benchmarks/bench_appointment.py --rows 500000
+python benchmarks/bench_appointment.py --rows 500000 --optometrists 0 100 1000
+```
+"""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_reports import make_raw_report
+
+from ExtractTomsForWati.appointment_handler import (
+    VALID_OPTOMETRIST_LIST,
+    AppointmentHandler,
+)
+
+
+def legacy_assign_and_filter(date_cells: pd.Series, optometrist_list: list[str]):
+    """The original `_assign_optometrist` apply, date filter and `_add_features` parse."""
+    optometrists = date_cells.apply(
+        lambda x: x if x in optometrist_list else float("nan")
+    ).ffill()
+
+    filled_dates = date_cells.ffill()
+    date_mask = pd.to_datetime(
+        filled_dates, format="%Y-%m-%d", errors="coerce"
+    ).notnull()
+    dates = pd.to_datetime(filled_dates[date_mask]).dt.date
+    return optometrists[date_mask], dates
+
+
+def vectorized_assign_and_filter(handler: AppointmentHandler, date_cells: pd.Series):
+    optometrists = handler._assign_optometrists(date_cells)
+    parsed_dates = handler._parse_dates(date_cells)
+    date_mask = parsed_dates.notna()
+    return optometrists[date_mask], parsed_dates[date_mask].dt.date
+
+
+def _best_of(function, repeat: int, *args) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument(
+        "--optometrists",
+        type=int,
+        nargs="+",
+        default=[0, 100],
+        help="Extra synthetic optometrists added to the valid list.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore", FutureWarning)  # Legacy object dtype ffill
+
+    df_raw = make_raw_report("appointment", args.rows)
+    date_cells = df_raw[0]
+    print(f"{args.rows:,} appointments, {len(df_raw):,} report rows")
+
+    print(f"{'optometrists':>12}{'legacy s':>10}{'vectorized s':>14}{'speedup':>9}")
+    for extra in args.optometrists:
+        optometrist_list = VALID_OPTOMETRIST_LIST + [
+            f"Optometrist {i}" for i in range(extra)
+        ]
+        handler = AppointmentHandler(valid_optometrist_list=optometrist_list)
+
+        legacy_seconds, legacy_result = _best_of(
+            legacy_assign_and_filter, args.repeat, date_cells, optometrist_list
+        )
+        vector_seconds, vector_result = _best_of(
+            vectorized_assign_and_filter, args.repeat, handler, date_cells
+        )
+        for legacy_column, vector_column in zip(legacy_result, vector_result):
+            pd.testing.assert_series_equal(
+                legacy_column, vector_column, check_dtype=False
+            )
+
+        print(
+            f"{len(optometrist_list):>12,}{legacy_seconds:>10.3f}{vector_seconds:>14.3f}"
+            f"{legacy_seconds / vector_seconds:>8.1f}x"
+        )
+
+    # The whole transform for context, e.g. phone validation dominates the rest
+    handler = AppointmentHandler(selected_practice="Pavilion", df_raw=df_raw)
+    handler.transform_data()
+    print(f"\ntransform_data, {len(handler.df_output):,} rows out:")
+    print("\n".join(handler.run_report.summary_lines()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Measure candidate pair counts and runtime of recipient de-duplication at several scales.
+
+```bash
+python benchmarks/bench_deduplicate.py --rows 10000 100000 1000000
+```
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ExtractTomsForWati._deduplicate import (
+    _get_blocking_frame,
+    deduplicate_recipients,
+    find_candidate_pairs,
+)
+
+
+def _random_words(rng: np.random.Generator, count: int, length: int) -> np.ndarray:
+    letters = rng.integers(ord("a"), ord("z") + 1, size=(count, length), dtype=np.uint8)
+    return np.char.capitalize(letters.view(f"S{length}").ravel().astype(str))
+
+
+def make_recipients(rows: int, duplicate_fraction: float = 0.1, seed: int = 0):
+    """Synthetic recipients where a fraction are re-entries with typos and other phone formats."""
+    rng = np.random.default_rng(seed)
+    first_names = _random_words(rng, 500, 6)
+    surnames = _random_words(rng, max(rows // 50, 100), 8)
+
+    unique_rows = int(rows * (1 - duplicate_fraction))
+    # TOMs names are "SURNAME FIRST"
+    names = np.char.add(
+        np.char.add(rng.choice(surnames, unique_rows), " "),
+        rng.choice(first_names, unique_rows),
+    )
+    cells = np.char.add("278", rng.integers(10**7, 10**8, unique_rows).astype(str))
+
+    # Duplicates: same person, name with a dropped letter, number in local format
+    source = rng.integers(0, unique_rows, rows - unique_rows)
+    duplicate_names = np.array([name[:3] + name[4:] for name in names[source]])
+    duplicate_cells = np.array(["0" + cell[2:] for cell in cells[source]])
+
+    return pd.DataFrame(
+        {
+            "CellCountry": np.concatenate([cells, duplicate_cells]),
+            "Name": np.concatenate([names, duplicate_names]),
+        }
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}{'pairs':>12}{'pairs/row':>11}{'removed':>10}{'seconds':>10}")
+    for rows in args.rows:
+        df = make_recipients(rows)
+
+        blocking_df = _get_blocking_frame(df, "CellCountry", "Name", "Birthday")
+        pair_count = len(find_candidate_pairs(blocking_df))
+
+        start = time.perf_counter()
+        deduplicated = deduplicate_recipients(df)
+        elapsed = time.perf_counter() - start
+
+        print(
+            f"{rows:>10,}{pair_count:>12,}{pair_count / rows:>11.2f}"
+            f"{rows - len(deduplicated):>10,}{elapsed:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
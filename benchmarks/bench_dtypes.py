@@ -0,0 +1,132 @@
+"""Compare the memory of handler outputs with object columns against the compact dtypes.
+
+Handlers used to emit every text column as object, with a Python string per cell (the
+same practice string included) and Python `date` objects for Appointment and Recall
+dates. Each handler runs on a large in-memory synthetic report, and its output is
+compared column by column with the same output converted back to those dtypes. The
+batch rows combine the output of several practices, as a multi-practice run does.
+
+```bash
+python benchmarks/bench_dtypes.py --rows 200000
+python benchmarks/bench_dtypes.py --rows 1000000 --practices 4 --columns
+```
+"""
+
+import argparse
+import os
+import sys
+from datetime import date
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_reports import make_raw_report
+
+from ExtractTomsForWati._dtypes import to_compact_dtypes
+from ExtractTomsForWati.appointment_handler import AppointmentHandler
+from ExtractTomsForWati.birthday_handler import BirthdayHandler
+from ExtractTomsForWati.recall_handler import RecallHandler
+
+### Constants and Defaults ###
+PRACTICE_LIST = ["Pavilion", "La Lucia", "Gateway", "Westville", "Ballito"]
+
+# The synthetic exam history ends in 2025, so recalls fall due throughout 2026
+HANDLER_REPORT_DICT = {
+    AppointmentHandler: ("appointment", {}),
+    BirthdayHandler: ("birthday", {}),
+    RecallHandler: (
+        "recall",
+        {"recall_window_start": date(2026, 1, 1), "recall_window_days": 365},
+    ),
+}
+
+# Columns the handlers used to output as Python `date` objects
+LEGACY_DATE_COLUMN_LIST = ["Date", "LastExam", "DueDate"]
+
+
+def to_legacy_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """The output as it was before compact dtypes: object text and `date` columns."""
+    legacy_dict = {}
+    for column, dtype in df.dtypes.items():
+        if column in LEGACY_DATE_COLUMN_LIST:
+            legacy_dict[column] = df[column].dt.date
+        elif isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype)):
+            legacy_dict[column] = df[column].astype(object)
+        elif column == "Age":
+            legacy_dict[column] = df[column].astype("int64")
+    return df.assign(**legacy_dict)
+
+
+def _megabytes(memory_bytes: int) -> str:
+    return f"{memory_bytes / 2**20:.1f}"
+
+
+def _print_row(label: str, rows: int, legacy_bytes: int, compact_bytes: int):
+    print(
+        f"{label:<24}{rows:>10,}{_megabytes(legacy_bytes):>12}"
+        f"{_megabytes(compact_bytes):>12}{legacy_bytes / compact_bytes:>8.1f}x"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument(
+        "--practices",
+        type=int,
+        default=3,
+        help="Practices combined in the batch rows, at most 5.",
+    )
+    parser.add_argument(
+        "--columns", action="store_true", help="Also print a per-column breakdown."
+    )
+    args = parser.parse_args()
+    practice_list = PRACTICE_LIST[: args.practices]
+
+    print(f"{'output':<24}{'rows':>10}{'object MB':>12}{'compact MB':>12}{'saved':>9}")
+    column_reports = []
+    for handler_class, (report, handler_kwargs) in HANDLER_REPORT_DICT.items():
+        df_raw = make_raw_report(report, args.rows)
+
+        outputs = []
+        for practice in practice_list:
+            handler = handler_class(
+                selected_practice=practice, df_raw=df_raw, **handler_kwargs
+            )
+            outputs.append(handler.transform_data())
+
+        for label, df_compact in [
+            (str(handler), outputs[0]),
+            (
+                f"{handler} x {len(outputs)} practices",
+                to_compact_dtypes(pd.concat(outputs, ignore_index=True)),
+            ),
+        ]:
+            legacy_memory = to_legacy_dtypes(df_compact).memory_usage(deep=True)
+            compact_memory = df_compact.memory_usage(deep=True)
+            _print_row(
+                label, len(df_compact), legacy_memory.sum(), compact_memory.sum()
+            )
+        column_reports.append((str(handler), legacy_memory, compact_memory))
+
+    if not args.columns:
+        return
+
+    for handler_name, legacy_memory, compact_memory in column_reports:
+        print(f"\n{handler_name} batch, MB per column:")
+        print(
+            pd.DataFrame(
+                {
+                    "object": legacy_memory / 2**20,
+                    "compact": compact_memory / 2**20,
+                }
+            )
+            .drop(index="Index")
+            .round(2)
+            .to_string()
+        )
+
+
+if __name__ == "__main__":
+    main()
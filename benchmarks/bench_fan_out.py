@@ -0,0 +1,99 @@
+"""Time a month of reports split over workbooks and sheets, one run per sheet against one fan-out run.
+
+Each synthetic workbook stands for a branch and each of its sheets for part of the
+month, as TOMs splits long date ranges. The sequential rows load and process every
+sheet as its own run, the fan-out row runs `load_and_process_sources` over every
+workbook, cleaning the sheets in parallel worker processes.
+
+```bash
+python benchmarks/bench_fan_out.py --workbooks 4 --sheets 4 --rows 20000
+python benchmarks/bench_fan_out.py --report recall --workers 2
+```
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openpyxl import Workbook
+from synthetic_reports import REPORT_ROWS_DICT
+
+from ExtractTomsForWati.appointment_handler import AppointmentHandler
+from ExtractTomsForWati.birthday_handler import BirthdayHandler
+from ExtractTomsForWati.recall_handler import RecallHandler
+
+### Constants and Defaults ###
+REPORT_HANDLER_DICT = {
+    "appointment": (AppointmentHandler, {}),
+    "birthday": (BirthdayHandler, {}),
+    "recall": (
+        RecallHandler,
+        {"recall_window_start": date(2026, 1, 1), "recall_window_days": 365},
+    ),
+}
+
+
+def write_workbook(report: str, filepath: str, n_sheets: int, n_rows: int, seed: int):
+    """A workbook of `n_sheets` reports, each with `n_rows` rows and its own seed."""
+    workbook = Workbook(write_only=True)
+    for sheet_number in range(n_sheets):
+        sheet = workbook.create_sheet(f"Part {sheet_number + 1}")
+        rows = REPORT_ROWS_DICT[report](n_rows, seed=seed * n_sheets + sheet_number)
+        for row in rows:
+            sheet.append(row)
+    workbook.save(filepath)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--report", choices=REPORT_HANDLER_DICT, default="appointment")
+    parser.add_argument("--workbooks", type=int, default=4)
+    parser.add_argument("--sheets", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=20_000, help="Rows per sheet.")
+    parser.add_argument("--workers", type=int, help="Default: available cores.")
+    args = parser.parse_args()
+    handler_class, handler_kwargs = REPORT_HANDLER_DICT[args.report]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_paths = []
+        for workbook_number in range(args.workbooks):
+            file_path = os.path.join(temp_dir, f"branch_{workbook_number + 1}.xlsx")
+            write_workbook(
+                args.report, file_path, args.sheets, args.rows, workbook_number
+            )
+            file_paths.append(file_path)
+        print(f"{args.workbooks} workbooks x {args.sheets} sheets x {args.rows:,} rows")
+
+        start = time.perf_counter()
+        sequential_rows = 0
+        for file_path in file_paths:
+            for sheet_number in range(args.sheets):
+                handler = handler_class(
+                    selected_practice="Pavilion", sheet=sheet_number, **handler_kwargs
+                )
+                sequential_rows += len(handler.load_and_process(file_path))
+        sequential_seconds = time.perf_counter() - start
+        print(
+            f"{'one run per sheet':<20}{sequential_seconds:>9.2f}s"
+            f"{sequential_rows:>10,} rows"
+        )
+
+        start = time.perf_counter()
+        handler = handler_class(selected_practice="Pavilion", **handler_kwargs)
+        df_output = handler.load_and_process_sources(
+            file_paths, max_workers=args.workers
+        )
+        fan_out_seconds = time.perf_counter() - start
+        print(
+            f"{'fan-out run':<20}{fan_out_seconds:>9.2f}s{len(df_output):>10,} rows"
+            f"{sequential_seconds / fan_out_seconds:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""Benchmark `load_and_process` of every handler on synthetic reports at several scales.
+
+Each run happens in a fresh subprocess, so peak RSS is measured in isolation. Results
+are appended to a JSON lines history (one line per handler and scale, tagged with the
+package version and git commit), and every result is compared with the previous
+entry for the same handler and scale, so regressions between releases are reported.
+
+```bash
+python benchmarks/bench_handlers.py --sizes 1000 10000 100000 --repeat 3
+python benchmarks/bench_handlers.py --sizes 10000 --no-history --fail-on-regression
+```
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tomllib
+from datetime import datetime
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, REPO_DIR)
+
+from synthetic_reports import GENERATOR_VERSION, REPORT_WRITER_DICT
+
+### Constants and Defaults ###
+DEFAULT_SIZE_LIST = [1_000, 10_000, 100_000]
+DEFAULT_HISTORY_PATH = os.path.join(BENCHMARK_DIR, "results", "bench_handlers.jsonl")
+DEFAULT_WORK_DIR = os.path.join(tempfile.gettempdir(), "classiceyes_benchmarks")
+DEFAULT_REGRESSION_THRESHOLD = 0.2  # Relative slowdown or memory growth
+
+HANDLER_REPORT_DICT = {
+    "AppointmentHandler": "appointment",
+    "BirthdayHandler": "birthday",
+    "RecallHandler": "recall",
+}
+
+
+def _peak_rss_bytes() -> int:
+    """Return the peak resident set size of the current process in bytes."""
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        import psutil  # Windows
+
+        return psutil.Process().memory_info().peak_wset
+
+
+def _get_report_path(work_dir: str, report: str, size: int, seed: int) -> str:
+    """Return the synthetic report for `size` rows, generating it on first use."""
+    filepath = os.path.join(
+        work_dir, f"{report}_{size}_seed{seed}_v{GENERATOR_VERSION}.xlsx"
+    )
+    if not os.path.exists(filepath):
+        os.makedirs(work_dir, exist_ok=True)
+        REPORT_WRITER_DICT[report](filepath + ".tmp", size, seed=seed)
+        os.replace(filepath + ".tmp", filepath)
+    return filepath
+
+
+def _get_release_info() -> dict:
+    with open(os.path.join(REPO_DIR, "pyproject.toml"), "rb") as file:
+        version = tomllib.load(file)["project"]["version"]
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {"version": version, "commit": commit}
+
+
+def _run_child(handler_name: str, filepath: str, track_memory: bool):
+    import warnings
+
+    import ExtractTomsForWati
+
+    warnings.simplefilter("ignore")  # openpyxl style warnings
+    handler = getattr(ExtractTomsForWati, handler_name)(
+        selected_practice="Benchmark", track_memory=track_memory
+    )
+
+    baseline_rss = _peak_rss_bytes()
+    start = time.perf_counter()
+    df_output = handler.load_and_process(filepath)
+    elapsed = time.perf_counter() - start
+
+    run_report = handler.run_report
+    result = {
+        "seconds": elapsed,
+        "stage_seconds": {
+            stage.name: stage.wall_seconds
+            for stage in run_report.stages
+            if stage.parent is None
+        },
+        "peak_rss_mb": _peak_rss_bytes() / 2**20,
+        "run_rss_mb": (_peak_rss_bytes() - baseline_rss) / 2**20,
+        "traced_peak_mb": (
+            handler.peak_memory_bytes / 2**20 if handler.peak_memory_bytes else None
+        ),
+        "rows_in": run_report.get_stage("load_dataframe").rows_out,
+        "rows_out": len(df_output),
+    }
+    print(json.dumps(result))
+
+
+def _run_in_subprocess(handler_name: str, filepath: str, track_memory: bool) -> dict:
+    command = [sys.executable, __file__, "--child", handler_name, filepath]
+    if track_memory:
+        command.append("--track-memory")
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def benchmark_handler(
+    handler_name: str, filepath: str, size: int, repeat: int = 3
+) -> dict:
+    """Best of `repeat` timed runs, plus one run with tracemalloc for the traced peak."""
+    runs = [
+        _run_in_subprocess(handler_name, filepath, track_memory=False)
+        for _ in range(repeat)
+    ]
+    best = min(runs, key=lambda run: run["seconds"])
+    traced = _run_in_subprocess(handler_name, filepath, track_memory=True)
+
+    return {
+        "handler": handler_name,
+        "size": size,
+        "seconds": best["seconds"],
+        "stage_seconds": best["stage_seconds"],
+        "peak_rss_mb": max(run["peak_rss_mb"] for run in runs),
+        "run_rss_mb": max(run["run_rss_mb"] for run in runs),
+        "traced_peak_mb": traced["traced_peak_mb"],
+        "rows_in": best["rows_in"],
+        "rows_out": best["rows_out"],
+    }
+
+
+# * ---------------------
+# * History methods
+# * ---------------------
+def load_history(history_path: str) -> list[dict]:
+    if not os.path.exists(history_path):
+        return []
+    with open(history_path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def find_regressions(
+    result: dict, history: list[dict], threshold: float = DEFAULT_REGRESSION_THRESHOLD
+) -> list[str]:
+    """Compare `result` with the latest history entry for the same handler and size."""
+    previous = next(
+        (
+            entry
+            for entry in reversed(history)
+            if entry["handler"] == result["handler"] and entry["size"] == result["size"]
+        ),
+        None,
+    )
+    if previous is None:
+        return []
+
+    since = " ".join(filter(None, [previous.get("version"), previous.get("commit")]))
+    regressions = []
+    for metric in ["seconds", "run_rss_mb", "traced_peak_mb"]:
+        old_value, new_value = previous.get(metric), result.get(metric)
+        if old_value and new_value and new_value > old_value * (1 + threshold):
+            regressions.append(
+                f"{result['handler']} @ {result['size']:,}: {metric} "
+                f"{old_value:.2f} -> {new_value:.2f} "
+                f"(+{new_value / old_value - 1:.0%} since {since})"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZE_LIST)
+    parser.add_argument(
+        "--handlers",
+        nargs="+",
+        choices=HANDLER_REPORT_DICT,
+        default=list(HANDLER_REPORT_DICT),
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work-dir", default=DEFAULT_WORK_DIR)
+    parser.add_argument("--history", default=DEFAULT_HISTORY_PATH)
+    parser.add_argument("--no-history", action="store_true", help="Do not append.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    parser.add_argument("--track-memory", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _run_child(*args.child, track_memory=args.track_memory)
+        return
+
+    history = load_history(args.history)
+    run_info = {
+        **_get_release_info(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+    }
+
+    print(
+        f"{'handler':<20}{'size':>9}{'best s':>9}{'rows/s':>10}"
+        f"{'run RSS MB':>12}{'traced MB':>11}{'rows out':>10}"
+    )
+    results, regressions = [], []
+    for handler_name in args.handlers:
+        for size in args.sizes:
+            filepath = _get_report_path(
+                args.work_dir, HANDLER_REPORT_DICT[handler_name], size, args.seed
+            )
+            result = {
+                **run_info,
+                **benchmark_handler(handler_name, filepath, size, args.repeat),
+            }
+            results.append(result)
+            regressions += find_regressions(result, history, args.threshold)
+
+            print(
+                f"{handler_name:<20}{size:>9,}{result['seconds']:>9.2f}"
+                f"{result['rows_in'] / result['seconds']:>10,.0f}"
+                f"{result['run_rss_mb']:>12.1f}{result['traced_peak_mb']:>11.1f}"
+                f"{result['rows_out']:>10,}"
+            )
+
+    if not args.no_history:
+        os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+        with open(args.history, "a", encoding="utf-8") as file:
+            for result in results:
+                file.write(json.dumps(result) + "\n")
+
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
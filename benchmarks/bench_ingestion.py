@@ -0,0 +1,98 @@
+"""Compare the original `pd.read_excel` load path against the streaming readers.
+
+Each reader runs in a fresh subprocess so that its peak RSS is measured in isolation.
+
+```bash
+python benchmarks/bench_ingestion.py path/to/TOMs_report.xlsx --repeat 3
+```
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _peak_rss_bytes() -> int:
+    """Return the peak resident set size of the current process in bytes."""
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        import psutil  # Windows
+
+        return psutil.Process().memory_info().peak_wset
+
+
+def _run_child(reader_name: str, filepath: str):
+    import pandas as pd
+
+    from ExtractTomsForWati._readers import (
+        PandasReader,
+        get_reader_class,
+    )
+
+    baseline_rss = _peak_rss_bytes()
+    start = time.perf_counter()
+
+    if reader_name == "read_excel":
+        # The original `_load_file` path
+        df = pd.read_excel(filepath, header=None)
+    else:
+        reader_class = get_reader_class(filepath)
+        if reader_class is PandasReader:
+            raise ValueError(f"No streaming reader registered for '{filepath}'.")
+        df = reader_class().read(filepath)
+
+    elapsed = time.perf_counter() - start
+    result = {
+        "reader": reader_name,
+        "seconds": elapsed,
+        "peak_rss_mb": _peak_rss_bytes() / 2**20,
+        "load_rss_mb": (_peak_rss_bytes() - baseline_rss) / 2**20,
+        "rows": len(df),
+        "frame_mb": df.memory_usage(deep=True).sum() / 2**20,
+    }
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("filepath", help="TOMs report (.xls or .xlsx) to load.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _run_child(args.child, args.filepath)
+        return
+
+    print(
+        f"{'reader':<12}{'best s':>10}{'peak RSS MB':>14}{'load RSS MB':>14}{'rows':>10}{'frame MB':>10}"
+    )
+    for reader_name in ["read_excel", "streaming"]:
+        runs = []
+        for _ in range(args.repeat):
+            output = subprocess.run(
+                [sys.executable, __file__, args.filepath, "--child", reader_name],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            runs.append(json.loads(output.strip().splitlines()[-1]))
+
+        best = min(runs, key=lambda run: run["seconds"])
+        print(
+            f"{reader_name:<12}{best['seconds']:>10.3f}{best['peak_rss_mb']:>14.1f}"
+            f"{best['load_rss_mb']:>14.1f}{best['rows']:>10}{best['frame_mb']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Compare the per-row phone validation lambdas against the vectorized `_phone` module.
+
+```bash
+python benchmarks/bench_phone.py --rows 1000000
+```
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ExtractTomsForWati._phone import STRING_DTYPE, to_country_cell_numbers
+
+
+def make_contacts(rows: int, seed: int = 0) -> pd.Series:
+    """Synthetic contact column mixing valid, placeholder, short and missing numbers."""
+    rng = np.random.default_rng(seed)
+    numbers = rng.integers(600_000_000, 850_000_000, size=rows).astype(str)
+    contacts = np.char.add("0", numbers).astype(object)
+
+    kinds = rng.integers(0, 10, size=rows)
+    contacts[kinds == 0] = "0000000000"
+    contacts[kinds == 1] = np.nan
+    contacts[kinds == 2] = np.char.add("08", numbers[kinds == 2])  # too long
+    contacts[kinds == 3] = numbers[kinds == 3].astype(int)  # leading zero lost
+    return pd.Series(contacts, dtype=object)
+
+
+def legacy_validate(contacts: pd.Series) -> pd.Series:
+    """The original `_get_valid_phone_indices` and `_add_features` logic."""
+    has_content_mask = contacts.notna() & (contacts != "")
+    valid_len_mask = contacts.apply(lambda x: len(str(x)) >= 10)
+    valid_start_mask = contacts.apply(lambda x: str(x).startswith("0"))
+    not_zeros_mask = contacts != "0000000000"
+    valid = contacts[
+        has_content_mask & valid_len_mask & valid_start_mask & not_zeros_mask
+    ]
+
+    cell_country = "27" + valid.apply(lambda x: str(x)[1:])
+    valid_country_cell_mask = cell_country.apply(lambda x: len(x) == 11 and x.isdigit())
+    return cell_country[valid_country_cell_mask]
+
+
+def vectorized_validate(contacts: pd.Series) -> pd.Series:
+    cell_country = to_country_cell_numbers(contacts)
+    return cell_country[cell_country.notna()]
+
+
+def _time(function, contacts: pd.Series, repeat: int) -> tuple[float, int]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(contacts)
+        best = min(best, time.perf_counter() - start)
+    return best, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    contacts = make_contacts(args.rows)
+    print(f"{args.rows:,} contacts, string dtype: {STRING_DTYPE.storage}")
+
+    legacy_seconds, legacy_rows = _time(legacy_validate, contacts, args.repeat)
+    vector_seconds, vector_rows = _time(vectorized_validate, contacts, args.repeat)
+
+    print(f"{'legacy apply':<16}{legacy_seconds:>8.3f} s {legacy_rows:>10,} valid")
+    print(f"{'vectorized':<16}{vector_seconds:>8.3f} s {vector_rows:>10,} valid")
+    print(f"speedup: {legacy_seconds / vector_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
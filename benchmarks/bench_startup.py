@@ -0,0 +1,141 @@
+"""Measure the GUI's cold-start cost: importing `app` and, with a display, showing its window.
+
+Each measurement runs in a fresh interpreter. `lazy` is the app as shipped, `eager`
+additionally imports pandas and the handler modules up front, which is what `app.py`
+used to do before its window could appear.
+
+```bash
+python benchmarks/bench_startup.py --repeat 5
+python benchmarks/bench_startup.py --window --importtime 15
+```
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+EAGER_IMPORT_LIST = [
+    "pandas",
+    "ExtractTomsForWati.appointment_handler",
+    "ExtractTomsForWati.birthday_handler",
+    "ExtractTomsForWati.recall_handler",
+]
+
+
+def _run_child(mode: str, window: bool):
+    import importlib
+
+    start = time.perf_counter()
+    import app
+
+    if mode == "eager":
+        for module_name in EAGER_IMPORT_LIST:
+            importlib.import_module(module_name)
+    import_seconds = time.perf_counter() - start
+
+    window_seconds = None
+    if window:
+        application = app.Application(
+            application_page_list=[app.HomePage, app.LoadingPage, app.DownloadPage]
+        )
+        application.update()  # The window has been drawn
+        window_seconds = time.perf_counter() - start
+        application.job_engine.shutdown()
+        application.destroy()
+
+    print(
+        json.dumps(
+            {
+                "import_seconds": import_seconds,
+                "window_seconds": window_seconds,
+                "pandas_imported": "pandas" in sys.modules,
+            }
+        )
+    )
+
+
+def _measure(mode: str, window: bool) -> dict:
+    command = [sys.executable, __file__, "--child", mode]
+    if window:
+        command.append("--window")
+
+    start = time.perf_counter()
+    output = subprocess.run(
+        command, cwd=REPO_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+
+    # Includes interpreter start-up, i.e. what the user waits for after a double click
+    result["process_seconds"] = time.perf_counter() - start
+    return result
+
+
+def _print_importtime(top: int):
+    """Print the slowest modules (cumulative) imported by `import app`."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=REPO_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module_name = line.removeprefix("import time:").split(
+            "|"
+        )
+        modules.append((int(cumulative_us), int(self_us), module_name.rstrip()))
+
+    print(f"\n{'cumulative ms':>14}{'self ms':>10}  module (import app)")
+    for cumulative_us, self_us, module_name in sorted(modules, reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>14.1f}{self_us / 1000:>10.1f}  {module_name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--window", action="store_true", help="Also time the first drawn window."
+    )
+    parser.add_argument(
+        "--importtime", type=int, metavar="N", help="Show the N slowest imports."
+    )
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, REPO_DIR)
+        _run_child(args.child, args.window)
+        return
+
+    print(
+        f"{'mode':<8}{'import s':>10}{'window s':>10}{'process s':>11}  pandas at start"
+    )
+    for mode in ["eager", "lazy"]:
+        runs = [_measure(mode, args.window) for _ in range(args.repeat)]
+        window_runs = [run["window_seconds"] for run in runs if run["window_seconds"]]
+        window_text = (
+            f"{statistics.median(window_runs):>10.3f}" if window_runs else f"{'-':>10}"
+        )
+        print(
+            f"{mode:<8}{statistics.median(run['import_seconds'] for run in runs):>10.3f}"
+            f"{window_text}"
+            f"{statistics.median(run['process_seconds'] for run in runs):>11.3f}"
+            f"  {runs[0]['pandas_imported']}"
+        )
+
+    if args.importtime:
+        _print_importtime(args.importtime)
+
+
+if __name__ == "__main__":
+    main()
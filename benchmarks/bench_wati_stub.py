@@ -0,0 +1,144 @@
+"""Measure `WatiConnector` throughput and backpressure against a local stub Wati API.
+
+The stub answers `sendTemplateMessages` after `--latency-ms`, rejects every
+`--throttle-every`-th request with HTTP 429 and records the peak number of
+concurrent requests it saw.
+
+```bash
+python benchmarks/bench_wati_stub.py --recipients 20000 --concurrency 8 --rps 50
+```
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ExtractTomsForWati import WatiConnector
+
+
+class StubWatiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency_seconds: float, throttle_every: int):
+        super().__init__(("127.0.0.1", 0), _StubWatiRequestHandler)
+        self.latency_seconds = latency_seconds
+        self.throttle_every = throttle_every
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.connections = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+
+class _StubWatiRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+            throttle = (
+                server.throttle_every and server.requests % server.throttle_every == 0
+            )
+            server.throttled += bool(throttle)
+
+        time.sleep(server.latency_seconds)
+
+        if throttle:
+            status, headers, response = 429, {"Retry-After": "0"}, {"result": False}
+        else:
+            status, headers = 200, {}
+            response = {
+                "result": True,
+                "receivers": [
+                    {
+                        "waId": receiver["whatsappNumber"],
+                        "isValidWhatsAppNumber": True,
+                        "errors": [],
+                    }
+                    for receiver in body["receivers"]
+                ],
+            }
+
+        payload = json.dumps(response).encode("utf-8")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+        with server.lock:
+            server.in_flight -= 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recipients", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rps", type=float, default=20.0)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--throttle-every", type=int, default=10)
+    args = parser.parse_args()
+
+    server = StubWatiServer(args.latency_ms / 1000, args.throttle_every)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    df = pd.DataFrame(
+        {
+            "CellCountry": [f"2782{i:07d}" for i in range(args.recipients)],
+            "Name": [f"Patient {i}" for i in range(args.recipients)],
+        }
+    )
+    connector = WatiConnector(
+        api_endpoint=f"http://127.0.0.1:{server.server_address[1]}/stub",
+        access_token="stub-token",
+        template_name="benchmark",
+        batch_size=args.batch_size,
+        max_concurrency=args.concurrency,
+        requests_per_second=args.rps,
+        backoff_seconds=0.05,
+    )
+
+    start = time.perf_counter()
+    results = connector.send_dataframe(df)
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    print(f"recipients sent:   {results['sent'].sum():,} / {len(results):,}")
+    print(
+        f"elapsed:           {elapsed:.2f} s ({len(results) / elapsed:,.0f} recipients/s)"
+    )
+    print(
+        f"requests:          {server.requests} ({server.throttled} throttled with 429)"
+    )
+    print(f"connections:       {server.connections} (pool size {args.concurrency})")
+    print(f"peak in flight:    {server.peak_in_flight} (limit {args.concurrency})")
+    print(f"request rate:      {server.requests / elapsed:.1f}/s (limit {args.rps}/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Time and trace the peak memory of saving a large handler output in every format.
+
+The `to_csv (one shot)` row is the original save path. Writers format one chunk at a
+time into a temporary file (see `ExtractTomsForWati/_writers.py`), so peak memory stays
+flat as outputs grow. Each save runs twice, timed and then traced, as tracing
+allocations slows Python-level formatting (e.g. XLSX) many times over.
+
+```bash
+python benchmarks/bench_writers.py --rows 500000
+python benchmarks/bench_writers.py --rows 500000 --formats .csv .parquet
+```
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_reports import make_raw_report
+
+from ExtractTomsForWati._writers import WRITER_CLASS_DICT
+from ExtractTomsForWati.appointment_handler import AppointmentHandler
+
+
+def _measure(function) -> tuple[float, int]:
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    function()
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        default=list(WRITER_CLASS_DICT),
+        choices=list(WRITER_CLASS_DICT),
+    )
+    args = parser.parse_args()
+
+    handler = AppointmentHandler(
+        selected_practice="Pavilion", df_raw=make_raw_report("appointment", args.rows)
+    )
+    df_output = handler.transform_data()
+    print(f"{len(df_output):,} output rows")
+
+    print(f"{'format':<22}{'seconds':>9}{'peak MB':>10}{'file MB':>10}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        save_path = os.path.join(temp_dir, "one_shot.csv")
+        seconds, peak_bytes = _measure(lambda: df_output.to_csv(save_path, index=False))
+        file_bytes = os.path.getsize(save_path)
+        print(
+            f"{'to_csv (one shot)':<22}{seconds:>9.2f}{peak_bytes / 2**20:>10.1f}"
+            f"{file_bytes / 2**20:>10.1f}"
+        )
+
+        for file_type in args.formats:
+            save_path = os.path.join(temp_dir, f"output{file_type}")
+            writer = WRITER_CLASS_DICT[file_type]()
+            try:
+                seconds, peak_bytes = _measure(
+                    lambda: writer.write(df_output, save_path)
+                )
+            except ValueError as err:  # e.g. too many rows for Excel
+                print(f"{file_type:<22}{err}")
+                continue
+            file_bytes = os.path.getsize(save_path)
+            print(
+                f"{file_type:<22}{seconds:>9.2f}{peak_bytes / 2**20:>10.1f}"
+                f"{file_bytes / 2**20:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
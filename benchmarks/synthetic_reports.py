@@ -0,0 +1,324 @@
+"""Generate synthetic TOMs Appointment, Birthday and Recall report workbooks of any size.
+
+The workbooks mimic the layout of real TOMs exports (report header rows, sparse
+columns, optometrist group rows, junk category rows, page footers and multi-row
+contact blocks) without containing any patient data, so they can be committed,
+shared and used for benchmarks.
+
+```bash
+python benchmarks/synthetic_reports.py appointment 100000 appointments.xlsx
+python benchmarks/synthetic_reports.py birthday 100000 birthdays.xlsx --seed 7
+python benchmarks/synthetic_reports.py recall 1000000 exam_history.xlsx
+```
+"""
+
+import argparse
+import os
+import random
+import sys
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from functools import partial
+
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ExtractTomsForWati.appointment_handler import (
+    REMOVE_ROWS_WITH_KEYWORDS,
+    VALID_OPTOMETRIST_LIST,
+)
+from ExtractTomsForWati.recall_handler import RECALL_INTERVAL_MONTHS_DICT
+
+### Constants and Defaults ###
+# Bump when the generated layout changes, so cached benchmark workbooks are rebuilt
+GENERATOR_VERSION = "1"
+ROWS_PER_PAGE = 45
+
+FIRST_NAME_LIST = [
+    "Thabo", "Ayesha", "Johan", "Priya", "Sipho", "Fatima", "Pieter", "Nomvula",
+    "Rajesh", "Lerato", "Willem", "Zanele", "Ahmed", "Karen", "Mandla", "Anika",
+]  # fmt: skip
+SURNAME_LIST = [
+    "Naidoo", "Dlamini", "van der Merwe", "Pillay", "Khumalo", "Botha", "Moodley",
+    "Nkosi", "Govender", "Smith", "Mokoena", "Pretorius", "Ndlovu", "Singh",
+]  # fmt: skip
+TITLE_LIST = ["Mr", "Mrs", "Ms", "Miss", "Dr"]
+MEDICAL_AID_LIST = ["Discovery", "Bonitas", "GEMS", "Momentum", "Private", None]
+
+# Real exports mix formatting styles, and contain placeholders and landlines
+CELL_FORMAT_LIST = ["0{}", "0{} ", "+27{}", "27{}", "{}", "0{}.0"]
+PLACEHOLDER_CELL_LIST = ["0000000000", "0111111111", "0123456789", "-", "None"]
+
+
+def _random_name(rnd: random.Random) -> str:
+    return f"{rnd.choice(SURNAME_LIST)} {rnd.choice(FIRST_NAME_LIST)}".upper()
+
+
+def _random_cell(rnd: random.Random, invalid_rate: float) -> str | int | None:
+    """A cell number in one of the formats seen in TOMs, or an invalid one."""
+    if rnd.random() < invalid_rate:
+        return rnd.choice(
+            PLACEHOLDER_CELL_LIST + [None, f"031{rnd.randint(0, 9999999):07d}"]
+        )
+
+    national = f"{rnd.choice([6, 7, 8])}{rnd.randint(0, 99_999_999):08d}"
+    if rnd.random() < 0.1:
+        national = f"{national[:2]} {national[2:5]} {national[5:]}"
+    if rnd.random() < 0.1:
+        return int(national.replace(" ", ""))  # Stored as a number in Excel
+    return rnd.choice(CELL_FORMAT_LIST).format(national)
+
+
+def _random_contact(rnd: random.Random, contact_type: str, invalid_rate: float):
+    if contact_type == "Cell":
+        return _random_cell(rnd, invalid_rate)
+    if contact_type == "EMail":
+        return "patient@example.com"
+    return f"0{rnd.randint(10, 59)}{rnd.randint(0, 9_999_999):07d}"
+
+
+def _page_footer(page: int) -> list:
+    return [f"Page {page} of ?"]
+
+
+# * ---------------------
+# * Appointment report
+# * ---------------------
+def iter_appointment_rows(
+    n_appointments: int,
+    seed: int = 0,
+    start_date: datetime = datetime(2025, 1, 6),
+    junk_rate: float = 0.15,
+    invalid_cell_rate: float = 0.2,
+) -> Iterator[list]:
+    """Yield the worksheet rows of an Appointment report with `n_appointments` patient rows."""
+    rnd = random.Random(seed)
+
+    # Report header rows, each followed by a blank row
+    end_date = start_date + timedelta(days=max(n_appointments // 40, 1))
+    for header in [
+        "Classic Eyes Optometrists",
+        "Appointment List",
+        f"From: {start_date:%Y/%m/%d}",
+        f"To: {end_date:%Y/%m/%d}",
+        f"Printed: {datetime.now():%Y/%m/%d %H:%M}",
+        "Branch: All",
+    ]:
+        yield [header]
+        yield []
+
+    # Data columns are spread out with empty columns between them
+    # fmt: off
+    yield ["Date", "Time", None, "Name", None, "PatientNo", "Home", "Work", None,
+           "Cell", "Medical Aid", None, "Plan", "Number"]
+    # fmt: on
+
+    rows_on_page, page, written = 0, 1, 0
+    appointment_date = start_date
+    while written < n_appointments:
+        # One group per optometrist per day, junk category groups in between
+        if rnd.random() < junk_rate:
+            yield [rnd.choice(REMOVE_ROWS_WITH_KEYWORDS)]
+            yield []
+            rows_on_page += 2
+
+        yield [rnd.choice(VALID_OPTOMETRIST_LIST)]
+        rows_on_page += 1
+
+        for slot in range(rnd.randint(1, 12)):
+            if written == n_appointments:
+                break
+            time = f"{8 + slot // 2:02d}:{30 * (slot % 2):02d}"
+            # fmt: off
+            yield [
+                appointment_date if slot == 0 else None, time, None,
+                _random_name(rnd), None, 100_000 + written,
+                f"031{rnd.randint(0, 9_999_999):07d}" if rnd.random() < 0.4 else None,
+                None, None, _random_cell(rnd, invalid_cell_rate),
+                rnd.choice(MEDICAL_AID_LIST), None, "Core", str(rnd.randint(1, 999_999)),
+            ]
+            # fmt: on
+            written += 1
+            rows_on_page += 1
+
+        # Page breaks fall between groups, TOMs repeats nothing across them
+        if rows_on_page >= ROWS_PER_PAGE:
+            yield []
+            yield _page_footer(page)
+            rows_on_page, page = 0, page + 1
+
+        if rnd.random() < 0.3:
+            appointment_date += timedelta(days=1)
+
+    yield []
+    yield _page_footer(page)
+
+
+# * ---------------------
+# * Birthday report
+# * ---------------------
+def iter_birthday_rows(
+    n_patients: int,
+    seed: int = 0,
+    invalid_cell_rate: float = 0.2,
+) -> Iterator[list]:
+    """Yield the worksheet rows of a Birthday report with `n_patients` multi-row records."""
+    rnd = random.Random(seed)
+
+    for header in [
+        "Classic Eyes Optometrists",
+        "Patient Birthday List",
+        f"Month: {datetime.now():%B}",
+        f"Printed: {datetime.now():%Y/%m/%d %H:%M}",
+    ]:
+        yield [header]
+
+    # Two row column headings, e.g. "Home" above "Address"
+    yield ["Birthday", None, "Home", "Postal", "Work", None, None, "Contact No."]
+    yield [None, None, " Address", " Address", " Address", None, None, None]
+
+    rows_on_page, page = 0, 1
+    for _ in range(n_patients):
+        birthday = datetime(1940, 1, 1) + timedelta(days=rnd.randint(0, 30_000))
+
+        # Every patient has a cell number row, plus a random selection of others
+        contact_types = ["Cell"] + rnd.sample(
+            ["Home", "Work", "Fax", "EMail"], rnd.randint(0, 3)
+        )
+        rnd.shuffle(contact_types)
+        contacts = [
+            (contact_type, _random_contact(rnd, contact_type, invalid_cell_rate))
+            for contact_type in contact_types
+        ]
+        # The birthday row always exists, even without a second contact
+        contacts += [(None, None)] * max(2 - len(contacts), 0)
+
+        # fmt: off
+        first_rows = [
+            [_random_name(rnd), None, rnd.choice(TITLE_LIST).lower(),
+             f"{rnd.randint(1, 200)} Main Road", None, None],
+            [birthday, None, "Durban", "PO Box 1", None, None],
+        ]
+        # fmt: on
+        for row_number, (contact_type, contact) in enumerate(contacts):
+            row = first_rows[row_number] if row_number < 2 else [None] * 6
+            yield row + [contact_type, contact]
+        rows_on_page += len(contacts)
+
+        if rows_on_page >= ROWS_PER_PAGE:
+            yield []
+            yield _page_footer(page)
+            rows_on_page, page = 0, page + 1
+
+    yield []
+    yield _page_footer(page)
+
+
+# * ---------------------
+# * Recall (exam history) report
+# * ---------------------
+def iter_recall_rows(
+    n_visits: int,
+    seed: int = 0,
+    start_date: datetime = datetime(2018, 1, 1),
+    years: int = 8,
+    invalid_cell_rate: float = 0.2,
+) -> Iterator[list]:
+    """Yield the worksheet rows of an exam history report with `n_visits` rows.
+
+    Patients visit several times, so each has a history of exams to reduce.
+    """
+    rnd = random.Random(seed)
+
+    for header in [
+        "Classic Eyes Optometrists",
+        "Patient Exam History",
+        f"From: {start_date:%Y/%m/%d}",
+        f"Printed: {datetime.now():%Y/%m/%d %H:%M}",
+    ]:
+        yield [header]
+        yield []
+
+    # fmt: off
+    yield ["Date", None, "PatientNo", "Name", None, "Exam Type", "Optometrist",
+           None, "Cell"]
+    # fmt: on
+
+    n_patients = max(n_visits // 4, 1)
+    patient_names = {}
+    visit_types = list(RECALL_INTERVAL_MONTHS_DICT) + ["C/Lens Purchases"]
+    rows_on_page, page = 0, 1
+    for visit in range(n_visits):
+        visit_date = start_date + timedelta(days=visit * years * 365 // n_visits)
+        patient_no = 100_000 + rnd.randrange(n_patients)
+        name = patient_names.setdefault(patient_no, _random_name(rnd))
+        # Later visits often have no cell number captured
+        cell = _random_cell(rnd, invalid_cell_rate) if rnd.random() < 0.7 else None
+
+        # fmt: off
+        yield [visit_date, None, patient_no, name, None, rnd.choice(visit_types),
+               rnd.choice(VALID_OPTOMETRIST_LIST), None, cell]
+        # fmt: on
+        rows_on_page += 1
+
+        if rows_on_page >= ROWS_PER_PAGE:
+            yield []
+            yield _page_footer(page)
+            rows_on_page, page = 0, page + 1
+
+    yield []
+    yield _page_footer(page)
+
+
+REPORT_ROWS_DICT = {
+    "appointment": iter_appointment_rows,
+    "birthday": iter_birthday_rows,
+    "recall": iter_recall_rows,
+}
+
+
+def write_report(
+    report: str, filepath: str, n_rows: int, seed: int = 0, **row_options
+) -> str:
+    """Write a `report` workbook, `row_options` are passed on to its `iter_*_rows`."""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(report.title())
+    for row in REPORT_ROWS_DICT[report](n_rows, seed=seed, **row_options):
+        sheet.append(row)
+
+    workbook.save(filepath)
+    return filepath
+
+
+def make_raw_report(report: str, n_rows: int, seed: int = 0, **row_options):
+    """The report as the readers load it (no blank rows, empty cells NaN), without a workbook."""
+    import numpy as np
+    import pandas as pd
+
+    rows = REPORT_ROWS_DICT[report](n_rows, seed=seed, **row_options)
+    df_raw = pd.DataFrame([row for row in rows if row])
+    return df_raw.astype(object).where(df_raw.notna(), np.nan)
+
+
+REPORT_WRITER_DICT = {
+    report: partial(write_report, report) for report in REPORT_ROWS_DICT
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("report", choices=REPORT_WRITER_DICT)
+    parser.add_argument(
+        "rows", type=int, help="Number of appointments, patients or visits."
+    )
+    parser.add_argument("filepath", help="Output workbook (.xlsx).")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    REPORT_WRITER_DICT[args.report](args.filepath, args.rows, seed=args.seed)
+    print(f"Wrote {args.rows:,} {args.report} rows to {args.filepath}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import pytest
+from openpyxl import Workbook
+from sample_reports import APPOINTMENT_ROWS
+from synthetic_reports import write_report
+
+
+@pytest.fixture
+def make_report(tmp_path):
+    """Write a synthetic report workbook to `tmp_path`, see `synthetic_reports.write_report`."""
+
+    def _make_report(report: str, n_rows: int, seed: int = 0, name=None, **options):
+        filepath = tmp_path / (name or f"{report}_{n_rows}_{seed}.xlsx")
+        return write_report(report, str(filepath), n_rows, seed=seed, **options)
+
+    return _make_report
+
+
+@pytest.fixture
+def write_workbook(tmp_path):
+    """Write worksheets of rows to a workbook in `tmp_path`."""
+
+    def _write_workbook(sheet_rows_dict: dict[str, list[list]], name="report.xlsx"):
+        workbook = Workbook(write_only=True)
+        for title, rows in sheet_rows_dict.items():
+            sheet = workbook.create_sheet(title)
+            for row in rows:
+                sheet.append(row)
+        filepath = str(tmp_path / name)
+        workbook.save(filepath)
+        return filepath
+
+    return _write_workbook
+
+
+@pytest.fixture
+def appointment_report(write_workbook):
+    return write_workbook({"Appointment": APPOINTMENT_ROWS}, name="appointments.xlsx")
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+# A small Appointment report in the layout of a TOMs export: header rows, a heading
+# row with empty columns between headings, optometrist group rows, a junk category
+# row, cell numbers in several formats (and invalid ones) and a page footer.
+# fmt: off
+APPOINTMENT_ROWS = [
+    ["Classic Eyes Optometrists"], [],
+    ["Appointment List"], [],
+    ["From: 2025/01/06"], [],
+    ["To: 2025/01/07"], [],
+    ["Printed: 2025/01/05 17:00"], [],
+    ["Branch: All"], [],
+    ["Date", "Time", None, "Name", None, "PatientNo", "Home", "Work", None,
+     "Cell", "Medical Aid", None, "Plan", "Number"],
+    ["Yasmin Vawda"],
+    [datetime(2025, 1, 6), "08:00", None, "NAIDOO THABO", None, 100001, None, None,
+     None, "082 123 4567", "GEMS", None, "Core", "1234"],
+    [None, "08:30", None, "PILLAY PRIYA", None, 100002, "0311234567", None,
+     None, "+27831234567", None, None, "Core", "2345"],
+    [None, "09:00", None, "SMITH KAREN", None, 100003, None, None,
+     None, "0123456789", "Private", None, "Core", "3456"],
+    ["Spec Exam"], [],
+    ["Sandesh Srikissoon"],
+    [datetime(2025, 1, 7), "08:00", None, "BOTHA WILLEM", None, 100004, None, None,
+     None, "841234567.0", "Bonitas", None, "Core", "4567"],
+    [None, "08:30", None, "KHUMALO SIPHO", None, 100005, "0317654321", None,
+     None, None, "GEMS", None, "Core", "5678"],
+    [],
+    ["Page 1 of 1"],
+]
+# fmt: on
+
+# Cell numbers of the report's appointments with a valid cell number, in order
+APPOINTMENT_CELL_NUMBERS = ["27821234567", "27831234567", "27841234567"]
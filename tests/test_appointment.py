@@ -0,0 +1,91 @@
+import pandas as pd
+from synthetic_reports import iter_appointment_rows
+
+from ExtractTomsForWati import AppointmentHandler
+from ExtractTomsForWati._phone import STRING_DTYPE, to_country_cell_numbers
+from ExtractTomsForWati._watermark import WatermarkStore
+from ExtractTomsForWati.appointment_handler import VALID_OPTOMETRIST_LIST
+
+
+def _expected_appointments(n_appointments: int, seed: int) -> pd.DataFrame:
+    """Appointments of the generated rows, read one row at a time."""
+    records, optometrist, appointment_date = [], None, None
+    for row in iter_appointment_rows(n_appointments, seed=seed):
+        if len(row) == 1 and row[0] in VALID_OPTOMETRIST_LIST:
+            optometrist = row[0]
+        elif len(row) == 14 and isinstance(row[5], int):  # Patient rows
+            appointment_date = row[0] or appointment_date
+            records.append((optometrist, appointment_date, row[1], row[9]))
+
+    df = pd.DataFrame(records, columns=["Optometrists", "Date", "Time", "Cell"])
+    df["CellCountry"] = to_country_cell_numbers(df["Cell"])
+    return df[df["CellCountry"].notna()].drop(columns="Cell").reset_index(drop=True)
+
+
+def test_appointments_keep_their_optometrist_and_date(make_report):
+    handler = AppointmentHandler(selected_practice="La Lucia")
+
+    df_output = handler.load_and_process(make_report("appointment", 400, seed=7))
+
+    expected = _expected_appointments(400, seed=7)
+    columns = ["Optometrists", "Date", "Time", "CellCountry"]
+    pd.testing.assert_frame_equal(
+        df_output[columns].astype(object),
+        expected[columns].astype(object),
+        check_names=False,
+    )
+    assert (df_output["Practice"] == "Classic Eyes La Lucia").all()
+
+
+def test_outputs_use_compact_dtypes(make_report):
+    handler = AppointmentHandler(selected_practice="La Lucia")
+
+    df_output = handler.load_and_process(make_report("appointment", 100))
+
+    assert isinstance(df_output["Optometrists"].dtype, pd.CategoricalDtype)
+    assert isinstance(df_output["Practice"].dtype, pd.CategoricalDtype)
+    assert df_output["CellCountry"].dtype == STRING_DTYPE
+    assert df_output["Date"].dtype == "datetime64[ns]"
+
+
+def test_incremental_runs_skip_appointments_already_output(make_report, tmp_path):
+    watermark_store = WatermarkStore(watermark_dir=str(tmp_path / "watermarks"))
+    first_report = make_report("appointment", 300, seed=8)
+    # The next export repeats the earlier appointments and adds new ones
+    next_report = make_report("appointment", 400, seed=8)
+
+    def run(filepath: str, run_number: int) -> pd.DataFrame:
+        handler = AppointmentHandler(
+            selected_practice="La Lucia",
+            incremental=True,
+            watermark_store=watermark_store,
+        )
+        df_output = handler.load_and_process(filepath)
+        handler.save_data(str(tmp_path / f"output_{run_number}.csv"))
+        return df_output
+
+    first_output = run(first_report, 1)
+    next_output = run(next_report, 2)
+    repeated_output = run(next_report, 3)
+
+    full_output = AppointmentHandler(selected_practice="La Lucia").load_and_process(
+        next_report
+    )
+    assert len(first_output) + len(next_output) == len(full_output)
+    assert repeated_output.empty
+
+
+def test_unsaved_incremental_runs_do_not_move_the_watermark(make_report, tmp_path):
+    watermark_store = WatermarkStore(watermark_dir=str(tmp_path / "watermarks"))
+    filepath = make_report("appointment", 100)
+
+    outputs = [
+        AppointmentHandler(
+            selected_practice="La Lucia",
+            incremental=True,
+            watermark_store=watermark_store,
+        ).load_and_process(filepath)
+        for _ in range(2)
+    ]
+
+    assert len(outputs[0]) == len(outputs[1]) > 0
@@ -0,0 +1,85 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from ExtractTomsForWati._batch import find_report_files, run_batch, write_summary
+from sample_reports import APPOINTMENT_CELL_NUMBERS
+
+
+@pytest.fixture
+def report_folder(tmp_path, appointment_report, write_workbook):
+    write_workbook({"Notes": [["Staff rota"]]}, name="rota.xlsx")
+    (tmp_path / "~$appointments.xlsx").write_bytes(b"")  # Excel lock file
+    (tmp_path / "readme.txt").write_text("")
+    return tmp_path
+
+
+def test_report_files_skip_lock_files_and_other_types(report_folder):
+    file_names = [
+        os.path.basename(path) for path in find_report_files([str(report_folder)])
+    ]
+
+    assert file_names == ["appointments.xlsx", "rota.xlsx"]
+
+
+def test_batch_saves_each_report_and_reports_failures(report_folder, tmp_path):
+    output_dir = tmp_path / "outputs"
+    file_paths = find_report_files([str(report_folder)])
+
+    results = run_batch(
+        file_paths, "Appointment", "La Lucia", output_dir=str(output_dir), max_workers=2
+    )
+    summary = write_summary(results, str(tmp_path / "summary.json"))
+
+    assert [result.succeeded for result in results] == [True, False]
+    assert results[0].rows_out == len(APPOINTMENT_CELL_NUMBERS)
+    assert os.listdir(output_dir) == ["appointments_Appointment.csv"]
+    assert (summary["succeeded"], summary["failed"]) == (1, 1)
+    with open(tmp_path / "summary.json", encoding="utf-8") as file:
+        assert json.load(file)["rows_out"] == len(APPOINTMENT_CELL_NUMBERS)
+
+
+def test_batch_sniffs_each_report_template(report_folder, tmp_path):
+    output_dir = tmp_path / "outputs"
+    file_paths = find_report_files([str(report_folder)])
+
+    results = run_batch(
+        file_paths, None, "La Lucia", output_dir=str(output_dir), max_workers=2
+    )
+
+    assert [result.template for result in results] == ["Appointment", None]
+    assert "Unknown report layout" in results[1].error
+    assert os.listdir(output_dir) == ["appointments_Appointment.csv"]
+
+
+def test_same_named_reports_in_subfolders_keep_their_outputs_apart(
+    appointment_report, tmp_path
+):
+    for practice in ["la_lucia", "gateway"]:
+        (tmp_path / "exports" / practice).mkdir(parents=True)
+        shutil.copy(appointment_report, tmp_path / "exports" / practice / "report.xlsx")
+    output_dir = tmp_path / "outputs"
+    file_paths = find_report_files([str(tmp_path / "exports" / "**" / "*.xlsx")])
+
+    results = run_batch(
+        file_paths, "Appointment", "La Lucia", output_dir=str(output_dir)
+    )
+
+    assert [result.save_path for result in results] == [
+        str(output_dir / practice / "report_Appointment.csv")
+        for practice in ["gateway", "la_lucia"]
+    ]
+    assert all(os.path.exists(result.save_path) for result in results)
+
+
+def test_batch_rejects_invalid_options_before_starting(report_folder):
+    file_paths = find_report_files([str(report_folder)])
+
+    with pytest.raises(ValueError, match="Unknown template"):
+        run_batch(file_paths, "Invoice", "La Lucia")
+    with pytest.raises(ValueError, match="does not support incremental mode"):
+        run_batch(file_paths, "Birthday", "La Lucia", incremental=True)
+    with pytest.raises(ValueError, match="Invalid output file type"):
+        run_batch(file_paths, "Birthday", "La Lucia", output_file_type=".txt")
@@ -0,0 +1,64 @@
+from datetime import date, datetime
+
+import pandas as pd
+from synthetic_reports import iter_birthday_rows
+
+from ExtractTomsForWati import BirthdayHandler
+from ExtractTomsForWati._birthday_index import BirthdayIndex
+
+
+def _birthdays(*dates: str) -> pd.Series:
+    return pd.Series(pd.to_datetime(list(dates)))
+
+
+def test_leap_day_birthdays_fall_on_28_february_in_other_years():
+    index = BirthdayIndex.from_birthdays(_birthdays("2000-02-29", "1990-03-01"))
+
+    assert index.between(date(2025, 2, 28), date(2025, 2, 28)).tolist() == [0]
+    assert index.between(date(2024, 2, 28), date(2024, 2, 28)).tolist() == []
+    assert index.between(date(2024, 2, 29), date(2024, 2, 29)).tolist() == [0]
+    assert index.in_month(2).tolist() == [0]
+
+
+def test_window_wraps_around_the_new_year():
+    birthdays = _birthdays("1980-12-30", "1975-01-02", "1990-06-15", None)
+    index = BirthdayIndex.from_birthdays(birthdays)
+
+    positions = index.upcoming(7, from_date=date(2025, 12, 28))
+
+    assert positions.tolist() == [0, 1]
+    assert len(index) == 3
+
+
+def test_index_matches_a_scan_of_generated_birthdays(make_report):
+    handler = BirthdayHandler(selected_practice="La Lucia")
+    df_output = handler.load_and_process(make_report("birthday", 300, seed=4))
+    start, end = date(2025, 12, 20), date(2026, 1, 10)
+
+    positions = handler.get_birthday_index().between(start, end)
+
+    in_window = [
+        (birthday.month, birthday.day) >= (12, 20)
+        or (birthday.month, birthday.day) <= (1, 10)
+        for birthday in df_output["Birthday"]
+    ]
+    assert sorted(positions.tolist()) == [i for i, hit in enumerate(in_window) if hit]
+
+
+def test_malformed_records_report_their_worksheet_row(write_workbook):
+    rows = list(iter_birthday_rows(30, seed=5))
+    # The birthday row of the fourth patient, as numbered in Excel
+    birthday_rows = [
+        number
+        for number, row in enumerate(rows, 1)
+        if row and isinstance(row[0], datetime)
+    ]
+    bad_row = birthday_rows[3]
+    rows[bad_row - 1] = ["31/02/1977", *rows[bad_row - 1][1:]]
+
+    handler = BirthdayHandler(selected_practice="La Lucia")
+    handler.load_and_process(write_workbook({"Birthday": rows}))
+
+    record = handler.malformed_records[0]
+    assert (record.row_number, record.reason) == (bad_row, "invalid birthday")
+    assert f"row {bad_row}," in handler.run_report.warnings[0]
@@ -0,0 +1,101 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from ExtractTomsForWati._cache import DiskCache
+from ExtractTomsForWati._readers import OpenpyxlReader
+from ExtractTomsForWati._send_ledger import SendLedger
+from ExtractTomsForWati.appointment_handler import AppointmentHandler
+
+
+@pytest.fixture
+def count_parses(monkeypatch):
+    """Count the workbooks parsed by `OpenpyxlReader`."""
+    parses = []
+    read = OpenpyxlReader.read
+
+    def counting_read(self, filepath):
+        parses.append(filepath)
+        return read(self, filepath)
+
+    monkeypatch.setattr(OpenpyxlReader, "read", counting_read)
+    return parses
+
+
+def test_parse_cache_is_keyed_by_file_contents(
+    appointment_report, tmp_path, count_parses
+):
+    parse_cache = DiskCache(cache_dir=str(tmp_path / "cache"), namespace="parsed")
+    copy_path = str(tmp_path / "copy.xlsx")
+    shutil.copyfile(appointment_report, copy_path)
+
+    outputs = [
+        AppointmentHandler(
+            selected_practice="La Lucia", parse_cache=parse_cache
+        ).load_and_process(path)
+        for path in [appointment_report, copy_path, appointment_report]
+    ]
+
+    assert count_parses == [appointment_report]
+    pd.testing.assert_frame_equal(outputs[0], outputs[1])
+    pd.testing.assert_frame_equal(outputs[0], outputs[2])
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    df = pd.DataFrame({"Cell": ["0821234567"] * 1000})
+    disk_cache = DiskCache(cache_dir=str(tmp_path), max_size_bytes=1)
+
+    disk_cache.put("first", df)
+    disk_cache.put("second", df)
+
+    assert disk_cache.get("first") is None
+    assert len(disk_cache.entries()) <= 1
+
+
+def test_corrupt_entries_are_misses(tmp_path):
+    disk_cache = DiskCache(cache_dir=str(tmp_path))
+    disk_cache.put("key", pd.DataFrame({"a": [1]}))
+    with open(disk_cache._get_entry_path("key"), "wb") as file:
+        file.write(b"not a pickle")
+
+    assert disk_cache.get("key") is None
+    assert not os.path.exists(disk_cache._get_entry_path("key"))
+
+
+def test_result_cache_skips_unchanged_runs(make_report, tmp_path, count_parses):
+    result_cache = DiskCache(cache_dir=str(tmp_path / "cache"), namespace="results")
+    filepath = make_report("appointment", 200, seed=24)
+
+    def run(**handler_kwargs) -> AppointmentHandler:
+        handler = AppointmentHandler(result_cache=result_cache, **handler_kwargs)
+        handler.load_and_process(filepath)
+        return handler
+
+    first = run(selected_practice="La Lucia")
+    cached = run(selected_practice="La Lucia")
+    other_practice = run(selected_practice="Gateway")
+
+    assert count_parses == [filepath, filepath]
+    pd.testing.assert_frame_equal(first.df_output, cached.df_output)
+    assert cached.run_report.get_stage("load_cached_result") is not None
+    assert (other_practice.df_output["Practice"] == "Classic Eyes Gateway").all()
+
+
+def test_result_cache_is_bypassed_with_a_send_ledger(
+    make_report, tmp_path, count_parses
+):
+    result_cache = DiskCache(cache_dir=str(tmp_path / "cache"), namespace="results")
+    send_ledger = SendLedger(db_path=str(tmp_path / "send_ledger.sqlite3"))
+    filepath = make_report("appointment", 100, seed=25)
+
+    for _ in range(2):
+        AppointmentHandler(
+            selected_practice="La Lucia",
+            result_cache=result_cache,
+            send_ledger=send_ledger,
+        ).load_and_process(filepath)
+
+    assert len(count_parses) == 2
+    assert result_cache.entries() == []
@@ -0,0 +1,96 @@
+import pandas as pd
+import pytest
+
+from ExtractTomsForWati import AppointmentHandler, BirthdayHandler
+from ExtractTomsForWati._deduplicate import (
+    deduplicate_handler_outputs,
+    deduplicate_recipients,
+    find_duplicate_clusters,
+)
+
+
+class ReminderHandler(AppointmentHandler):
+    """A second template sending messages with the same keys as appointments."""
+
+
+def _recipients(*rows: tuple) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=["CellCountry", "Name", "Date"])
+
+
+def test_typo_duplicate_of_the_same_message_is_merged():
+    df = _recipients(
+        ("27821234567", "Naidoo Thabo", "2025-01-06 08:00"),
+        ("27821234567", "Naidoo Thabu", "2025-01-06 08:00"),
+        ("27821234567", "Naidoo Thabo", "2025-01-13 08:00"),
+    )
+
+    clusters = find_duplicate_clusters(df, message_keys=df["Date"])
+
+    # A patient's separate appointments are separate messages
+    assert clusters.tolist() == [0, 0, 2]
+
+
+def test_family_members_sharing_a_cell_number_are_kept():
+    df = _recipients(
+        ("27821234567", "Van Der Merwe Johan", "2025-01-06 08:00"),
+        ("27821234567", "Van Der Merwe Anika", "2025-01-06 08:00"),
+        ("27821234567", "Naidoo Priya", "2025-01-06 08:00"),
+    )
+
+    deduplicated = deduplicate_recipients(df, message_keys=df["Date"])
+
+    assert len(deduplicated) == 3
+
+
+def test_different_people_sharing_a_cell_number_are_kept():
+    df = _recipients(
+        ("27821234567", "Naidoo Priya", "2025-01-06 08:00"),
+        ("27821234567", "Pillay Sipho", "2025-01-06 08:00"),
+    )
+
+    assert len(deduplicate_recipients(df, message_keys=df["Date"])) == 2
+
+
+def test_different_birthdays_veto_a_match():
+    df = pd.DataFrame(
+        {
+            "CellCountry": ["27821234567"] * 2,
+            "Name": ["Pillay Sipho"] * 2,
+            "Birthday": pd.to_datetime(["1980-05-01", "2010-05-01"]),
+        }
+    )
+
+    assert find_duplicate_clusters(df).tolist() == [0, 1]
+
+
+@pytest.mark.parametrize(
+    "handler_class, report",
+    [(AppointmentHandler, "appointment"), (BirthdayHandler, "birthday")],
+)
+def test_patients_of_several_practices_are_messaged_once(
+    make_report, handler_class, report
+):
+    filepath = make_report(report, 200, seed=11)
+    handlers = [
+        handler_class(selected_practice=practice)
+        for practice in ["La Lucia", "Gateway"]
+    ]
+    outputs = [handler.load_and_process(filepath) for handler in handlers]
+
+    deduplicated = deduplicate_handler_outputs(handlers)
+
+    assert len(deduplicated) == len(deduplicate_recipients(outputs[0]))
+    assert set(deduplicated["Practice"].astype(str)) == {"Classic Eyes La Lucia"}
+
+
+def test_outputs_of_different_templates_are_not_merged(make_report):
+    filepath = make_report("appointment", 50)
+    handlers = [
+        AppointmentHandler(selected_practice="La Lucia"),
+        ReminderHandler(selected_practice="La Lucia"),
+    ]
+    outputs = [handler.load_and_process(filepath) for handler in handlers]
+
+    deduplicated = deduplicate_handler_outputs(handlers)
+
+    assert len(deduplicated) == len(outputs[0]) + len(outputs[1])
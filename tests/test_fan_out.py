@@ -0,0 +1,60 @@
+import pandas as pd
+from synthetic_reports import iter_appointment_rows
+
+from ExtractTomsForWati import AppointmentHandler
+from ExtractTomsForWati._fan_out import expand_sources
+
+
+def test_sheets_with_the_handler_layout_are_expanded(write_workbook):
+    filepath = write_workbook(
+        {
+            "Notes": [["Exported for reception"]],
+            "Week 1": list(iter_appointment_rows(50, seed=15)),
+            "Week 2": list(iter_appointment_rows(50, seed=16)),
+        }
+    )
+    header_signature = AppointmentHandler.header_signature
+
+    assert expand_sources([filepath], header_signature) == [
+        (filepath, "Week 1"),
+        (filepath, "Week 2"),
+    ]
+    assert expand_sources([(filepath, 0)], header_signature) == [(filepath, "Notes")]
+
+
+def test_sources_are_processed_as_one_run(write_workbook, make_report):
+    workbook = write_workbook(
+        {
+            "Week 1": list(iter_appointment_rows(120, seed=17)),
+            "Week 2": list(iter_appointment_rows(80, seed=18)),
+        },
+        name="month.xlsx",
+    )
+    report = make_report("appointment", 60, seed=19)
+
+    handler = AppointmentHandler(selected_practice="La Lucia")
+    df_output = handler.load_and_process_sources([workbook, (report, 0)], max_workers=1)
+
+    separate_outputs = []
+    for filepath, sheet in [(workbook, "Week 1"), (workbook, "Week 2"), (report, 0)]:
+        separate_handler = AppointmentHandler(selected_practice="La Lucia", sheet=sheet)
+        separate_outputs.append(separate_handler.load_and_process(filepath))
+
+    columns = handler.default_headings_list
+    expected = pd.concat(
+        [output[columns].astype(object) for output in separate_outputs],
+        ignore_index=True,
+    )
+    pd.testing.assert_frame_equal(
+        df_output[columns].astype(object), expected, check_names=False
+    )
+    assert df_output["SourceSheet"].unique().tolist() == [
+        "Week 1",
+        "Week 2",
+        "Appointment",
+    ]
+    assert [stage.name for stage in handler.run_report.stages][1:4] == [
+        "month.xlsx [Week 1]",
+        "month.xlsx [Week 2]",
+        "appointment_60_19.xlsx [Appointment]",
+    ]
@@ -0,0 +1,143 @@
+import os
+import shutil
+import time
+
+import pytest
+
+from ExtractTomsForWati import AppointmentHandler, FolderWatcher, JobEngine
+from ExtractTomsForWati._job_engine import JOB_CANCELLED
+
+TIMEOUT_SECONDS = 120
+
+
+@pytest.fixture
+def job_engine():
+    job_engine = JobEngine(max_workers=1)
+    yield job_engine
+    job_engine.shutdown()
+
+
+def _wait_for(condition, step=lambda: None):
+    deadline = time.monotonic() + TIMEOUT_SECONDS
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out"
+        step()
+        time.sleep(0.05)
+
+
+def test_jobs_detect_their_template_in_the_worker(job_engine, make_report):
+    filepath = make_report("appointment", 200, seed=26)
+    expected = AppointmentHandler(selected_practice="La Lucia").load_and_process(
+        filepath
+    )
+
+    job = job_engine.submit(None, "La Lucia", filepath)
+    assert job.template is None
+    _wait_for(lambda: job.finished, job_engine.poll)
+
+    assert job.succeeded, job.error
+    assert job.template == "Appointment"
+    assert job.handler.df_output["CellCountry"].tolist() == (
+        expected["CellCountry"].tolist()
+    )
+    assert job.handler.run_report.get_stage("extract_features") is not None
+
+
+def test_failed_and_cancelled_jobs(job_engine, make_report, write_workbook):
+    not_a_report = write_workbook({"Notes": [["Staff rota"]]})
+    filepath = make_report("birthday", 20000, seed=27)
+
+    failed_job = job_engine.submit(None, "La Lucia", not_a_report)
+    cancelled_job = job_engine.submit("Birthday", "La Lucia", filepath)
+    job_engine.cancel(cancelled_job.job_id)
+    _wait_for(lambda: failed_job.finished, job_engine.poll)
+
+    assert failed_job.failed and "Unknown report layout" in failed_job.error
+    assert cancelled_job.status == JOB_CANCELLED and cancelled_job.handler is None
+
+
+@pytest.fixture
+def watcher_logs():
+    return []
+
+
+@pytest.fixture
+def folder_watcher(tmp_path, watcher_logs):
+    folder = tmp_path / "exports"
+    folder.mkdir()
+    folder_watcher = FolderWatcher(
+        folder=str(folder),
+        practice="La Lucia",
+        settle_seconds=0,
+        poll_seconds=0.05,
+        use_inotify=False,
+        max_workers=1,
+        log_callback=watcher_logs.append,
+    )
+    folder_watcher.start()
+    yield folder_watcher
+    folder_watcher.stop()
+
+
+def test_folder_watcher_processes_new_exports(
+    folder_watcher, watcher_logs, make_report
+):
+    shutil.copy(
+        make_report("birthday", 100, seed=28),
+        os.path.join(folder_watcher.folder, "birthdays.xlsx"),
+    )
+    _wait_for(
+        lambda: any(log.startswith(("OK", "FAIL")) for log in watcher_logs),
+        folder_watcher.step,
+    )
+
+    assert any(
+        log.startswith("OK    birthdays.xlsx") for log in watcher_logs
+    ), watcher_logs
+    output_files = [
+        name for name in os.listdir(folder_watcher.folder) if name.endswith(".csv")
+    ]
+    assert output_files == ["birthdays_Birthday.csv"]
+
+
+def test_folder_watcher_keeps_reports_finishing_together_apart(
+    folder_watcher, watcher_logs, make_report
+):
+    for seed, file_name in [(29, "pavilion.xlsx"), (30, "la_lucia.xlsx")]:
+        shutil.copy(
+            make_report("birthday", 100, seed=seed),
+            os.path.join(folder_watcher.folder, file_name),
+        )
+    _wait_for(
+        lambda: sum(log.startswith(("OK", "FAIL")) for log in watcher_logs) == 2,
+        folder_watcher.step,
+    )
+
+    assert sum(log.startswith("OK") for log in watcher_logs) == 2, watcher_logs
+    output_files = sorted(
+        name for name in os.listdir(folder_watcher.folder) if name.endswith(".csv")
+    )
+    assert output_files == ["la_lucia_Birthday.csv", "pavilion_Birthday.csv"]
+
+
+def test_folder_watcher_fails_unknown_layouts_in_the_worker(
+    folder_watcher, watcher_logs, make_report, write_workbook
+):
+    shutil.copy(
+        write_workbook({"Notes": [["Staff rota"]]}),
+        os.path.join(folder_watcher.folder, "rota.xlsx"),
+    )
+    shutil.copy(
+        make_report("birthday", 100, seed=31),
+        os.path.join(folder_watcher.folder, "birthdays.xlsx"),
+    )
+    _wait_for(
+        lambda: sum(log.startswith(("OK", "FAIL")) for log in watcher_logs) == 2,
+        folder_watcher.step,
+    )
+
+    assert any(
+        log.startswith("FAIL  rota.xlsx: ValueError: Unknown report layout")
+        for log in watcher_logs
+    ), watcher_logs
+    assert any(log.startswith("OK    birthdays.xlsx") for log in watcher_logs)
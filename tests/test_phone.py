@@ -0,0 +1,32 @@
+import pandas as pd
+from sample_reports import APPOINTMENT_CELL_NUMBERS
+
+from ExtractTomsForWati._phone import get_valid_cell_mask, to_country_cell_numbers
+from ExtractTomsForWati.appointment_handler import AppointmentHandler
+
+
+def test_formats_normalise_to_country_numbers():
+    contacts = pd.Series(
+        ["082 123 4567", "+27821234567", "27821234567", "821234567.0", 821234567]
+    )
+
+    cell_numbers = to_country_cell_numbers(contacts)
+
+    assert cell_numbers.tolist() == ["27821234567"] * 5
+
+
+def test_invalid_and_placeholder_numbers_are_missing():
+    contacts = pd.Series(
+        ["0123456789", "0000000000", "0111111111", "-", "None", None, "08212", "a@b.co"]
+    )
+
+    assert to_country_cell_numbers(contacts).isna().all()
+    assert not get_valid_cell_mask(contacts).any()
+
+
+def test_rows_without_a_valid_cell_number_are_dropped(appointment_report):
+    handler = AppointmentHandler(selected_practice="La Lucia")
+
+    df_output = handler.load_and_process(appointment_report)
+
+    assert df_output["CellCountry"].tolist() == APPOINTMENT_CELL_NUMBERS
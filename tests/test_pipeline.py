@@ -0,0 +1,89 @@
+import json
+
+import pandas as pd
+import pytest
+
+from ExtractTomsForWati._progress import CancelToken, JobCancelled
+from ExtractTomsForWati.appointment_handler import AppointmentHandler
+
+
+def test_intermediate_frames_are_released(appointment_report):
+    handler = AppointmentHandler(selected_practice="La Lucia")
+    retaining_handler = AppointmentHandler(
+        selected_practice="La Lucia", retain_intermediate=True
+    )
+
+    df_output = handler.load_and_process(appointment_report)
+    retained_output = retaining_handler.load_and_process(appointment_report)
+
+    assert handler.df_raw is None and handler.df_clean is None
+    assert retaining_handler.df_raw is not None
+    assert retaining_handler.df_clean is not None
+    pd.testing.assert_frame_equal(df_output, retained_output)
+
+
+def test_stages_leave_the_loaded_report_unchanged(appointment_report):
+    handler = AppointmentHandler(selected_practice="La Lucia")
+    handler.load_dataframe(appointment_report)
+    df_raw = handler.df_raw
+    df_loaded = df_raw.copy(deep=True)
+
+    handler.transform_data()
+
+    pd.testing.assert_frame_equal(df_raw, df_loaded)
+
+
+def test_peak_memory_is_tracked(appointment_report):
+    handler = AppointmentHandler(selected_practice="La Lucia", track_memory=True)
+
+    handler.load_and_process(appointment_report)
+
+    assert handler.peak_memory_bytes > 0
+
+
+def test_run_report_records_each_stage(appointment_report, tmp_path):
+    run_log_path = tmp_path / "runs.jsonl"
+    handler = AppointmentHandler(
+        selected_practice="La Lucia", run_log_path=str(run_log_path)
+    )
+
+    df_output = handler.load_and_process(appointment_report)
+
+    run_report = handler.run_report
+    for name in ["load_dataframe", "clean_data", "add_features", "extract_features"]:
+        assert run_report.get_stage(name).parent is None
+    assert run_report.get_stage("assign_optometrists").parent == "clean_data"
+    assert run_report.get_stage("extract_features").rows_out == len(df_output)
+    with open(run_log_path, encoding="utf-8") as file:
+        assert json.loads(file.readline())["file_path"] == appointment_report
+
+
+def test_progress_is_published_and_cancellation_stops_the_run(make_report):
+    filepath = make_report("appointment", 200)
+    cancel_token = CancelToken()
+    progress = []
+
+    def on_progress(fraction: float, stage_name: str):
+        progress.append(fraction)
+        if stage_name == "add_features":
+            cancel_token.cancel()
+
+    handler = AppointmentHandler(
+        selected_practice="La Lucia",
+        cancel_token=cancel_token,
+        progress_callback=on_progress,
+    )
+    with pytest.raises(JobCancelled):
+        handler.load_and_process(filepath)
+
+    assert progress == sorted(progress)
+    assert handler.run_report.get_stage("extract_features") is None
+
+
+def test_copy_on_write_is_not_enabled_globally(appointment_report):
+    handler = AppointmentHandler(selected_practice="La Lucia")
+
+    handler.load_and_process(appointment_report)
+
+    # Off by default in pandas 2, importing the package must not turn it on
+    assert not pd.get_option("mode.copy_on_write")
@@ -0,0 +1,71 @@
+import math
+
+import pandas as pd
+import pytest
+from sample_reports import APPOINTMENT_ROWS
+from synthetic_reports import iter_birthday_rows
+
+from ExtractTomsForWati._readers import OpenpyxlReader, PandasReader, get_reader_class
+
+
+def _non_empty_rows(rows: list[list]) -> list[list]:
+    return [row for row in rows if row]
+
+
+def test_streamed_rows_match_read_excel(appointment_report):
+    df_streamed = OpenpyxlReader().read(appointment_report)
+    df_pandas = PandasReader().read(appointment_report)
+
+    pd.testing.assert_frame_equal(
+        df_streamed.reset_index(drop=True),
+        df_pandas.reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+def test_empty_rows_are_dropped_and_cells_padded(appointment_report):
+    df_raw = OpenpyxlReader().read(appointment_report)
+
+    expected_rows = _non_empty_rows(APPOINTMENT_ROWS)
+    assert len(df_raw) == len(expected_rows)
+    assert df_raw.shape[1] == max(len(row) for row in expected_rows)
+    assert df_raw.iloc[0, 0] == "Classic Eyes Optometrists"
+    assert math.isnan(df_raw.iloc[0, 1])
+
+
+@pytest.mark.parametrize("reader_class", [OpenpyxlReader, PandasReader])
+def test_junk_rows_are_dropped_while_streaming(appointment_report, reader_class):
+    df_raw = reader_class(drop_rows_containing_list=["Spec Exam"]).read(
+        appointment_report
+    )
+
+    assert "Spec Exam" not in df_raw[0].tolist()
+    assert len(df_raw) == len(_non_empty_rows(APPOINTMENT_ROWS)) - 1
+
+
+@pytest.mark.parametrize("reader_class", [OpenpyxlReader, PandasReader])
+def test_reader_indexes_rows_by_worksheet_row(make_report, reader_class):
+    filepath = make_report("birthday", 20, seed=3)
+    rows = list(iter_birthday_rows(20, seed=3))
+    sheet_row_numbers = [number for number, row in enumerate(rows, 1) if row]
+
+    df_raw = reader_class().read(filepath)
+
+    assert df_raw.index.tolist() == sheet_row_numbers
+
+
+def test_reader_is_chosen_by_extension():
+    assert get_reader_class("report.xlsx") is OpenpyxlReader
+    assert get_reader_class("report.xls").__name__ == "XlrdReader"
+
+
+def test_row_callback_reports_rows_read(make_report):
+    calls = []
+    reader = OpenpyxlReader(row_callback=lambda *args: calls.append(args))
+
+    df = reader.read(make_report("appointment", 3000))
+
+    rows_read = calls[-1][0]
+    assert calls[-1] == (rows_read, rows_read)
+    assert [call[0] for call in calls[:-1]] == list(range(1000, rows_read, 1000))
+    assert len(df) < rows_read
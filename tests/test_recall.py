@@ -0,0 +1,80 @@
+from datetime import date, datetime
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from ExtractTomsForWati import RecallHandler
+from ExtractTomsForWati.recall_handler import RECALL_INTERVAL_MONTHS_DICT
+
+
+def _latest_exam_dict(filepath: str) -> dict[int, datetime]:
+    """Each generated patient's latest recall exam, found one row at a time."""
+    exam_types = set(RECALL_INTERVAL_MONTHS_DICT)
+    latest_exam_dict = {}
+    workbook = load_workbook(filepath, read_only=True)
+    for row in workbook.active.iter_rows(values_only=True):
+        if len(row) >= 7 and row[5] in exam_types:  # Cell may be left off
+            latest_exam_dict[row[2]] = max(row[0], latest_exam_dict.get(row[2], row[0]))
+    workbook.close()
+    return latest_exam_dict
+
+
+def test_due_recalls_come_from_each_patients_latest_exam(make_report):
+    handler = RecallHandler(
+        selected_practice="La Lucia",
+        recall_window_start=date(2025, 1, 1),
+        recall_window_days=365,
+    )
+
+    filepath = make_report("recall", 2000, seed=12)
+    df_output = handler.load_and_process(filepath)
+
+    last_exam_index = handler.last_exam_index
+    latest_exam_dict = _latest_exam_dict(filepath)
+    last_exams = last_exam_index["PatientNo"].map(latest_exam_dict)
+    assert last_exam_index["LastExam"].tolist() == last_exams.tolist()
+    assert last_exam_index["CellCountry"].notna().all()
+    assert last_exam_index["DueDate"].is_monotonic_increasing
+    due_dates = pd.to_datetime(df_output["DueDate"])
+    assert due_dates.between("2025-01-01", "2026-01-01").all()
+
+
+def test_patients_of_different_practices_sharing_a_patient_number(make_report):
+    # Both exports number their patients from 100000
+    sources = [
+        make_report("recall", 800, seed=13, name="pavilion.xlsx"),
+        make_report("recall", 800, seed=14, name="gateway.xlsx"),
+    ]
+    source_practice_dict = {"pavilion.xlsx": "Pavilion", "gateway.xlsx": "Gateway"}
+
+    handler = RecallHandler(
+        selected_practice="La Lucia",
+        source_practice_dict=source_practice_dict,
+        recall_window_start=date(2018, 1, 1),
+        recall_window_days=3650,
+    )
+    df_output = handler.load_and_process_sources(sources, max_workers=1)
+
+    separate_outputs = []
+    for source in sources:
+        practice = source_practice_dict[source.rsplit("/", 1)[-1]]
+        separate_handler = RecallHandler(
+            selected_practice=practice,
+            recall_window_start=date(2018, 1, 1),
+            recall_window_days=3650,
+        )
+        separate_outputs.append(separate_handler.load_and_process(source))
+
+    assert len(df_output) == sum(len(output) for output in separate_outputs)
+    practices = df_output.groupby("SourceFile", observed=True)["Practice"].unique()
+    assert practices.map(list).to_dict() == {
+        "gateway.xlsx": ["Classic Eyes Gateway"],
+        "pavilion.xlsx": ["Classic Eyes Pavilion"],
+    }
+    pd.testing.assert_series_equal(
+        df_output.loc[df_output["SourceFile"] == "gateway.xlsx", "CellCountry"]
+        .reset_index(drop=True)
+        .astype(str),
+        separate_outputs[1]["CellCountry"].astype(str),
+        check_names=False,
+    )
@@ -0,0 +1,77 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from ExtractTomsForWati._send_ledger import UNKNOWN_STATUS, SendLedger
+from ExtractTomsForWati.appointment_handler import AppointmentHandler
+
+
+@pytest.fixture
+def send_ledger(tmp_path):
+    return SendLedger(db_path=str(tmp_path / "send_ledger.sqlite3"))
+
+
+def test_sent_mask_is_an_anti_join_on_template_number_and_message(send_ledger):
+    cell_numbers = pd.Series(["27821234567", "27821234568", "27821234569"])
+    message_keys = pd.Series(["2025-01-06 08:00", "2025-01-06 08:30", "2025-01-07"])
+    send_ledger.record_sent("Appointment", cell_numbers[:2], message_keys[:2])
+
+    sent_mask = send_ledger.get_sent_mask("Appointment", cell_numbers, message_keys)
+    other_template = send_ledger.get_sent_mask("Birthday", cell_numbers, message_keys)
+    other_messages = send_ledger.get_sent_mask(
+        "Appointment", cell_numbers, message_keys.str.replace("06", "13")
+    )
+
+    assert sent_mask.tolist() == [True, True, False]
+    assert not other_template.any() and not other_messages.any()
+
+
+def test_handler_output_skips_messages_already_sent(appointment_report, send_ledger):
+    handler = AppointmentHandler(selected_practice="La Lucia", send_ledger=send_ledger)
+    first_output = handler.load_and_process(appointment_report)
+    handler.record_sent(
+        pd.DataFrame(
+            {"sent": [True, False, False], "outcome_unknown": [False, True, False]}
+        )
+    )
+
+    next_handler = AppointmentHandler(
+        selected_practice="La Lucia", send_ledger=send_ledger
+    )
+    next_output = next_handler.load_and_process(appointment_report)
+
+    # Sends with an unknown outcome are not retried either
+    pd.testing.assert_frame_equal(
+        next_output, first_output.iloc[2:].reset_index(drop=True)
+    )
+    assert send_ledger.count("Appointment", UNKNOWN_STATUS) == 1
+
+
+def test_prune_and_clear_by_status(send_ledger):
+    numbers = pd.Series(["27821234567", "27821234568"])
+    send_ledger.record_sent(
+        "Birthday", numbers[:1], ["2025"], sent_at=datetime.now() - timedelta(days=90)
+    )
+    send_ledger.record_sent("Birthday", numbers[1:], ["2025"], status=UNKNOWN_STATUS)
+
+    assert send_ledger.prune(older_than_days=30) == 1
+    assert send_ledger.clear(UNKNOWN_STATUS) == 1
+    assert send_ledger.count() == 0
+    with pytest.raises(ValueError):
+        send_ledger.record_sent("Birthday", numbers, ["2025"] * 2, status="failed")
+
+
+def test_ledgers_without_a_status_column_are_migrated(send_ledger):
+    with sqlite3.connect(send_ledger.db_path) as connection:
+        connection.execute(
+            "CREATE TABLE sends (template TEXT, cell_country TEXT, message_key TEXT,"
+            " sent_at TEXT, PRIMARY KEY (template, cell_country, message_key))"
+        )
+        connection.execute(
+            "INSERT INTO sends VALUES ('Recall', '27821234567', '2026-01-01', '2025')"
+        )
+    connection.close()
+
+    assert send_ledger.count(status="sent") == 1
@@ -0,0 +1,90 @@
+import pytest
+from synthetic_reports import REPORT_ROWS_DICT
+
+from ExtractTomsForWati import AppointmentHandler, BirthdayHandler, sniff_template
+from ExtractTomsForWati._readers import OpenpyxlReader, XlrdReader
+
+
+@pytest.mark.parametrize(
+    "report, template",
+    [("appointment", "Appointment"), ("birthday", "Birthday"), ("recall", "Recall")],
+)
+def test_template_is_sniffed_without_parsing_the_sheet(
+    make_report, monkeypatch, report, template
+):
+    filepath = make_report(report, 5000)
+
+    def fail_to_parse(self, filepath):
+        raise AssertionError("The whole sheet was parsed.")
+
+    monkeypatch.setattr(OpenpyxlReader, "_iter_rows", fail_to_parse)
+
+    assert sniff_template(filepath) == template
+
+
+def test_unknown_layout_names_the_closest_template(write_workbook):
+    headings = [
+        "Date",
+        "Time",
+        "Name",
+        "PatientNo",
+        "Home",
+        "Work",
+        "Cell",
+        "Plan",
+        "Number",
+    ]
+    filepath = write_workbook({"Sheet1": [headings, ["2025/01/06"]]})
+
+    with pytest.raises(
+        ValueError, match="Closest is Appointment, missing headings: Medical Aid\\."
+    ):
+        sniff_template(filepath)
+
+
+def test_unknown_layout_without_any_header_signature(make_report, monkeypatch):
+    filepath = make_report("appointment", 10)
+    monkeypatch.setattr("ExtractTomsForWati._sniffer.TEMPLATE_NAME_LIST", [])
+
+    with pytest.raises(ValueError, match="Unknown report layout in"):
+        sniff_template(filepath)
+
+
+def test_handler_rejects_another_layout_before_loading(make_report, monkeypatch):
+    filepath = make_report("birthday", 5000)
+    monkeypatch.setattr(OpenpyxlReader, "read", None)  # Loading would fail differently
+
+    with pytest.raises(ValueError, match="matches the Birthday template"):
+        AppointmentHandler(selected_practice="La Lucia").load_dataframe(filepath)
+
+
+def test_xls_reports_are_parsed_once(tmp_path, monkeypatch):
+    xlwt = pytest.importorskip("xlwt")
+    filepath = str(tmp_path / "appointments.xls")
+    workbook = xlwt.Workbook()
+    sheet = workbook.add_sheet("Appointment")
+    date_style = xlwt.easyxf(num_format_str="YYYY-MM-DD")
+    for row_number, row in enumerate(REPORT_ROWS_DICT["appointment"](100)):
+        for column, cell in enumerate(row):
+            if cell is not None and hasattr(cell, "year"):
+                sheet.write(row_number, column, cell, date_style)
+            elif cell is not None:
+                sheet.write(row_number, column, cell)
+    workbook.save(filepath)
+
+    parses = []
+    iter_rows = XlrdReader._iter_rows
+
+    def counting_iter_rows(self, filepath):
+        parses.append(filepath)
+        return iter_rows(self, filepath)
+
+    monkeypatch.setattr(XlrdReader, "_iter_rows", counting_iter_rows)
+    handler = AppointmentHandler(selected_practice="La Lucia")
+    df_output = handler.load_and_process(filepath)
+
+    assert len(parses) == 1
+    assert len(df_output) > 0
+    with pytest.raises(ValueError, match="does not match the Birthday layout"):
+        BirthdayHandler(selected_practice="La Lucia").load_dataframe(filepath)
+    assert len(parses) == 2
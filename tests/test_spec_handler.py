@@ -0,0 +1,41 @@
+import pickle
+
+import pandas as pd
+import pytest
+from bench_spec_handler import APPOINTMENT_SPEC
+from synthetic_reports import make_raw_report
+
+from ExtractTomsForWati import AppointmentHandler, HandlerSpec, compile_spec
+
+
+@pytest.mark.parametrize("seed", [0, 29])
+def test_compiled_spec_matches_the_hand_written_handler(seed):
+    spec_handler_class = compile_spec(APPOINTMENT_SPEC)
+    df_raw = make_raw_report("appointment", 1000, seed=seed)
+
+    # The hand-written handler notes the Pavilion store's location, so use La Lucia
+    spec_output = spec_handler_class(
+        selected_practice="La Lucia", df_raw=df_raw
+    ).transform_data()
+    handler_output = AppointmentHandler(
+        selected_practice="La Lucia", df_raw=df_raw
+    ).transform_data()
+
+    pd.testing.assert_frame_equal(spec_output, handler_output, check_names=False)
+
+
+def test_spec_handlers_parse_reports_and_pickle(make_report):
+    spec_handler_class = compile_spec(APPOINTMENT_SPEC)
+    handler = spec_handler_class(selected_practice="La Lucia")
+
+    df_output = handler.load_and_process(make_report("appointment", 100, seed=30))
+    restored = pickle.loads(pickle.dumps(handler))
+
+    assert str(handler) == "SpecAppointment"
+    assert restored.spec.digest == handler.spec.digest
+    pd.testing.assert_frame_equal(restored.df_output, df_output)
+
+
+def test_invalid_specs_are_rejected():
+    with pytest.raises(ValueError):
+        HandlerSpec.from_dict({**APPOINTMENT_SPEC, "unknown_option": True})
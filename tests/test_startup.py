@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _imports_pandas(code: str) -> bool:
+    completed = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport sys\nprint('pandas' in sys.modules)"],
+        cwd=REPO_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return completed.stdout.strip() == "True"
+
+
+def test_package_and_template_list_do_not_import_pandas():
+    assert not _imports_pandas(
+        "import ExtractTomsForWati\n"
+        "assert 'Appointment' in ExtractTomsForWati.TEMPLATE_NAME_LIST"
+    )
+
+
+def test_app_does_not_import_pandas():
+    pytest.importorskip("tkinter")
+    assert not _imports_pandas("import app")
+
+
+def test_handlers_are_imported_on_first_use():
+    assert _imports_pandas("from ExtractTomsForWati import AppointmentHandler")
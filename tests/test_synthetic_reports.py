@@ -0,0 +1,78 @@
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+from synthetic_reports import make_raw_report
+
+from ExtractTomsForWati._phone import to_country_cell_numbers
+from ExtractTomsForWati._readers import OpenpyxlReader, PandasReader
+from ExtractTomsForWati.appointment_handler import AppointmentHandler
+from ExtractTomsForWati.birthday_handler import BirthdayHandler
+
+
+def _read_patient_rows(filepath: str) -> list[tuple]:
+    """Appointment rows of a generated workbook, as written."""
+    workbook = load_workbook(filepath, read_only=True)
+    rows = [
+        row
+        for row in workbook.active.iter_rows(values_only=True)
+        if len(row) == 14 and isinstance(row[5], int)  # PatientNo
+    ]
+    workbook.close()
+    return rows
+
+
+def test_generated_reports_are_reproducible(make_report):
+    rows = _read_patient_rows(make_report("appointment", 300, seed=3))
+    same_seed_rows = _read_patient_rows(
+        make_report("appointment", 300, seed=3, name="again.xlsx")
+    )
+
+    assert len(rows) == 300
+    assert rows == same_seed_rows
+
+
+@pytest.mark.parametrize("reader_class", [OpenpyxlReader, PandasReader])
+def test_readers_match_the_raw_report(make_report, reader_class):
+    # `read_excel` reads placeholder cells such as 'None' as missing
+    filepath = make_report("birthday", 60, seed=3, invalid_cell_rate=0)
+
+    df_raw = reader_class().read(filepath)
+    expected = make_raw_report("birthday", 60, seed=3, invalid_cell_rate=0)
+
+    # Readers may leave empty cells as None or NaN
+    pd.testing.assert_frame_equal(
+        df_raw.reset_index(drop=True).fillna(""),
+        expected.fillna(""),
+        check_dtype=False,
+    )
+
+
+def test_generated_cells_match_row_by_row_rules(make_report):
+    contacts = pd.Series(
+        [row[9] for row in _read_patient_rows(make_report("appointment", 500, seed=2))]
+    )
+
+    cell_numbers = to_country_cell_numbers(contacts)
+
+    for contact, cell_number in zip(contacts, cell_numbers):
+        digits = "".join(c for c in str(contact).removesuffix(".0") if c.isdigit())
+        national = digits.removeprefix("27") if len(digits) == 11 else digits
+        national = national.removeprefix("0") if len(national) == 10 else national
+        valid = len(national) == 9 and len(set(national)) > 1
+        valid = valid and national not in ["123456789", "012345678"]
+        assert pd.isna(cell_number) == (not valid or pd.isna(contact)), contact
+        if valid and not pd.isna(contact):
+            assert cell_number == f"27{national}"
+
+
+@pytest.mark.parametrize(
+    "handler_class, report",
+    [(AppointmentHandler, "appointment"), (BirthdayHandler, "birthday")],
+)
+def test_handlers_process_generated_reports(make_report, handler_class, report):
+    handler = handler_class(selected_practice="La Lucia")
+
+    df_output = handler.load_and_process(make_report(report, 300, seed=4))
+
+    assert 0 < len(df_output) <= 300
+    assert df_output["CellCountry"].str.fullmatch(r"27\d{9}").all()
@@ -0,0 +1,140 @@
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from ExtractTomsForWati import WatiConnector
+
+
+class ScriptedWatiServer(ThreadingHTTPServer):
+    """Answers each request with the next scripted status, or drops the connection on None."""
+
+    daemon_threads = True
+
+    def __init__(self, responses: list[int | None], keep_alive: bool = True):
+        super().__init__(("127.0.0.1", 0), _ScriptedRequestHandler)
+        self.responses = list(responses)
+        self.keep_alive = keep_alive  # Otherwise idle connections are closed silently
+        self.receivers = []  # Per request, as received
+        self.lock = threading.Lock()
+
+
+class _ScriptedRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.lock:
+            self.server.receivers.append(body["receivers"])
+            status = self.server.responses.pop(0) if self.server.responses else 200
+        if status is None:
+            self.close_connection = True
+            return
+
+        response = json.dumps({"result": 200 <= status < 300}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+        self.close_connection = not self.server.keep_alive
+
+
+@pytest.fixture
+def start_server():
+    servers = []
+
+    def _start_server(
+        responses: list[int | None], keep_alive: bool = True
+    ) -> ScriptedWatiServer:
+        server = ScriptedWatiServer(responses, keep_alive)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield _start_server
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _send(api_endpoint: str, n_rows: int = 3, batch_size: int = 3) -> pd.DataFrame:
+    connector = WatiConnector(
+        api_endpoint=api_endpoint,
+        access_token="token",
+        template_name="appointment_reminder",
+        batch_size=batch_size,
+        max_concurrency=1,
+        requests_per_second=1000,
+        max_retries=2,
+        backoff_seconds=0,
+        timeout_seconds=2,
+    )
+    df = pd.DataFrame(
+        {"CellCountry": [f"2782123456{i}" for i in range(n_rows)], "Name": "Test"}
+    )
+    return connector.send_dataframe(df)
+
+
+def _get_url(server: ScriptedWatiServer) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_accepted_batch_is_sent_once(start_server):
+    server = start_server([200])
+
+    results = _send(_get_url(server))
+
+    assert results["sent"].all() and not results["outcome_unknown"].any()
+    assert len(server.receivers) == 1
+
+
+def test_rate_limited_batch_is_retried(start_server):
+    server = start_server([429, 429, 200])
+
+    results = _send(_get_url(server))
+
+    assert results["sent"].all()
+    assert results["attempts"].tolist() == [3] * 3
+    assert len(server.receivers) == 3
+
+
+@pytest.mark.parametrize(
+    "response, outcome_unknown", [(500, True), (None, True), (400, False)]
+)
+def test_failed_batch_is_never_resent(start_server, response, outcome_unknown):
+    server = start_server([response])
+
+    results = _send(_get_url(server))
+
+    assert not results["sent"].any()
+    assert results["outcome_unknown"].tolist() == [outcome_unknown] * 3
+    assert len(server.receivers) == 1
+
+
+def test_batches_are_resent_once_on_stale_keep_alive_connections(start_server):
+    server = start_server([], keep_alive=False)
+
+    results = _send(_get_url(server), batch_size=1)
+
+    assert results["sent"].all() and not results["outcome_unknown"].any()
+    assert results["attempts"].tolist() == [1] * 3
+    assert len(server.receivers) == 3
+
+
+def test_refused_connections_are_retried_as_not_sent():
+    # A port that was free a moment ago, so nothing is listening on it
+    with socket.socket() as free_socket:
+        free_socket.bind(("127.0.0.1", 0))
+        port = free_socket.getsockname()[1]
+
+    results = _send(f"http://127.0.0.1:{port}")
+
+    assert not results["sent"].any() and not results["outcome_unknown"].any()
+    assert results["attempts"].tolist() == [3] * 3
@@ -0,0 +1,87 @@
+import json
+import os
+from itertools import islice
+
+import pandas as pd
+import pytest
+
+from ExtractTomsForWati import AppointmentHandler
+from ExtractTomsForWati._writers import (
+    WRITER_CLASS_DICT,
+    CsvWriter,
+    get_writer_class,
+)
+
+
+class InterruptedCsvWriter(CsvWriter):
+    """Fails after writing the first chunk, e.g. when the disk fills up."""
+
+    def _iter_chunks(self, df: pd.DataFrame):
+        yield from islice(super()._iter_chunks(df), 1)
+        raise OSError("No space left on device")
+
+
+@pytest.fixture
+def output_dir(tmp_path):
+    output_dir = tmp_path / "outputs"
+    output_dir.mkdir()
+    return output_dir
+
+
+@pytest.fixture
+def appointment_handler(make_report):
+    handler = AppointmentHandler(selected_practice="La Lucia")
+    handler.load_and_process(make_report("appointment", 300, seed=20))
+    return handler
+
+
+def _read_cell_numbers(filepath: str, file_type: str) -> list[str]:
+    if file_type in [".csv", ".csv.gz"]:
+        return pd.read_csv(filepath, dtype=str)["CellCountry"].tolist()
+    if file_type == ".xlsx":
+        return pd.read_excel(filepath, dtype=str)["CellCountry"].tolist()
+    if file_type == ".parquet":
+        return pd.read_parquet(filepath)["CellCountry"].tolist()
+    with open(filepath, encoding="utf-8") as file:
+        return [json.loads(line)["whatsappNumber"] for line in file]
+
+
+@pytest.mark.parametrize("file_type", list(WRITER_CLASS_DICT))
+def test_outputs_round_trip_in_every_format(appointment_handler, output_dir, file_type):
+    savepath = str(output_dir / f"output{file_type}")
+    appointment_handler.writer = WRITER_CLASS_DICT[file_type](chunk_rows=64)
+
+    appointment_handler.save_data(savepath)
+
+    expected = appointment_handler.df_output["CellCountry"].tolist()
+    assert _read_cell_numbers(savepath, file_type) == expected
+    assert os.listdir(output_dir) == [f"output{file_type}"]
+
+
+def test_failed_write_keeps_the_previous_output(appointment_handler, output_dir):
+    savepath = str(output_dir / "output.csv")
+    CsvWriter().write(appointment_handler.df_output.iloc[:10], savepath)
+    with open(savepath, "rb") as file:
+        previous_output = file.read()
+
+    with pytest.raises(OSError):
+        InterruptedCsvWriter(chunk_rows=64).write(
+            appointment_handler.df_output, savepath
+        )
+
+    with open(savepath, "rb") as file:
+        assert file.read() == previous_output
+    assert os.listdir(output_dir) == ["output.csv"]
+
+
+@pytest.mark.parametrize(
+    "filepath, writer_class",
+    [
+        ("Appointment.CSV.GZ", WRITER_CLASS_DICT[".csv.gz"]),
+        ("Appointment.jsonl", WRITER_CLASS_DICT[".jsonl"]),
+        ("Appointment.txt", CsvWriter),
+        ("Appointment", CsvWriter),
+    ],
+)
+def test_writer_is_chosen_by_extension(filepath, writer_class):
+    assert get_writer_class(filepath) is writer_class